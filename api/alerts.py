@@ -0,0 +1,259 @@
+import json
+import math
+import os
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from models import AlertRule
+from series import EPOCH, Schema, Series
+
+# 시작 시 불러올 알림 규칙 파일 (AlertRule JSON 목록, 비우면 없음)
+ALERT_RULES_FILE = os.getenv("ALERT_RULES_FILE", "")
+
+# 이 시간(초) 동안 샘플이 없는 시리즈(삭제된 포드 등)의 규칙 상태와 발생 중인 알림 정리 (0이면 비활성화)
+# 샘플 timestamp가 아니라 서버 수신 시각(monotonic) 기준이라 시계가 어긋난 노드가 다른 시리즈를 지우지 않음
+ALERT_STATE_TTL = float(os.getenv("ALERT_STATE_TTL", "600"))
+
+# zscore 표준편차 하한 (평균 대비 비율, 절대값) - 평평하던 시리즈가 튀는 경우도 발생하도록
+ZSCORE_MIN_STD_RATIO = 1e-3
+ZSCORE_MIN_STD = 1e-6
+
+# 범위 인덱스에 쓰는 라벨 (앞쪽일수록 선택적이라 먼저 인덱스 키로 사용)
+SCOPE_LABELS = ("deployment", "namespace", "node")
+
+class _Rule:
+    """평가용으로 펼친 규칙 (pydantic 속성 조회를 샘플마다 반복하지 않도록)"""
+
+    __slots__ = ("model", "name", "metric", "type", "greater", "threshold", "for_samples",
+                 "alpha", "warmup", "scope", "rest")
+
+    def __init__(self, model: AlertRule):
+        self.model = model
+        self.name = model.name
+        self.metric = model.metric
+        self.type = model.type
+        self.greater = model.op == ">"
+        self.threshold = model.threshold
+        self.for_samples = model.for_samples
+        self.alpha = model.alpha
+        self.warmup = model.warmup
+        self.scope = tuple((label, getattr(model, label)) for label in SCOPE_LABELS
+                           if getattr(model, label) is not None)
+        self.rest = self.scope[1:]  # 첫 범위 라벨은 인덱스 키로 이미 일치하므로 나머지만 확인
+
+class _State:
+    """규칙 x 시리즈 하나의 누적 상태 (직전 값, EWMA 평균/분산, 연속 위반 수, 발생 시각)"""
+
+    __slots__ = ("rule", "key", "labels", "last", "last_ts", "mean", "var", "count",
+                 "breaches", "since", "value", "observed")
+
+    def __init__(self, rule: _Rule, key: str, labels: Dict[str, str]):
+        self.rule = rule
+        self.key = key
+        self.labels = labels
+        self.last = None       # rate: 직전 값과 timestamp(마이크로초)
+        self.last_ts = None
+        self.mean = 0.0        # zscore: EWMA 평균/분산과 관측 샘플 수
+        self.var = 0.0
+        self.count = 0
+        self.breaches = 0
+        self.since = None      # 발생 중이면 발생 시각(마이크로초)
+        self.value = None
+        self.observed = None
+
+class AlertEngine:
+    """수집 시 샘플마다 규칙을 증분 평가하는 알림 엔진
+
+    규칙은 종류별로 범위 라벨 (라벨, 값) 또는 None(전체)을 키로 인덱싱하고, 시리즈마다 해당하는
+    규칙 상태 목록을 처음 샘플이 들어올 때 한 번 만들어 둔다 (규칙이 바뀌면 generation으로, 샘플의
+    범위 라벨이 바뀌면 라벨 비교로 다시 만듦).
+    평가는 직전 값(rate)이나 EWMA 평균/분산(zscore)만 갱신하므로 window를 다시 훑지 않고 O(1)이다.
+    """
+
+    def __init__(self, schemas: Dict[str, Schema], state_ttl: float = ALERT_STATE_TTL):
+        self.schemas = schemas
+        self.state_ttl = state_ttl
+        self._next_expire = None  # 다음 만료 정리 시각 (time.monotonic 기준 초)
+        self.rules: Dict[str, _Rule] = {}
+        self._index: Dict[str, Dict[Optional[Tuple[str, str]], List[_Rule]]] = {}
+        self._series: Dict[Series, list] = {}  # 시리즈 -> [generation, 상태 목록, 샘플 라벨, 마지막 수신 시각]
+        self.generation = 0
+        self.firing: Dict[Tuple[str, str], _State] = {}  # (규칙 이름, 시리즈 키) -> 상태
+        self.evaluations = 0
+        self.fired = 0
+        self.resolved = 0
+        self.expired = 0
+
+    def add_rule(self, model: AlertRule):
+        """규칙 등록 (같은 이름이 있으면 교체, 누적 상태는 새로 시작)"""
+        schema = self.schemas[model.kind]
+        if model.metric not in schema.ints and model.metric not in schema.floats:
+            raise ValueError(f"{model.kind}에 없는 숫자 필드: {model.metric}")
+        for label in SCOPE_LABELS:
+            if getattr(model, label) is not None and label not in schema.labels:
+                raise ValueError(f"{model.kind}는 {label} 범위를 지원하지 않음")
+        if model.name in self.rules:
+            self.remove_rule(model.name)
+        rule = _Rule(model)
+        self.rules[rule.name] = rule
+        index_key = rule.scope[0] if rule.scope else None
+        self._index.setdefault(model.kind, {}).setdefault(index_key, []).append(rule)
+        self.generation += 1
+
+    def remove_rule(self, name: str) -> bool:
+        """규칙 삭제 (발생 중인 알림도 함께 해제). 없으면 False"""
+        rule = self.rules.pop(name, None)
+        if rule is None:
+            return False
+        index = self._index[rule.model.kind]
+        index_key = rule.scope[0] if rule.scope else None
+        index[index_key].remove(rule)
+        if not index[index_key]:
+            del index[index_key]
+        if not index:
+            del self._index[rule.model.kind]
+        for key in [key for key in self.firing if key[0] == name]:
+            del self.firing[key]
+        # 시리즈별 상태 목록에서도 바로 제거 (다음 샘플이 오지 않는 시리즈에 남지 않도록)
+        for series in list(self._series):
+            entry = self._series[series]
+            entry[1] = [st for st in entry[1] if st.rule is not rule]
+            if not entry[1]:
+                del self._series[series]
+        self.generation += 1
+        return True
+
+    def load(self, path: str):
+        """JSON 파일의 규칙 목록 등록"""
+        with open(path) as f:
+            for item in json.load(f):
+                self.add_rule(AlertRule(**item))
+
+    def evaluate(self, kind: str, key: str, series: Series, data):
+        """시리즈에 방금 추가된 샘플로 해당 규칙 평가"""
+        index = self._index.get(kind)
+        if index is None:
+            return
+        fields = data.__dict__
+        labels = series.schema._get_labels(fields)
+        entry = self._series.get(series)
+        if entry is None or entry[0] != self.generation or entry[2] != labels:
+            entry = self._series[series] = [self.generation, self._match(index, key, series.schema, labels, entry),
+                                            labels, 0.0]
+        now = entry[3] = time.monotonic()
+        if self.state_ttl and (self._next_expire is None or now >= self._next_expire):
+            self.expire(now - self.state_ttl)
+            self._next_expire = now + self.state_ttl / 2
+        states = entry[1]
+        if not states:
+            return
+        ts = series.ts[-1]
+        self.evaluations += len(states)
+        for st in states:
+            rule = st.rule
+            value = fields.get(rule.metric)
+            if value is None:
+                continue
+            if rule.type == "threshold":
+                observed = value
+            elif rule.type == "rate":
+                last_ts = st.last_ts
+                if last_ts is not None and ts <= last_ts:
+                    continue  # 순서가 어긋난 샘플은 변화량 계산에서 제외
+                observed = None if last_ts is None else (value - st.last) * 1e6 / (ts - last_ts)
+                st.last = value
+                st.last_ts = ts
+            else:
+                # EWMA 평균/분산 (관측값은 갱신 전 통계 기준이라 급변한 값이 자기 자신에 묻히지 않음)
+                if st.count:
+                    diff = value - st.mean
+                    std = max(math.sqrt(st.var), abs(st.mean) * ZSCORE_MIN_STD_RATIO, ZSCORE_MIN_STD)
+                    observed = diff / std if st.count >= rule.warmup else None
+                    incr = rule.alpha * diff
+                    st.mean += incr
+                    st.var = (1 - rule.alpha) * (st.var + diff * incr)
+                else:
+                    observed = None
+                    st.mean = float(value)
+                st.count += 1
+            if observed is None:
+                continue
+            st.value = value
+            st.observed = observed
+            if observed > rule.threshold if rule.greater else observed < rule.threshold:
+                st.breaches += 1
+                if st.since is None and st.breaches >= rule.for_samples:
+                    st.since = ts
+                    self.firing[(rule.name, key)] = st
+                    self.fired += 1
+            elif st.breaches:
+                st.breaches = 0
+                if st.since is not None:
+                    st.since = None
+                    del self.firing[(rule.name, key)]
+                    self.resolved += 1
+
+    def expire(self, cutoff: float):
+        """마지막 샘플을 cutoff(time.monotonic 기준 초) 전에 받은 시리즈의 규칙 상태와 발생 중인 알림 제거"""
+        for series in [series for series, entry in self._series.items() if not series.ts or entry[3] < cutoff]:
+            for st in self._series.pop(series)[1]:
+                if st.since is not None and self.firing.pop((st.rule.name, st.key), None) is st:
+                    self.expired += 1
+
+    def _match(self, index, key: str, schema: Schema, values: tuple, entry: Optional[list]) -> List[_State]:
+        """샘플 라벨에 해당하는 규칙 상태 목록 (계속 해당하는 규칙의 누적 상태는 유지하고 라벨만 갱신)"""
+        labels = {name: value for name, value in zip(schema.labels, values) if value is not None}
+        rules = list(index.get(None, ()))
+        for label in SCOPE_LABELS:
+            if label in labels:
+                rules.extend(index.get((label, labels[label]), ()))
+        previous = {st.rule: st for st in entry[1]} if entry else {}
+        states = []
+        for rule in rules:
+            if rule.rest and not all(labels.get(label) == value for label, value in rule.rest):
+                continue
+            st = previous.pop(rule, None)
+            if st is None:
+                st = _State(rule, key, labels)
+            st.labels = labels
+            states.append(st)
+        # 라벨이 바뀌어 더는 해당하지 않는 규칙의 발생 중인 알림은 해제
+        for st in previous.values():
+            if st.since is not None and self.firing.pop((st.rule.name, st.key), None) is st:
+                self.resolved += 1
+        return states
+
+    def firing_alerts(self, kind: Optional[str] = None, severity: Optional[str] = None) -> List[dict]:
+        """발생 중인 알림 목록 (발생 시각 순)"""
+        result = []
+        for st in sorted(self.firing.values(), key=lambda st: st.since):
+            model = st.rule.model
+            if (kind and model.kind != kind) or (severity and model.severity != severity):
+                continue
+            result.append({
+                "rule": model.name,
+                "severity": model.severity,
+                "kind": model.kind,
+                "series": st.key,
+                "labels": st.labels,
+                "type": model.type,
+                "metric": model.metric,
+                "value": st.value,
+                "observed": st.observed,
+                "op": model.op,
+                "threshold": model.threshold,
+                "since": EPOCH + timedelta(microseconds=st.since),
+            })
+        return result
+
+    def summary(self) -> Dict[str, int]:
+        """자체 모니터링용 상태"""
+        return {
+            "rules": len(self.rules),
+            "series": len(self._series),
+            "firing": len(self.firing),
+            "evaluations": self.evaluations,
+            "fired": self.fired,
+            "resolved": self.resolved,
+            "expired": self.expired,
+        }
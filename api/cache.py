@@ -0,0 +1,125 @@
+import functools
+import json
+import os
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+# 조회 응답 캐시 유효 시간(초) - Collector 수집 주기(COLLECT_INTERVAL)에 맞춤, 0이면 비활성화
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "5"))
+# 캐시에 보관할 직렬화 응답 총 크기 한도 (bytes)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# 목록 응답을 버전이 바뀌어도 재사용하는 시간(초) - 수집이 계속 들어와도 목록은 이 주기마다 한 번만 다시 계산, 0이면 항상 최신
+RESPONSE_CACHE_LIST_COALESCE = float(os.getenv("RESPONSE_CACHE_LIST_COALESCE", "1"))
+
+_DUMP_JSON = hasattr(BaseModel, "model_dump")
+
+def _jsonable(content):
+    """jsonable_encoder와 같은 결과
+
+    pydantic v2 모델은 model_dump(mode="json") 결과가 이미 JSON 값이므로 jsonable_encoder처럼
+    dict를 다시 재귀로 훑지 않는다 (응답 모델 하나에 수십 µs).
+    """
+    if isinstance(content, dict):
+        return {key if isinstance(key, str) else jsonable_encoder(key): _jsonable(value)
+                for key, value in content.items()}
+    if isinstance(content, list):
+        return [_jsonable(value) for value in content]
+    if _DUMP_JSON and isinstance(content, BaseModel):
+        return content.model_dump(mode="json")
+    return jsonable_encoder(content)
+
+def render_json(content) -> bytes:
+    """FastAPI 기본 JSONResponse와 같은 형식으로 직렬화"""
+    return json.dumps(_jsonable(content), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+class ResponseCache:
+    """엔드포인트 + 파라미터별 직렬화 응답(bytes) 캐시
+
+    항목은 만들 때의 시리즈 버전(MetricsStore.version)과 함께 저장되며, 버전이 바뀌었거나
+    TTL이 지나면 다시 계산한다. 계산은 await 없이 이벤트 루프 안에서 끝나므로 동시에 들어온
+    같은 요청은 첫 요청이 채운 항목을 그대로 돌려받는다 (N개 요청에 계산 1회).
+
+    종류 전체 버전에 의존하는 목록 응답은 수집마다 버전이 바뀌어 그대로는 거의 적중하지 않으므로,
+    coalesce 조회는 계산 후 coalesce초 동안 버전이 달라도 항목을 돌려준다 (최대 coalesce초 지연).
+    """
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 coalesce: float = RESPONSE_CACHE_LIST_COALESCE):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.coalesce = coalesce
+        # key -> (버전, 만료 시각, 응답, 버전 무관하게 재사용할 수 있는 시각)
+        self._entries: Dict[Hashable, Tuple[Hashable, float, bytes, float]] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable, version: Hashable, coalesce: bool = False) -> Optional[bytes]:
+        """버전이 같고 만료되지 않은 캐시 응답 (없으면 None)
+
+        coalesce이면 계산 후 coalesce초 이내의 항목은 버전이 달라도 돌려준다.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if entry[1] > now and (entry[0] == version or (coalesce and entry[3] > now)):
+                self.hits += 1
+                return entry[2]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, version: Hashable, body: bytes) -> bytes:
+        """응답 저장 (용량 초과 시 가장 오래 전에 계산된 항목부터 제거)"""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old[2])
+        now = time.monotonic()
+        self._entries[key] = (version, now + self.ttl, body, now + self.coalesce)
+        self.bytes += len(body)
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))  # dict 삽입 순서
+            self.bytes -= len(self._entries.pop(oldest)[2])
+        return body
+
+    def cached(self, version: Callable[[dict], Hashable], coalesce: bool = False):
+        """async GET 엔드포인트 응답을 캐시하는 데코레이터
+
+        version(kwargs)은 응답이 의존하는 시리즈 버전을 돌려준다. HTTPException은 캐시하지 않는다.
+        coalesce는 종류 전체 버전에 의존하는 목록 엔드포인트용 (lookup 참고).
+        캐시를 끈 경우(ttl <= 0)에도 직렬화는 render_json으로 한다.
+        """
+        def decorator(func):
+            name = func.__name__
+
+            @functools.wraps(func)
+            async def wrapper(**kwargs):
+                if self.ttl <= 0:
+                    return Response(content=render_json(await func(**kwargs)), media_type="application/json")
+                key = (name, tuple(sorted(kwargs.items())))
+                current = version(kwargs)
+                body = self.lookup(key, current, coalesce)
+                if body is None:
+                    body = self.put(key, current, render_json(await func(**kwargs)))
+                return Response(content=body, media_type="application/json")
+            return wrapper
+        return decorator
+
+    def clear(self):
+        """모든 항목 제거"""
+        self._entries.clear()
+        self.bytes = 0
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """자체 모니터링용 상태"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+        }
@@ -1,8 +1,12 @@
-from fastapi import FastAPI, HTTPException, Query
+import json
+from fastapi import FastAPI, HTTPException, Query, Request
 from datetime import datetime, timedelta
 from typing import Dict, List
-from models import NodeMetrics, PodMetrics, NamespaceMetrics, DeploymentMetrics
+from models import NodeMetrics, PodMetrics, NamespaceMetrics, DeploymentMetrics, AlertRule
 from storage import MetricsStore
+from stats import stats, timed, TimingMiddleware
+from cache import ResponseCache
+import wire_decoder
 
 # 과제 요구사항에 따른 FastAPI 애플리케이션
 app = FastAPI(
@@ -10,49 +14,104 @@ app = FastAPI(
     version="1.0.0",
     description="쿠버네티스를 활용한 클라우드 모니터링 서비스"
 )
+# 본문 파싱/검증과 응답 직렬화까지 포함한 요청 시간 계측 (@timed 엔드포인트)
+app.add_middleware(TimingMiddleware)
 store = MetricsStore()
+# 조회 응답 캐시 (수집 시 증가하는 시리즈 버전으로 무효화)
+response_cache = ResponseCache()
 
 # ===== 내부 메트릭 수집용 POST 엔드포인트 (Swagger에서 숨김) =====
 
 @app.post("/api/nodes/{node_name}", include_in_schema=False)
+@timed("post_node_metrics")
 async def post_node_metrics(node_name: str, metrics: NodeMetrics):
     """노드 메트릭 수집 (Collector가 POST로 전송) - 내부용"""
     if node_name != metrics.node:
         raise HTTPException(status_code=400, detail="node_name 불일치")
     store.add_node_metrics(metrics)
+    stats.ingest_rate.mark()
     return {"status": "ok"}
 
 @app.post("/api/pods/{pod_name}", include_in_schema=False)
+@timed("post_pod_metrics")
 async def post_pod_metrics(pod_name: str, metrics: PodMetrics):
     """포드 메트릭 수집 - 내부용"""
     pod_field = getattr(metrics, 'pod', None) or getattr(metrics, 'pod_name', None)
     if pod_name != pod_field:
         raise HTTPException(status_code=400, detail="pod_name 불일치")
     store.add_pod_metrics(metrics)
+    stats.ingest_rate.mark()
     return {"status": "ok"}
 
 @app.post("/api/namespaces/{ns_name}", include_in_schema=False)
+@timed("post_namespace_metrics")
 async def post_namespace_metrics(ns_name: str, metrics: NamespaceMetrics):
     """네임스페이스 메트릭 수집 - 내부용"""
     if ns_name != metrics.namespace:
         raise HTTPException(status_code=400, detail="namespace 불일치")
     store.add_namespace_metrics(metrics)
+    stats.ingest_rate.mark()
     return {"status": "ok"}
 
 @app.post("/api/namespaces/{ns_name}/deployments/{dp_name}", include_in_schema=False)
+@timed("post_deployment_metrics")
 async def post_deployment_metrics(ns_name: str, dp_name: str, metrics: DeploymentMetrics):
     """디플로이먼트 메트릭 수집 - 내부용"""
     if ns_name != metrics.namespace or dp_name != metrics.deployment:
         raise HTTPException(status_code=400, detail="namespace/deployment 불일치")
     store.add_deployment_metrics(metrics)
+    stats.ingest_rate.mark()
     return {"status": "ok"}
 
+@app.post("/api/batch", include_in_schema=False)
+@timed("post_batch")
+async def post_batch(request: Request):
+    """여러 메트릭을 한 번에 수집 - 내부용
+
+    Content-Type으로 포맷을 구분한다.
+    - application/x-kubemonitor-batch: 바이너리 배치 (wire_decoder.py)
+    - application/json: {"nodes": [...], "pods": [...], "namespaces": [...], "deployments": [...]}
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    body = await request.body()
+    if content_type == wire_decoder.CONTENT_TYPE:
+        try:
+            nodes, pods, namespaces, deployments = wire_decoder.decode_batch(body)
+        except wire_decoder.WireFormatError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    elif content_type == "application/json":
+        try:
+            data = json.loads(body)
+            nodes = [NodeMetrics(**d) for d in data.get("nodes", [])]
+            pods = [PodMetrics(**d) for d in data.get("pods", [])]
+            namespaces = [NamespaceMetrics(**d) for d in data.get("namespaces", [])]
+            deployments = [DeploymentMetrics(**d) for d in data.get("deployments", [])]
+        except (ValueError, TypeError, AttributeError) as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    else:
+        raise HTTPException(status_code=415, detail=f"지원하지 않는 Content-Type: {content_type}")
+    
+    for m in nodes:
+        store.add_node_metrics(m)
+    for m in pods:
+        store.add_pod_metrics(m)
+    for m in namespaces:
+        store.add_namespace_metrics(m)
+    for m in deployments:
+        store.add_deployment_metrics(m)
+    # 수집률은 샘플마다가 아니라 요청마다 한 번 기록
+    accepted = len(nodes) + len(pods) + len(namespaces) + len(deployments)
+    stats.ingest_rate.mark(accepted)
+    return {"status": "ok", "accepted": accepted}
+
 # ===== 1. 노드 기준 API =====
 
 @app.get("/api/nodes", 
          tags=["1️⃣ 노드 기준"],
          summary="전체 노드 목록 및 리소스 사용량 / 시계열 조회",
          description="전체 노드 목록 및 리소스 사용량 조회. window 파라미터가 있으면 시계열 데이터 반환")
+@timed("get_all_nodes")
+@response_cache.cached(lambda p: store.version("node"), coalesce=True)
 async def get_all_nodes(window: int = Query(None, gt=0, description="시계열 조회 시간(초). 없으면 최신 데이터만 반환")):
     """전체 노드 목록 및 리소스 사용량 조회 / 시계열 조회"""
     result = {}
@@ -63,13 +122,15 @@ async def get_all_nodes(window: int = Query(None, gt=0, description="시계열 
                 result[node] = store.query_node_metrics(node, window)
             else:
                 # 최신 데이터만: GET /api/nodes
-                result[node] = [lst[-1]]
+                result[node] = [lst.last]
     return result
 
 @app.get("/api/nodes/{node}", 
          tags=["1️⃣ 노드 기준"],
          summary="특정 노드의 리소스 사용량 / 시계열 조회",
          description="특정 노드의 리소스 사용량 조회. 호스트 프로세스의 리소스 사용량도 포함됨. window 파라미터가 있으면 시계열 데이터 반환")
+@timed("get_node")
+@response_cache.cached(lambda p: store.version("node", p["node"]))
 async def get_node(node: str, window: int = Query(None, gt=0, description="시계열 조회 시간(초). 없으면 전체 데이터 반환")):
     """특정 노드의 리소스 사용량 조회 (호스트 프로세스의 리소스 사용량도 포함됨) / 시계열 조회"""
     if node not in store.node_store:
@@ -80,21 +141,21 @@ async def get_node(node: str, window: int = Query(None, gt=0, description="시
         return store.query_node_metrics(node, window)
     else:
         # 전체 데이터: GET /api/nodes/<node>
-        return store.node_store[node]
+        return store.node_store[node].render()
 
 @app.get("/api/nodes/{node}/pods", 
          tags=["1️⃣ 노드 기준"],
          summary="해당 노드에 할당된 모든 포드 목록 및 리소스 사용량",
          description="해당 노드에 할당된 모든 포드 목록 및 리소스 사용량 조회. 포드들에 의한 리소스 사용량만 포함됨")
+@timed("get_node_pods")
+@response_cache.cached(lambda p: store.version("pod"), coalesce=True)
 async def get_node_pods(node: str):
     """해당 노드에 할당된 모든 포드 목록 및 리소스 사용량 조회 (포드들에 의한 리소스 사용량만 포함됨)"""
     result = {}
     for pod_name, pod_list in store.pod_store.items():
-        if pod_list:
-            latest_pod = pod_list[-1]
-            # 해당 노드의 포드만 필터링
-            if latest_pod.node == node:
-                result[pod_name] = [latest_pod]
+        # 해당 노드의 포드만 필터링 (라벨로 거른 뒤 최신 샘플만 렌더링)
+        if pod_list and pod_list.label("node") == node:
+            result[pod_name] = [pod_list.last]
     return result
 
 # ===== 2. 포드 기준 API =====
@@ -103,6 +164,8 @@ async def get_node_pods(node: str):
          tags=["2️⃣ 포드 기준"],
          summary="전체 포드 목록 및 리소스 사용량 / 시계열 조회",
          description="전체 포드 목록 및 리소스 사용량 조회. window 파라미터가 있으면 시계열 데이터 반환")
+@timed("get_all_pods")
+@response_cache.cached(lambda p: store.version("pod"), coalesce=True)
 async def get_all_pods(window: int = Query(None, gt=0, description="시계열 조회 시간(초). 없으면 최신 데이터만 반환")):
     """전체 포드 목록 및 리소스 사용량 조회 / 시계열 조회"""
     result = {}
@@ -113,13 +176,15 @@ async def get_all_pods(window: int = Query(None, gt=0, description="시계열 
                 result[pod] = store.query_pod_metrics(pod, window)
             else:
                 # 최신 데이터만: GET /api/pods
-                result[pod] = [lst[-1]]
+                result[pod] = [lst.last]
     return result
 
 @app.get("/api/pods/{podName}", 
          tags=["2️⃣ 포드 기준"],
          summary="특정 포드의 실시간 리소스 사용량 / 시계열 조회",
          description="특정 포드의 실시간 리소스 사용량 조회. window 파라미터가 있으면 시계열 데이터 반환")
+@timed("get_pod")
+@response_cache.cached(lambda p: store.version("pod", p["podName"]))
 async def get_pod(podName: str, window: int = Query(None, gt=0, description="시계열 조회 시간(초). 없으면 전체 데이터 반환")):
     """특정 포드의 실시간 리소스 사용량 조회 / 시계열 조회"""
     if podName not in store.pod_store:
@@ -130,7 +195,48 @@ async def get_pod(podName: str, window: int = Query(None, gt=0, description="시
         return store.query_pod_metrics(podName, window)
     else:
         # 전체 데이터: GET /api/pods/<podName>
-        return store.pod_store[podName]
+        return store.pod_store[podName].render()
+
+@app.get("/api/pods/{podName}/containers", 
+         tags=["2️⃣ 포드 기준"],
+         summary="특정 포드의 컨테이너별 리소스 사용량 / 시계열 조회",
+         description="컨테이너가 2개 이상인 포드의 컨테이너별 리소스 사용량 조회 (단일 컨테이너 포드는 빈 결과). window 파라미터가 있으면 시계열 데이터 반환")
+@timed("get_pod_containers")
+@response_cache.cached(lambda p: store.version("pod", p["podName"]))
+async def get_pod_containers(podName: str, window: int = Query(None, gt=0, description="시계열 조회 시간(초). 없으면 최신 데이터만 반환")):
+    """특정 포드의 컨테이너별 리소스 사용량 조회 / 시계열 조회"""
+    if podName not in store.pod_store:
+        raise HTTPException(status_code=404, detail="해당 포드 없음")
+    
+    result = {}
+    for container, lst in store.container_store.get(podName, {}).items():
+        if lst:
+            if window is not None:
+                # 시계열 조회: GET /api/pods/<podName>/containers?window=<second>
+                result[container] = store.query_container_metrics(podName, container, window)
+            else:
+                # 최신 데이터만: GET /api/pods/<podName>/containers
+                result[container] = [lst.last]
+    return result
+
+@app.get("/api/pods/{podName}/containers/{containerName}", 
+         tags=["2️⃣ 포드 기준"],
+         summary="특정 컨테이너의 리소스 사용량 / 시계열 조회",
+         description="특정 포드 안 컨테이너의 리소스 사용량 조회. window 파라미터가 있으면 시계열 데이터 반환")
+@timed("get_pod_container")
+@response_cache.cached(lambda p: store.version("pod", p["podName"]))
+async def get_pod_container(podName: str, containerName: str, window: int = Query(None, gt=0, description="시계열 조회 시간(초). 없으면 전체 데이터 반환")):
+    """특정 컨테이너의 리소스 사용량 조회 / 시계열 조회"""
+    series = store.container_store.get(podName, {})
+    if containerName not in series:
+        raise HTTPException(status_code=404, detail="해당 컨테이너 없음")
+    
+    if window is not None:
+        # 시계열 조회: GET /api/pods/<podName>/containers/<containerName>?window=<second>
+        return store.query_container_metrics(podName, containerName, window)
+    else:
+        # 전체 데이터: GET /api/pods/<podName>/containers/<containerName>
+        return series[containerName].render()
 
 # ===== 3. 네임스페이스 기준 API =====
 
@@ -138,6 +244,8 @@ async def get_pod(podName: str, window: int = Query(None, gt=0, description="시
          tags=["3️⃣ 네임스페이스 기준"],
          summary="전체 네임스페이스 목록 및 리소스 사용량 / 시계열 조회",
          description="전체 네임스페이스 목록 및 리소스 사용량 조회. window 파라미터가 있으면 시계열 데이터 반환")
+@timed("get_all_namespaces")
+@response_cache.cached(lambda p: store.version("namespace"), coalesce=True)
 async def get_all_namespaces(window: int = Query(None, gt=0, description="시계열 조회 시간(초). 없으면 최신 데이터만 반환")):
     """전체 네임스페이스 목록 및 리소스 사용량 조회 / 시계열 조회"""
     result = {}
@@ -148,13 +256,15 @@ async def get_all_namespaces(window: int = Query(None, gt=0, description="시계
                 result[ns] = store.query_namespace_metrics(ns, window)
             else:
                 # 최신 데이터만: GET /api/namespaces
-                result[ns] = [lst[-1]]
+                result[ns] = [lst.last]
     return result
 
 @app.get("/api/namespaces/{nsName}", 
          tags=["3️⃣ 네임스페이스 기준"],
          summary="특정 네임스페이스의 리소스 사용량 / 시계열 조회",
          description="특정 네임스페이스의 리소스 사용량 조회. window 파라미터가 있으면 시계열 데이터 반환")
+@timed("get_namespace")
+@response_cache.cached(lambda p: store.version("namespace", p["nsName"]))
 async def get_namespace(nsName: str, window: int = Query(None, gt=0, description="시계열 조회 시간(초). 없으면 전체 데이터 반환")):
     """특정 네임스페이스의 리소스 사용량 조회 / 시계열 조회"""
     if nsName not in store.namespace_store:
@@ -165,21 +275,21 @@ async def get_namespace(nsName: str, window: int = Query(None, gt=0, description
         return store.query_namespace_metrics(nsName, window)
     else:
         # 전체 데이터: GET /api/namespaces/<nsName>
-        return store.namespace_store[nsName]
+        return store.namespace_store[nsName].render()
 
 @app.get("/api/namespaces/{nsName}/pods", 
          tags=["3️⃣ 네임스페이스 기준"],
          summary="해당 네임스페이스의 포드 목록 및 리소스 사용량",
          description="해당 네임스페이스의 포드 목록 및 리소스 사용량 조회")
+@timed("get_namespace_pods")
+@response_cache.cached(lambda p: store.version("pod"), coalesce=True)
 async def get_namespace_pods(nsName: str):
     """해당 네임스페이스의 포드 목록 및 리소스 사용량 조회"""
     result = {}
     for pod_name, pod_list in store.pod_store.items():
-        if pod_list:
-            latest_pod = pod_list[-1]
-            # 네임스페이스가 일치하는 포드만 필터링
-            if latest_pod.namespace == nsName:
-                result[pod_name] = [latest_pod]
+        # 네임스페이스가 일치하는 포드만 필터링
+        if pod_list and pod_list.label("namespace") == nsName:
+            result[pod_name] = [pod_list.last]
     return result
 
 # ===== 4. 디플로이먼트 기준 API =====
@@ -188,43 +298,91 @@ async def get_namespace_pods(nsName: str):
          tags=["4️⃣ 디플로이먼트 기준"],
          summary="해당 네임스페이스의 디플로이먼트 목록 및 리소스 사용량",
          description="해당 네임스페이스의 디플로이먼트 목록 및 리소스 사용량 조회")
+@timed("get_namespace_deployments")
+@response_cache.cached(lambda p: store.version("deployment", f"{p['nsName']}/*"), coalesce=True)
 async def get_namespace_deployments(nsName: str):
     """해당 네임스페이스의 디플로이먼트 목록 및 리소스 사용량 조회"""
     result = {}
     for key, lst in store.deployment_store.items():
         if key.startswith(f"{nsName}/") and lst:
             deployment_name = key.split("/", 1)[1]
-            result[deployment_name] = [lst[-1]]  # 최신 1개만
+            result[deployment_name] = [lst.last]  # 최신 1개만
     return result
 
 @app.get("/api/namespaces/{nsName}/deployments/{dpName}", 
          tags=["4️⃣ 디플로이먼트 기준"],
          summary="해당 디플로이먼트의 리소스 사용량",
          description="해당 디플로이먼트의 리소스 사용량 조회")
+@timed("get_deployment")
+@response_cache.cached(lambda p: store.version("deployment", f"{p['nsName']}/{p['dpName']}"))
 async def get_deployment(nsName: str, dpName: str):
     """특정 디플로이먼트의 리소스 사용량 조회"""
     key = f"{nsName}/{dpName}"
     if key not in store.deployment_store:
         raise HTTPException(status_code=404, detail="해당 디플로이먼트 없음")
-    return store.deployment_store[key]
+    return store.deployment_store[key].render()
 
 @app.get("/api/namespaces/{nsName}/deployments/{dpName}/pods", 
          tags=["4️⃣ 디플로이먼트 기준"],
          summary="해당 디플로이먼트의 포드 목록 및 리소스 사용량",
          description="해당 디플로이먼트의 포드 목록 및 리소스 사용량 조회")
+@timed("get_deployment_pods")
+@response_cache.cached(lambda p: store.version("pod"), coalesce=True)
 async def get_deployment_pods(nsName: str, dpName: str):
     """해당 디플로이먼트의 포드 목록 및 리소스 사용량 조회"""
     result = {}
     for pod_name, pod_list in store.pod_store.items():
-        if pod_list:
-            latest_pod = pod_list[-1]
-            # 네임스페이스와 디플로이먼트가 일치하는 포드만 필터링
-            if (latest_pod.namespace == nsName and 
-                hasattr(latest_pod, 'deployment') and 
-                latest_pod.deployment == dpName):
-                result[pod_name] = [latest_pod]
+        # 네임스페이스와 디플로이먼트가 일치하는 포드만 필터링
+        if (pod_list and pod_list.label("namespace") == nsName and
+                pod_list.label("deployment") == dpName):
+            result[pod_name] = [pod_list.last]
     return result
 
+# ===== 5. 알림 API =====
+
+@app.get("/api/alerts", 
+         tags=["5️⃣ 알림"],
+         summary="발생 중인 알림 목록",
+         description="수집 시 평가된 알림 규칙 중 현재 조건을 만족하는 시리즈 목록 (발생 시각 순)")
+@timed("get_alerts")
+async def get_alerts(kind: str = Query(None, description="시리즈 종류 (node, pod, namespace, deployment)"),
+                     severity: str = Query(None, description="심각도")):
+    """발생 중인 알림 목록 조회"""
+    return store.alerts.firing_alerts(kind=kind, severity=severity)
+
+@app.get("/api/alerts/rules", 
+         tags=["5️⃣ 알림"],
+         summary="알림 규칙 목록",
+         description="등록된 알림 규칙 목록 조회")
+@timed("get_alert_rules")
+async def get_alert_rules():
+    """알림 규칙 목록 조회"""
+    return [rule.model for rule in store.alerts.rules.values()]
+
+@app.post("/api/alerts/rules", 
+          tags=["5️⃣ 알림"],
+          summary="알림 규칙 등록",
+          description="알림 규칙 등록 (같은 이름이면 교체). 이후 들어오는 샘플부터 평가")
+@timed("post_alert_rule")
+async def post_alert_rule(rule: AlertRule):
+    """알림 규칙 등록"""
+    try:
+        store.alerts.add_rule(rule)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return rule
+
+@app.delete("/api/alerts/rules/{ruleName}", 
+            tags=["5️⃣ 알림"],
+            summary="알림 규칙 삭제",
+            description="알림 규칙 삭제 (발생 중인 알림도 해제)")
+@timed("delete_alert_rule")
+async def delete_alert_rule(ruleName: str):
+    """알림 규칙 삭제"""
+    if not store.alerts.remove_rule(ruleName):
+        raise HTTPException(status_code=404, detail="해당 규칙 없음")
+    return {"status": "deleted", "rule": ruleName}
+
 # ===== 헬스체크 엔드포인트 =====
 
 @app.get("/", include_in_schema=False)
@@ -235,4 +393,13 @@ async def root():
 @app.get("/health", include_in_schema=False)
 async def health_check():
     """헬스체크 엔드포인트"""
-    return {"status": "healthy", "timestamp": datetime.utcnow()} 
\ No newline at end of file
+    return {"status": "healthy", "timestamp": datetime.utcnow()}
+
+@app.get("/internal/stats", include_in_schema=False)
+async def internal_stats():
+    """API 서버 자체 계측 값 (엔드포인트 지연 히스토그램, 수집률, 저장소 크기)"""
+    snapshot = stats.snapshot()
+    snapshot["store"] = store.store_stats()
+    snapshot["response_cache"] = response_cache.summary()
+    snapshot["alerts"] = store.alerts.summary()
+    return snapshot
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Literal
 from datetime import datetime
 
 class NodeMetrics(BaseModel):
@@ -13,6 +13,16 @@ class NodeMetrics(BaseModel):
     network_rx_bytes: Optional[int] = Field(None, example=123456, description="네트워크 수신 (bytes)")
     network_tx_bytes: Optional[int] = Field(None, example=223344, description="네트워크 송신 (bytes)")
     
+    # 메모리 분해 (/proc/meminfo) 및 PSI (/proc/pressure) - 미지원 환경이면 None
+    memory_anon_bytes: Optional[int] = Field(None, example=31457280, description="익명 메모리 (bytes)")
+    memory_file_bytes: Optional[int] = Field(None, example=13762560, description="파일 페이지 캐시 (bytes)")
+    memory_working_set_bytes: Optional[int] = Field(None, example=38797312, description="Working set = 사용량 - inactive_file (bytes)")
+    cpu_pressure_some_avg10: Optional[float] = Field(None, example=1.25, description="CPU PSI some avg10 (%)")
+    memory_pressure_some_avg10: Optional[float] = Field(None, example=0.0, description="메모리 PSI some avg10 (%)")
+    memory_pressure_full_avg10: Optional[float] = Field(None, example=0.0, description="메모리 PSI full avg10 (%)")
+    io_pressure_some_avg10: Optional[float] = Field(None, example=0.42, description="I/O PSI some avg10 (%)")
+    io_pressure_full_avg10: Optional[float] = Field(None, example=0.1, description="I/O PSI full avg10 (%)")
+    
     # 기존 호환성을 위한 추가 필드들 (내부 처리용)
     cpu_usage: Optional[float] = Field(None, example=12.5, description="CPU 사용률 (퍼센트) - 내부용")
     cpu_usage_percent: Optional[float] = Field(None, example=12.5, description="CPU 사용률 (퍼센트) - 테스트 호환성")
@@ -20,6 +30,36 @@ class NodeMetrics(BaseModel):
     memory: Optional[Dict[str, int]] = Field(None, example={"total_kb":2048000,"used_kb":1024000,"free_kb":1024000}, description="메모리 상세 정보")
     network: Optional[Dict[str, int]] = Field(None, example={"rx_bytes":123456,"tx_bytes":223344}, description="네트워크 상세 정보")
     disk: Optional[Dict[str, int]] = Field(None, example={"read_bytes":135245,"write_bytes":24621}, description="디스크 상세 정보")
+    
+    # Collector 자체 지표 (collector_stats 요약 중 숫자 열로 저장되어 window 조회·알림 규칙에 쓸 수 있는 값)
+    collector_cpu_millicores: Optional[float] = Field(None, example=38.5, description="Collector 평균 CPU 사용량 (밀리코어, 최근 PROFILE_WINDOW 주기)")
+    collector_cycle_ms_p99: Optional[float] = Field(None, example=41.2, description="수집 주기 wall time p99 (ms)")
+    collector_overruns: Optional[int] = Field(None, example=0, description="COLLECT_INTERVAL을 넘긴 수집 주기 수 (누적)")
+    
+    # Collector 자체 프로파일링 요약 (단계별 wall/CPU p50/p99, INTERVAL 초과 횟수)
+    collector_stats: Optional[Dict[str, float]] = Field(None, example={"cycles":120,"overruns":0,"cgroup_read_wall_ms_p99":41.2,"cpu_millicores_avg":38.5}, description="Collector 주기별 단계 프로파일링 요약")
+
+class ContainerMetrics(BaseModel):
+    """컨테이너 메트릭 모델 (포드 cgroup의 하위 cgroup, 컨테이너가 2개 이상인 포드만 수집)"""
+    timestamp: Optional[datetime] = Field(None, example="2025-05-09T23:02:00Z", description="수집 시각 (없으면 포드 샘플 시각)")
+    container: str = Field(..., example="istio-proxy", description="컨테이너 이름")
+    cpu_millicores: Optional[int] = Field(None, example=42, description="CPU 사용량 (밀리코어)")
+    memory_bytes: Optional[int] = Field(None, example=31457280, description="메모리 사용량 (bytes)")
+    disk_read_bytes: Optional[int] = Field(None, example=4096, description="디스크 읽기 (bytes)")
+    disk_write_bytes: Optional[int] = Field(None, example=1024, description="디스크 쓰기 (bytes)")
+    
+    # PodMetrics와 같은 신호 필드 (cgroup v1에는 PSI가 없어 None)
+    memory_anon_bytes: Optional[int] = Field(None, example=20971520, description="익명 메모리 (bytes)")
+    memory_file_bytes: Optional[int] = Field(None, example=10485760, description="파일 페이지 캐시 (bytes)")
+    memory_working_set_bytes: Optional[int] = Field(None, example=26214400, description="Working set = 사용량 - inactive_file (bytes)")
+    cpu_nr_periods: Optional[int] = Field(None, example=12000, description="CFS 주기 수 (누적)")
+    cpu_nr_throttled: Optional[int] = Field(None, example=12, description="CPU 제한에 걸린 주기 수 (누적)")
+    cpu_throttled_usec: Optional[int] = Field(None, example=98000, description="CPU 제한으로 멈춘 시간 (누적 마이크로초)")
+    cpu_pressure_some_avg10: Optional[float] = Field(None, example=0.5, description="CPU PSI some avg10 (%)")
+    memory_pressure_some_avg10: Optional[float] = Field(None, example=0.0, description="메모리 PSI some avg10 (%)")
+    memory_pressure_full_avg10: Optional[float] = Field(None, example=0.0, description="메모리 PSI full avg10 (%)")
+    io_pressure_some_avg10: Optional[float] = Field(None, example=0.0, description="I/O PSI some avg10 (%)")
+    io_pressure_full_avg10: Optional[float] = Field(None, example=0.0, description="I/O PSI full avg10 (%)")
 
 class PodMetrics(BaseModel):
     """포드 메트릭 모델 (예시 응답 형식 기준)"""
@@ -35,6 +75,22 @@ class PodMetrics(BaseModel):
     network_rx_bytes: Optional[int] = Field(None, example=123456, description="네트워크 수신 (bytes)")
     network_tx_bytes: Optional[int] = Field(None, example=223344, description="네트워크 송신 (bytes)")
     
+    # memory.stat 분해, CPU throttling (cpu.stat), PSI (*.pressure) - cgroup v1에는 PSI가 없어 None
+    memory_anon_bytes: Optional[int] = Field(None, example=31457280, description="익명 메모리 (bytes)")
+    memory_file_bytes: Optional[int] = Field(None, example=13762560, description="파일 페이지 캐시 (bytes)")
+    memory_working_set_bytes: Optional[int] = Field(None, example=38797312, description="Working set = 사용량 - inactive_file (bytes)")
+    cpu_nr_periods: Optional[int] = Field(None, example=12000, description="CFS 주기 수 (누적)")
+    cpu_nr_throttled: Optional[int] = Field(None, example=340, description="CPU 제한에 걸린 주기 수 (누적)")
+    cpu_throttled_usec: Optional[int] = Field(None, example=5120000, description="CPU 제한으로 멈춘 시간 (누적 마이크로초)")
+    cpu_pressure_some_avg10: Optional[float] = Field(None, example=1.25, description="CPU PSI some avg10 (%)")
+    memory_pressure_some_avg10: Optional[float] = Field(None, example=0.0, description="메모리 PSI some avg10 (%)")
+    memory_pressure_full_avg10: Optional[float] = Field(None, example=0.0, description="메모리 PSI full avg10 (%)")
+    io_pressure_some_avg10: Optional[float] = Field(None, example=0.42, description="I/O PSI some avg10 (%)")
+    io_pressure_full_avg10: Optional[float] = Field(None, example=0.1, description="I/O PSI full avg10 (%)")
+    
+    # 컨테이너별 메트릭 (컨테이너 2개 이상인 포드만) - 저장 시 컨테이너 시리즈로 분리되어 포드 샘플에는 남지 않음
+    containers: Optional[List[ContainerMetrics]] = Field(None, description="컨테이너별 메트릭 (수신 전용)")
+    
     # 기존 호환성을 위한 필드들 (내부 처리용)
     pod_name: Optional[str] = Field(None, example="myapp-12345", description="포드 이름 (호환성)")
     cpu_usage: Optional[float] = Field(None, example=5.2, description="CPU 사용률 (퍼센트)")
@@ -69,4 +125,21 @@ class DeploymentMetrics(BaseModel):
     network_tx_bytes: Optional[int] = Field(None, example=452852, description="디플로이먼트 내 총 네트워크 송신 (bytes)")
     
     # 기존 호환성을 위한 필드 (내부 처리용)
-    cpu_usage: Optional[float] = Field(None, example=15.3, description="CPU 사용률 (퍼센트)") 
\ No newline at end of file
+    cpu_usage: Optional[float] = Field(None, example=15.3, description="CPU 사용률 (퍼센트)") 
+
+class AlertRule(BaseModel):
+    """알림 규칙 모델 (수집 시 시리즈마다 증분 평가)"""
+    name: str = Field(..., example="pod-memory-growth", description="규칙 이름 (같은 이름으로 다시 등록하면 교체)")
+    kind: Literal["node", "pod", "namespace", "deployment"] = Field(..., example="pod", description="평가할 시리즈 종류")
+    metric: str = Field(..., example="memory_working_set_bytes", description="평가할 숫자 필드")
+    type: Literal["threshold", "rate", "zscore"] = Field("threshold", example="rate",
+        description="threshold: 값 그대로, rate: 초당 변화량, zscore: EWMA 평균/분산 기준 표준 점수")
+    op: Literal[">", "<"] = Field(">", example=">", description="비교 방향")
+    threshold: float = Field(..., example=1048576, description="임계값 (type별 관측값과 비교)")
+    node: Optional[str] = Field(None, example="worker-1", description="범위: 노드 (없으면 전체)")
+    namespace: Optional[str] = Field(None, example="default", description="범위: 네임스페이스 (없으면 전체)")
+    deployment: Optional[str] = Field(None, example="test", description="범위: 디플로이먼트 (없으면 전체)")
+    for_samples: int = Field(1, ge=1, example=3, description="연속으로 조건을 만족해야 발생하는 샘플 수")
+    alpha: float = Field(0.1, gt=0, le=1, example=0.1, description="zscore EWMA 가중치 (클수록 최근 값 비중이 큼)")
+    warmup: int = Field(10, ge=1, example=10, description="zscore 평가 전 최소 샘플 수")
+    severity: str = Field("warning", example="warning", description="심각도 (응답 표시용)")
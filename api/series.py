@@ -0,0 +1,386 @@
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_type_hints
+
+# 정수 열의 None 표시 (실수 열은 NaN)
+NONE_INT = -(2 ** 63)
+NAN = float("nan")
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+class SymbolTable:
+    """라벨 문자열(노드, 네임스페이스, 디플로이먼트, 포드 이름) 전역 인턴 테이블
+
+    같은 값의 문자열은 테이블의 객체 하나만 남기고, 시리즈 메타데이터와 저장소 키가 그 객체를 가리킨다.
+    """
+
+    def __init__(self):
+        self.table: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self.table)
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """테이블에 등록된 같은 문자열 객체 (처음 보면 등록)"""
+        if value is None:
+            return None
+        return self.table.setdefault(value, value)
+
+symbols = SymbolTable()
+
+def network_dict(v):
+    """호환성 network dict"""
+    return {"rx_bytes": v["network_rx_bytes"], "tx_bytes": v["network_tx_bytes"]}
+
+def disk_dict(v):
+    """호환성 disk dict"""
+    return {"read_bytes": v["disk_read_bytes"], "write_bytes": v["disk_write_bytes"]}
+
+def node_memory_dict(v):
+    """노드 호환성 memory dict (wire_decoder와 같은 규칙: used_kb는 memory_bytes에서 계산)"""
+    return {"total_kb": v["memory_total_kb"], "used_kb": (v["memory_bytes"] or 0) // 1024, "free_kb": v["memory_free_kb"]}
+
+class PackedFloats:
+    """Dict[str, float] extras 값 (collector_stats 등)의 압축 형태
+
+    키 tuple은 같은 키 구성끼리 공유하고 값은 array('d')로 보관한다. 응답 시 같은 순서의 dict로 되돌린다.
+    """
+
+    __slots__ = ("keys", "values")
+
+    _shared_keys: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+    def __init__(self, keys: Tuple[str, ...], values: array):
+        self.keys = self._shared_keys.setdefault(keys, keys)
+        self.values = values
+
+    @classmethod
+    def pack(cls, value):
+        """float 값만 가진 dict면 PackedFloats, 아니면 그대로"""
+        if not isinstance(value, dict) or not value:
+            return value
+        try:
+            values = array("d", value.values())
+        except TypeError:
+            return value
+        return cls(tuple(value), values)
+
+    def unpack(self) -> Dict[str, float]:
+        return dict(zip(self.keys, self.values.tolist()))
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.values)
+
+def _extras_nbytes(extras: dict) -> int:
+    """샘플 하나의 extras 대략 크기 (bytes)"""
+    total = sys.getsizeof(extras)
+    for value in extras.values():
+        if isinstance(value, PackedFloats):
+            total += value.nbytes()
+        elif isinstance(value, dict):
+            total += sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value.values())
+        else:
+            total += sys.getsizeof(value)
+    return total
+
+def _getter(names):
+    """dict에서 names 순서대로 값 tuple을 꺼내는 함수"""
+    if not names:
+        return lambda fields: ()
+    if len(names) == 1:
+        return lambda fields: (fields[names[0]],)
+    return itemgetter(*names)
+
+def constructor(model):
+    """필드 dict(모델 필드 순서, 모든 필드 포함)로 모델을 검증 없이 만드는 함수
+
+    저장된 값은 수집 시 이미 검증했으므로 다시 검증하지 않는다 (바이너리 배치 디코더도 사용). pydantic v2는 model_construct도
+    필드마다 기본값을 다시 채우므로 __dict__를 직접 넣고, v1은 construct를 쓴다.
+    """
+    if not hasattr(model, "model_construct"):
+        return lambda fields: model.construct(**fields)
+    new = model.__new__
+    setattr_ = object.__setattr__
+    # 모든 필드가 들어 있으므로 필드 집합은 공유 (속성 대입 시 add해도 바뀌지 않음)
+    fields_set = set(model.model_fields)
+
+    def construct(fields):
+        obj = new(model)
+        setattr_(obj, "__dict__", fields)
+        setattr_(obj, "__pydantic_fields_set__", fields_set)
+        setattr_(obj, "__pydantic_extra__", None)
+        setattr_(obj, "__pydantic_private__", None)
+        return obj
+    return construct
+
+# 응답 시 만드는 timestamp 객체 (같은 수집 주기의 시리즈들은 같은 시각을 공유)
+_DATETIMES: Dict[int, datetime] = {}
+_DATETIMES_MAX = 65536
+
+def _datetime(us: int) -> datetime:
+    """epoch 마이크로초 → UTC datetime (캐시)"""
+    dt = _DATETIMES.get(us)
+    if dt is None:
+        if len(_DATETIMES) >= _DATETIMES_MAX:
+            _DATETIMES.clear()
+        dt = _DATETIMES[us] = EPOCH + timedelta(microseconds=us)
+    return dt
+
+class Schema:
+    """모델 하나의 저장 형태: 시리즈 라벨(문자열), 정수/실수 열, 렌더링 시 다시 만드는 호환성 dict
+
+    모델 필드는 타입 힌트로 분류한다. str 필드는 시리즈 라벨, int/float 필드는 숫자 열이 되고,
+    legacy의 dict 필드(memory/network/disk)는 숫자 열에서 다시 만들 수 있으면 플래그 비트만 남긴다.
+    hidden은 legacy dict를 다시 만드는 데만 쓰는 추가 정수 열 (이름, 샘플 → 값)이다.
+    그 밖의 필드(collector_stats 등)나 위 규칙으로 복원할 수 없는 값은 샘플별 extras에 그대로 둔다.
+    """
+
+    def __init__(self, model, legacy: Dict[str, Callable] = None,
+                 hidden: Tuple[Tuple[str, Callable[[Any], Optional[int]]], ...] = ()):
+        self.model = model
+        self.construct = constructor(model)
+        self.labels: List[str] = []
+        self.ints: List[str] = []
+        self.floats: List[str] = []
+        self.objects: List[str] = []
+        hints = get_type_hints(model)
+        for name, hint in hints.items():
+            if name == "timestamp":
+                continue
+            if hint in (str, Optional[str]):
+                self.labels.append(name)
+            elif hint in (int, Optional[int]):
+                self.ints.append(name)
+            elif hint in (float, Optional[float]):
+                self.floats.append(name)
+            else:
+                self.objects.append(name)
+        self.legacy = [(name, derive) for name, derive in (legacy or {}).items() if name in self.objects]
+        self.objects = [name for name in self.objects if name not in (legacy or {})]
+        # float dict 필드는 PackedFloats로 (노드 collector_stats는 샘플마다 키 40여 개)
+        self.packed = [name for name in self.objects if hints[name] in (Dict[str, float], Optional[Dict[str, float]])]
+        self.hidden = hidden
+        self.int_columns = self.ints + [name for name, _ in hidden]
+        self.int_width = len(self.int_columns) + 1  # 마지막 열은 legacy dict 플래그
+        self.float_width = len(self.floats)
+        self._get_labels = _getter(self.labels)
+        self._get_ints = _getter(self.ints)
+        self._get_floats = _getter(self.floats)
+        # 렌더링 행 [timestamp, 라벨..., 정수 열..., 플래그, 실수 열..., dict 필드(None)...]을
+        # 모델 필드 순서(= 응답 필드 순서) + hidden 열 순서로 재배열해 dict를 만든다
+        dict_fields = [name for name, _ in self.legacy] + self.objects
+        sources = ["timestamp"] + self.labels + self.int_columns + [None] + self.floats + dict_fields
+        self.row_names = list(hints) + [name for name, _ in hidden]
+        self._arrange = itemgetter(*[sources.index(name) for name in self.row_names])
+        self.blank = [None] * len(dict_fields)
+        # 샘플마다 대부분 None인 dict 필드 (하나라도 있으면 legacy/extras 처리)
+        self._get_optional = _getter([name for name, _ in self.legacy] + self.objects)
+        self._no_optional = (None,) * (len(self.legacy) + len(self.objects))
+
+    def meta(self, data) -> Tuple[Optional[str], ...]:
+        """샘플의 라벨 값 (심볼 테이블에 인턴된 문자열)"""
+        return tuple(symbols.intern(v) for v in self._get_labels(data.__dict__))
+
+    def encode(self, data, meta: Tuple[Optional[str], ...]):
+        """샘플 → (timestamp 마이크로초, 정수 값, 실수 값, extras 또는 None)"""
+        fields = data.__dict__
+        extras = None
+        ts = fields["timestamp"]
+        if ts.tzinfo is not timezone.utc and (ts.tzinfo is None or ts.utcoffset()):
+            # UTC가 아닌 시각은 원래 표기대로 응답하도록 보관 (순서 비교는 UTC 기준)
+            extras = {"timestamp": ts}
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+        raw = self._get_ints(fields)
+        if self.hidden:
+            raw = list(raw)
+            for _, extract in self.hidden:
+                raw.append(extract(data))
+        ints = [NONE_INT if v is None else v for v in raw] if None in raw else list(raw)
+        flags = 0
+        if self._get_optional(fields) != self._no_optional:
+            values = None
+            for bit, (name, derive) in enumerate(self.legacy):
+                value = fields[name]
+                if value is None:
+                    continue
+                if values is None:
+                    # derive는 열 이름으로 값을 읽으므로 숨은 열이 없으면 필드 dict를 그대로 사용
+                    values = dict(zip(self.int_columns, raw)) if self.hidden else fields
+                if value == derive(values):
+                    flags |= 1 << bit
+                else:
+                    extras = extras or {}
+                    extras[name] = value
+            for name in self.objects:
+                v = fields[name]
+                if v is not None:
+                    extras = extras or {}
+                    extras[name] = PackedFloats.pack(v) if name in self.packed else v
+        ints.append(flags)
+        floats = self._get_floats(fields)
+        if None in floats:
+            floats = [NAN if v is None else v for v in floats]
+        labels = self._get_labels(fields)
+        if labels != meta:
+            # 시리즈 라벨과 다른 샘플 (예: pod_name 누락)
+            for name, label, expected in zip(self.labels, labels, meta):
+                if label != expected:
+                    extras = extras or {}
+                    extras[name] = symbols.intern(label)
+        return (ts - EPOCH) // _MICROSECOND, ints, floats, extras
+
+    def clamp(self, ints: list, extras: Optional[dict]):
+        """int64 범위 밖 값은 None 표시로 바꾸고 원래 값은 extras로"""
+        for idx, name in enumerate(self.int_columns):
+            v = ints[idx]
+            if not -NONE_INT > v >= NONE_INT:
+                ints[idx] = NONE_INT
+                extras = extras or {}
+                extras[name] = v
+        return ints, extras
+
+class Series:
+    """한 시리즈의 샘플을 열 단위 배열로 보관
+
+    라벨은 시리즈마다 한 번(meta, 인턴된 문자열)만 두고, 샘플마다 timestamp(마이크로초)와 숫자 값만
+    array에 행 단위로 이어 붙인다. extras는 절대 순번(base + 인덱스) → dict의 희소 맵이다.
+    응답 시에는 모델 객체를 검증 없이 다시 만들어 돌려준다. 목록 조회마다 읽는 최신 샘플은
+    수신한 모델 객체(last)를 그대로 둔다.
+    """
+
+    __slots__ = ("schema", "meta", "ts", "ints", "floats", "extras", "extras_bytes", "base", "ordered", "last")
+
+    def __init__(self, schema: Schema, meta: Tuple[Optional[str], ...]):
+        self.schema = schema
+        self.meta = meta
+        self.ts = array("q")
+        self.ints = array("q")
+        self.floats = array("d")
+        self.extras: Dict[int, dict] = {}
+        self.extras_bytes = 0  # extras 대략 크기 (추가/제거 시 갱신)
+        self.base = 0          # 제거된 샘플 수 (extras 키 기준)
+        self.ordered = True    # timestamp가 오름차순이면 window 조회에 이진 탐색 사용
+        self.last = None       # 마지막으로 추가한 샘플 (모델 객체)
+
+    def __len__(self):
+        return len(self.ts)
+
+    def __getitem__(self, idx: int):
+        n = len(self.ts)
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError("series index out of range")
+        if idx == n - 1:
+            return self.last
+        return self._render(idx, idx + 1)[0]
+
+    def append(self, data):
+        """샘플 추가"""
+        schema = self.schema
+        ts_us, ints, floats, extras = schema.encode(data, self.meta)
+        try:
+            self.ints.fromlist(ints)  # 범위 밖 값이 있으면 배열은 그대로 두고 OverflowError
+        except OverflowError:
+            ints, extras = schema.clamp(ints, extras)
+            self.ints.fromlist(ints)
+        ts = self.ts
+        if ts and ts_us < ts[-1]:
+            self.ordered = False
+        if extras:
+            self.extras[self.base + len(ts)] = extras
+            self.extras_bytes += _extras_nbytes(extras)
+        ts.append(ts_us)
+        self.floats.extend(floats)
+        self.last = data
+
+    def evict(self, count: int):
+        """오래된 샘플 count개 제거"""
+        del self.ts[:count]
+        del self.ints[:count * self.schema.int_width]
+        del self.floats[:count * self.schema.float_width]
+        start = self.base
+        self.base += count
+        extras = self.extras
+        if extras:
+            # 제거된 순번 [start, base)의 항목만 삭제 (extras 전체를 다시 만들지 않음)
+            for seq in range(start, self.base) if count < len(extras) else [k for k in extras if k < self.base]:
+                removed = extras.pop(seq, None)
+                if removed is not None:
+                    self.extras_bytes -= _extras_nbytes(removed)
+
+    def label(self, name: str) -> Optional[str]:
+        """최신 샘플의 라벨 값"""
+        return getattr(self.last, name)
+
+    def render(self) -> list:
+        """전체 샘플을 모델 목록으로"""
+        return self._render_range(range(len(self.ts)))
+
+    def since(self, cutoff: datetime) -> list:
+        """cutoff 이후 샘플을 모델 목록으로"""
+        cutoff_us = (cutoff - EPOCH) // _MICROSECOND
+        if self.ordered:
+            return self._render_range(range(bisect_left(self.ts, cutoff_us), len(self.ts)))
+        return self._render_range([i for i, ts in enumerate(self.ts) if ts >= cutoff_us])
+
+    def _render_range(self, indexes) -> list:
+        """인덱스 목록의 샘플을 모델 목록으로 (마지막 샘플은 보관 중인 객체)"""
+        n = len(self.ts)
+        if isinstance(indexes, range) and indexes.stop == n:
+            # 최신 쪽 연속 구간은 배열을 한 번에 꺼내 렌더링
+            if indexes.start >= n:
+                return []
+            rows = self._render(indexes.start, n - 1)
+            rows.append(self.last)
+            return rows
+        return [self.last if i == n - 1 else self._render(i, i + 1)[0] for i in indexes]
+
+    def nbytes(self) -> int:
+        """배열 버퍼 크기 + extras 대략 크기 (bytes)"""
+        return sum(a.buffer_info()[1] * a.itemsize for a in (self.ts, self.ints, self.floats)) + self.extras_bytes
+
+    def _render(self, start: int, stop: int) -> list:
+        """[start, stop) 샘플을 모델 객체로 (수집 시 검증한 값이라 검증 없이 조립)"""
+        schema = self.schema
+        iw = schema.int_width
+        fw = schema.float_width
+        ints = self.ints[start * iw:stop * iw].tolist()
+        if NONE_INT in ints:
+            ints = [None if v == NONE_INT else v for v in ints]
+        floats = self.floats[start * fw:stop * fw].tolist()
+        total = sum(floats)
+        if total != total:  # NaN(None 표시)이 있으면 합도 NaN
+            floats = [None if v != v else v for v in floats]
+        meta = self.meta
+        blank = schema.blank
+        names = schema.row_names
+        arrange = schema._arrange
+        construct = schema.construct
+        extras_map = self.extras
+        seq = self.base + start
+        rows = []
+        for r, ts_us in enumerate(self.ts[start:stop]):
+            row_ints = ints[r * iw:(r + 1) * iw]
+            values = dict(zip(names, arrange([_datetime(ts_us), *meta, *row_ints,
+                                              *floats[r * fw:(r + 1) * fw], *blank])))
+            extras = extras_map.get(seq + r) if extras_map else None
+            if extras:
+                values.update(extras)
+                for name in schema.packed:
+                    packed = values[name]
+                    if isinstance(packed, PackedFloats):
+                        values[name] = packed.unpack()
+            flags = row_ints[-1]
+            if flags:
+                for bit, (name, derive) in enumerate(schema.legacy):
+                    if flags & (1 << bit):
+                        values[name] = derive(values)
+            for name, _ in schema.hidden:
+                del values[name]
+            rows.append(construct(values))
+        return rows
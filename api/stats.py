@@ -0,0 +1,173 @@
+import functools
+import time
+from typing import Dict, List
+
+# HDR 스타일 로그-선형 버킷: 2의 거듭제곱 구간마다 SUB_BUCKETS개로 나눔 (상대 오차 ~12.5%)
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_LINEAR_LIMIT = SUB_BUCKETS * 2
+_SHIFT_BASE = SUB_BUCKET_BITS + 1
+# 2^40ns (~18분)까지 표현, 그 이상은 마지막 버킷에 누적
+_BUCKET_COUNT = (40 - SUB_BUCKET_BITS) * SUB_BUCKETS + _LINEAR_LIMIT
+
+class LatencyHistogram:
+    """HDR 스타일 지연 히스토그램 (나노초 단위, 기록 비용 O(1))"""
+
+    __slots__ = ("counts", "total", "sum_ns", "max_ns")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * _BUCKET_COUNT
+        self.total = 0
+        self.sum_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int):
+        """지연 시간 1건 기록"""
+        if ns < _LINEAR_LIMIT:
+            idx = ns if ns > 0 else 0
+        else:
+            shift = ns.bit_length() - _SHIFT_BASE
+            idx = (shift << SUB_BUCKET_BITS) + (ns >> shift)
+            if idx >= _BUCKET_COUNT:
+                idx = _BUCKET_COUNT - 1
+        self.counts[idx] += 1
+        self.total += 1
+        self.sum_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    @staticmethod
+    def bucket_upper_ns(idx: int) -> int:
+        """버킷 인덱스의 상한 값 (나노초)"""
+        if idx < _LINEAR_LIMIT:
+            return idx
+        shift = (idx >> SUB_BUCKET_BITS) - 1
+        mantissa = (idx & (SUB_BUCKETS - 1)) + SUB_BUCKETS
+        return ((mantissa + 1) << shift) - 1
+
+    def percentile(self, q: float) -> int:
+        """백분위 값 (나노초, 버킷 상한 기준)"""
+        if not self.total:
+            return 0
+        target = max(1, int(self.total * q / 100.0 + 0.5))
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            if count:
+                seen += count
+                if seen >= target:
+                    return min(self.bucket_upper_ns(idx), self.max_ns)
+        return self.max_ns
+
+    def snapshot(self) -> Dict[str, float]:
+        """요약 통계 (마이크로초 단위)"""
+        return {
+            "count": self.total,
+            "mean_us": round(self.sum_ns / self.total / 1000, 2) if self.total else 0.0,
+            "p50_us": round(self.percentile(50) / 1000, 2),
+            "p90_us": round(self.percentile(90) / 1000, 2),
+            "p99_us": round(self.percentile(99) / 1000, 2),
+            "p999_us": round(self.percentile(99.9) / 1000, 2),
+            "max_us": round(self.max_ns / 1000, 2),
+        }
+
+class RateMeter:
+    """최근 WINDOW초 동안의 초당 이벤트 수 측정 (초 단위 링 버퍼)"""
+
+    WINDOW = 60
+
+    __slots__ = ("slots", "epochs", "total")
+
+    def __init__(self):
+        self.slots: List[int] = [0] * self.WINDOW
+        self.epochs: List[int] = [0] * self.WINDOW
+        self.total = 0
+
+    def mark(self, n: int = 1):
+        """이벤트 n건 기록"""
+        sec = int(time.monotonic())
+        idx = sec % self.WINDOW
+        if self.epochs[idx] != sec:
+            self.epochs[idx] = sec
+            self.slots[idx] = 0
+        self.slots[idx] += n
+        self.total += n
+
+    def rate(self) -> float:
+        """최근 WINDOW초(현재 진행 중인 초 제외) 평균 초당 이벤트 수"""
+        now = int(time.monotonic())
+        count = 0
+        for idx in range(self.WINDOW):
+            if now - self.WINDOW <= self.epochs[idx] < now:
+                count += self.slots[idx]
+        return round(count / self.WINDOW, 2)
+
+class StatsRegistry:
+    """API 서버 자체 계측 레지스트리 (엔드포인트별 지연 히스토그램 + 수집률)"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.ingest_rate = RateMeter()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """이름별 히스토그램 (없으면 생성)"""
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = LatencyHistogram()
+        return hist
+
+    def snapshot(self) -> Dict[str, object]:
+        """전체 계측 값 요약"""
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "ingest": {
+                "samples_total": self.ingest_rate.total,
+                "samples_per_sec": self.ingest_rate.rate(),
+            },
+            "latency": {name: hist.snapshot() for name, hist in sorted(self.histograms.items()) if hist.total},
+        }
+
+stats = StatsRegistry()
+
+def timed(name: str):
+    """async 엔드포인트 처리 시간을 히스토그램에 기록하는 데코레이터
+
+    핸들러 본문 시간은 "<name>.handler"에 기록하고, 요청 전체 시간(본문 읽기, pydantic 파싱/검증,
+    응답 직렬화 포함)은 TimingMiddleware가 "<name>"에 기록하도록 엔드포인트에 히스토그램을 붙여 둔다.
+    timed는 라우트 데코레이터 바로 아래(가장 바깥)에 있어야 미들웨어가 찾을 수 있다.
+    """
+    def decorator(func):
+        hist = stats.histogram(f"{name}.handler")
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                hist.record(time.perf_counter_ns() - start)
+        wrapper.request_histogram = stats.histogram(name)
+        return wrapper
+    return decorator
+
+class TimingMiddleware:
+    """요청 전체 시간을 엔드포인트의 요청 히스토그램에 기록하는 ASGI 미들웨어
+
+    라우터가 scope["endpoint"]에 넣는 엔드포인트 함수의 request_histogram(timed가 붙임)을 찾아
+    라우팅부터 응답 전송 완료까지를 기록한다. 본문 파싱 실패(422)도 포함된다.
+    BaseHTTPMiddleware(@app.middleware)는 응답을 스트림으로 한 번 더 감싸므로 쓰지 않는다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter_ns()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            hist = getattr(scope.get("endpoint"), "request_histogram", None)
+            if hist is not None:
+                hist.record(time.perf_counter_ns() - start)
@@ -1,57 +1,173 @@
-from typing import Dict, List
+import os
+from time import perf_counter_ns
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
-from models import NodeMetrics, PodMetrics, NamespaceMetrics, DeploymentMetrics
+from models import NodeMetrics, PodMetrics, ContainerMetrics, NamespaceMetrics, DeploymentMetrics
+from stats import stats
+from series import Schema, Series, symbols, network_dict, disk_dict, node_memory_dict
+from alerts import AlertEngine, ALERT_RULES_FILE
+
+# 시리즈당 최대 보관 샘플 수 (0이면 무제한)
+MAX_SAMPLES_PER_SERIES = int(os.getenv("MAX_SAMPLES_PER_SERIES", "0"))
+# 수집 처리 시간(store.add_*)은 N번째 샘플마다 하나만 히스토그램에 기록 (1이면 매 샘플)
+STORE_TIMING_EVERY = max(1, int(os.getenv("STORE_TIMING_EVERY", "16")))
+
+# 종류별 저장 형태 (라벨은 시리즈당 한 번, 샘플은 숫자 값만)
+SCHEMAS = {
+    "node": Schema(NodeMetrics, legacy={"memory": node_memory_dict, "network": network_dict, "disk": disk_dict},
+                   hidden=(("memory_total_kb", lambda d: (d.memory or {}).get("total_kb")),
+                           ("memory_free_kb", lambda d: (d.memory or {}).get("free_kb")))),
+    "pod": Schema(PodMetrics, legacy={"network": network_dict, "disk": disk_dict}),
+    "container": Schema(ContainerMetrics),
+    "namespace": Schema(NamespaceMetrics),
+    "deployment": Schema(DeploymentMetrics),
+}
 
 class MetricsStore:
-    """인메모리 메트릭 저장소"""
-    
+    """인메모리 메트릭 저장소
+
+    시리즈는 Series(열 단위 숫자 배열 + 시리즈당 한 번의 라벨)로 보관하고, 조회 시 모델로 다시 만든다.
+    """
+
     def __init__(self):
-        self.node_store: Dict[str, List[NodeMetrics]] = {}
-        self.pod_store: Dict[str, List[PodMetrics]] = {}
-        self.namespace_store: Dict[str, List[NamespaceMetrics]] = {}
-        self.deployment_store: Dict[str, List[DeploymentMetrics]] = {}
+        self.node_store: Dict[str, Series] = {}
+        self.pod_store: Dict[str, Series] = {}
+        self.namespace_store: Dict[str, Series] = {}
+        self.deployment_store: Dict[str, Series] = {}
+        # 포드 -> 컨테이너 -> 샘플 (컨테이너 2개 이상인 포드만 생김, 단일 컨테이너 포드는 추가 비용 없음)
+        self.container_store: Dict[str, Dict[str, Series]] = {}
+        self.max_samples = MAX_SAMPLES_PER_SERIES
+        self.evictions: Dict[str, int] = {"node": 0, "pod": 0, "namespace": 0, "deployment": 0, "container": 0}
+        # (종류, 시리즈 키) -> 수집마다 1씩 증가하는 버전, (종류, None)은 종류 전체 버전 (응답 캐시 무효화용)
+        self.versions: Dict[Tuple[str, Optional[str]], int] = {}
+        # 수집 시 증분 평가하는 알림 규칙 (컨테이너 시리즈는 포드 아래에 있어 대상 아님)
+        self.alerts = AlertEngine({kind: SCHEMAS[kind] for kind in ("node", "pod", "namespace", "deployment")})
+        if ALERT_RULES_FILE:
+            self.alerts.load(ALERT_RULES_FILE)
+        # 이벤트마다 이름 조회를 피하기 위해 히스토그램을 미리 잡아둠
+        self.timing_every = STORE_TIMING_EVERY
+        self._timing_countdown = 1
+        self._add_hist = {kind: stats.histogram(f"store.add_{kind}") for kind in self.evictions}
+        self._query_hist = {kind: stats.histogram(f"store.query_{kind}") for kind in self.evictions}
+
+    def _append(self, kind: str, series: Dict[str, Series], key: str, data):
+        """시리즈에 샘플 추가 (보관 한도 초과분은 오래된 것부터 제거)
+
+        수집률(stats.ingest_rate)은 요청 단위로 엔드포인트가 기록한다.
+        """
+        # 처리 시간은 timing_every번째 샘플만 측정 (샘플마다 perf_counter_ns 2회 + 기록 비용을 피함)
+        self._timing_countdown -= 1
+        start = 0
+        if not self._timing_countdown:
+            self._timing_countdown = self.timing_every
+            start = perf_counter_ns()
+        lst = series.get(key)
+        if lst is None:
+            schema = SCHEMAS[kind]
+            lst = series[symbols.intern(key)] = Series(schema, schema.meta(data))
+        lst.append(data)
+        if self.max_samples and len(lst) > self.max_samples:
+            excess = len(lst) - self.max_samples
+            lst.evict(excess)
+            self.evictions[kind] += excess
+        self._bump(kind, key)
+        if self.alerts.rules:
+            self.alerts.evaluate(kind, key, lst, data)
+        if start:
+            self._add_hist[kind].record(perf_counter_ns() - start)
+
+    def _bump(self, kind: str, key: Optional[str]):
+        """시리즈 버전과 종류 전체 버전 증가"""
+        versions = self.versions
+        versions[(kind, key)] = versions.get((kind, key), 0) + 1
+        versions[(kind, None)] = versions.get((kind, None), 0) + 1
+
+    def version(self, kind: str, key: Optional[str] = None) -> int:
+        """시리즈(key가 None이면 종류 전체)의 현재 버전"""
+        return self.versions.get((kind, key), 0)
+
+    def _query(self, kind: str, series: Dict[str, Series], key: str, window: int):
+        """시리즈에서 window초 이내 샘플 조회"""
+        start = perf_counter_ns()
+        lst = series.get(key)
+        result = lst.since(datetime.now(timezone.utc) - timedelta(seconds=window)) if lst is not None else []
+        self._query_hist[kind].record(perf_counter_ns() - start)
+        return result
 
     def add_node_metrics(self, data: NodeMetrics):
         """노드 메트릭 추가"""
-        self.node_store.setdefault(data.node, []).append(data)
+        self._append("node", self.node_store, data.node, data)
 
     def query_node_metrics(self, node: str, window: int):
         """노드 메트릭 시계열 조회 (window: 초 단위)"""
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(seconds=window)
-        return [m for m in self.node_store.get(node, []) if m.timestamp >= cutoff]
+        return self._query("node", self.node_store, node, window)
 
     def add_pod_metrics(self, data: PodMetrics):
         """포드 메트릭 추가"""
         # 새로운 모델에서는 pod 필드를 우선 사용, 없으면 pod_name 사용
         key = getattr(data, 'pod', None) or getattr(data, 'pod_name', None)
         if key:
-            self.pod_store.setdefault(key, []).append(data)
+            containers = data.containers
+            if containers:
+                # 컨테이너 값은 하위 시리즈로 옮기고 포드 샘플에는 남기지 않음
+                data.containers = None
+                self._add_containers(key, data.timestamp, containers)
+            self._append("pod", self.pod_store, key, data)
 
     def query_pod_metrics(self, pod_name: str, window: int):
         """포드 메트릭 시계열 조회"""
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(seconds=window)
-        return [m for m in self.pod_store.get(pod_name, []) if m.timestamp >= cutoff]
+        return self._query("pod", self.pod_store, pod_name, window)
+
+    def _add_containers(self, pod_name: str, timestamp: datetime, containers: list):
+        """포드 샘플에 실려 온 컨테이너별 메트릭을 포드 아래 컨테이너 시리즈에 추가"""
+        series = self.container_store.get(pod_name)
+        if series is None:
+            series = self.container_store[pod_name] = {}
+        stats.ingest_rate.mark(len(containers))
+        for c in containers:
+            if not isinstance(c, ContainerMetrics):
+                # pydantic v1 construct()로 만든 포드 샘플은 중첩 모델이 dict로 남아 있음
+                c = ContainerMetrics(**c)
+            if c.timestamp is None:
+                c.timestamp = timestamp
+            self._append("container", series, c.container, c)
+
+    def query_container_metrics(self, pod_name: str, container: str, window: int):
+        """컨테이너 메트릭 시계열 조회"""
+        return self._query("container", self.container_store.get(pod_name, {}), container, window)
 
     def add_namespace_metrics(self, data: NamespaceMetrics):
         """네임스페이스 메트릭 추가"""
-        self.namespace_store.setdefault(data.namespace, []).append(data)
+        self._append("namespace", self.namespace_store, data.namespace, data)
 
     def query_namespace_metrics(self, ns: str, window: int):
         """네임스페이스 메트릭 시계열 조회"""
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(seconds=window)
-        return [m for m in self.namespace_store.get(ns, []) if m.timestamp >= cutoff]
+        return self._query("namespace", self.namespace_store, ns, window)
 
     def add_deployment_metrics(self, data: DeploymentMetrics):
         """디플로이먼트 메트릭 추가"""
         key = f"{data.namespace}/{data.deployment}"
-        self.deployment_store.setdefault(key, []).append(data)
+        self._append("deployment", self.deployment_store, key, data)
+        # 네임스페이스별 디플로이먼트 목록 조회용 범위 버전
+        self._bump("deployment", f"{data.namespace}/*")
 
     def query_deployment_metrics(self, ns: str, dp: str, window: int):
         """디플로이먼트 메트릭 시계열 조회"""
-        key = f"{ns}/{dp}"
-        now = datetime.now(timezone.utc)
-        cutoff = now - timedelta(seconds=window)
-        return [m for m in self.deployment_store.get(key, []) if m.timestamp >= cutoff] 
\ No newline at end of file
+        return self._query("deployment", self.deployment_store, f"{ns}/{dp}", window)
+
+    def store_stats(self) -> Dict[str, Dict[str, int]]:
+        """저장소별 시리즈 수, 샘플 수, 숫자 배열 메모리 크기, 제거 건수 (+ 라벨 심볼 수)"""
+        result = {}
+        containers = [lst for series in self.container_store.values() for lst in series.values()]
+        for kind, series in (("node", list(self.node_store.values())), ("pod", list(self.pod_store.values())),
+                             ("namespace", list(self.namespace_store.values())),
+                             ("deployment", list(self.deployment_store.values())),
+                             ("container", containers)):
+            result[kind] = {
+                "series": len(series),
+                "samples": sum(len(lst) for lst in series),
+                "estimated_bytes": sum(lst.nbytes() for lst in series),
+                "evictions": self.evictions[kind],
+            }
+        result["symbols"] = {"count": len(symbols)}
+        return result
@@ -0,0 +1,229 @@
+"""Collector→API 배치 전송용 바이너리 포맷 디코더
+
+레이아웃(리틀 엔디언)은 collector/wire_encoder.py의 인코더와 동일하게 유지해야 한다.
+
+    헤더      : magic "KMB" | version u8 | 문자열 수 u32
+    문자열 표 : (길이 u16 | UTF-8 bytes) * 문자열 수
+    섹션      : (종류 u8 | 레코드 수 u32 | 고정 길이 레코드 * 레코드 수) * N
+
+버전 2는 포드 레코드 뒤에 memory.stat 분해·CPU throttling(i64 6개)과 PSI avg10(f64 5개)을 붙인다.
+버전 1 배치(이전 Collector)도 계속 해석한다.
+
+레코드의 문자열 필드는 문자열 표 인덱스(u32, NONE_INDEX는 None), 정수 지표는 i64(NONE_INT는 None),
+실수는 f64(NaN은 None)이다. 레코드가 고정 길이이므로 섹션 단위로 iter_unpack 한다.
+고정 레이아웃 값은 struct가 타입을 정하므로 모델을 검증 없이 만들고, extras가 붙은 레코드만 검증한다.
+노드/포드 레코드에서 고정 레이아웃에 없는 필드는 레코드 섹션보다 앞에 오는 extras 섹션
+(대상 종류 u8 | 레코드 인덱스 u32 | JSON 길이 u32 | JSON)에 담긴다.
+"""
+import json
+import struct
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import List, Tuple, get_type_hints
+from models import NodeMetrics, PodMetrics, NamespaceMetrics, DeploymentMetrics
+from series import constructor, network_dict, disk_dict, node_memory_dict
+
+CONTENT_TYPE = "application/x-kubemonitor-batch"
+MAGIC = b"KMB"
+VERSION = 2
+SUPPORTED_VERSIONS = (1, 2)
+
+NONE_INDEX = 0xFFFFFFFF
+NONE_INT = -(2 ** 63)
+
+KIND_NODE, KIND_POD, KIND_NAMESPACE, KIND_DEPLOYMENT, KIND_EXTRAS = 1, 2, 3, 4, 5
+
+HEADER = struct.Struct("<3sBI")
+STR_LEN = struct.Struct("<H")
+SECTION = struct.Struct("<BI")
+# extras 항목: 대상 섹션 종류, 레코드 인덱스, JSON 길이
+EXTRAS = struct.Struct("<BII")
+# timestamp, node, 6개 지표, cpu_usage, cgroup_cpu_ns, mem_total_kb, mem_free_kb
+NODE = struct.Struct("<dI6qdqqq")
+# timestamp, node, namespace, deployment, pod, 6개 지표, cpu_usage (+ v2: 포드 신호 i64 6개, PSI f64 5개)
+POD_V1 = struct.Struct("<dIIII6qd")
+POD = struct.Struct("<dIIII6qd6q5d")
+POD_SIGNAL_INTS = ("memory_anon_bytes", "memory_file_bytes", "memory_working_set_bytes",
+                   "cpu_nr_periods", "cpu_nr_throttled", "cpu_throttled_usec")
+POD_SIGNAL_FLOATS = ("cpu_pressure_some_avg10", "memory_pressure_some_avg10", "memory_pressure_full_avg10",
+                     "io_pressure_some_avg10", "io_pressure_full_avg10")
+METRIC_FIELDS = ("cpu_millicores", "memory_bytes", "disk_read_bytes", "disk_write_bytes",
+                 "network_rx_bytes", "network_tx_bytes")
+# timestamp, namespace, 6개 지표, cpu_usage
+NAMESPACE = struct.Struct("<dI6qd")
+# timestamp, namespace, deployment, 6개 지표, cpu_usage
+DEPLOYMENT = struct.Struct("<dII6qd")
+RECORDS = {
+    1: {KIND_NODE: NODE, KIND_POD: POD_V1, KIND_NAMESPACE: NAMESPACE, KIND_DEPLOYMENT: DEPLOYMENT},
+    2: {KIND_NODE: NODE, KIND_POD: POD, KIND_NAMESPACE: NAMESPACE, KIND_DEPLOYMENT: DEPLOYMENT},
+}
+
+class WireFormatError(ValueError):
+    """바이너리 배치 해석 실패"""
+
+# 레코드 값 순서의 필드 이름 (timestamp와 문자열 인덱스는 변환 후 같은 자리에 들어감)
+NODE_NAMES = ("timestamp", "node") + METRIC_FIELDS + ("cpu_usage", "cgroup_cpu_ns", "memory_total_kb", "memory_free_kb")
+# 포드는 v2 레이아웃 기준 (v1 레코드는 신호 필드를 None으로 채움) + 레코드에 없는 pod_name(= pod)
+POD_NAMES = ("timestamp", "node", "namespace", "deployment", "pod") + METRIC_FIELDS + ("cpu_usage",) + \
+    POD_SIGNAL_INTS + POD_SIGNAL_FLOATS + ("pod_name",)
+POD_V1_PAD = [None] * (len(POD_SIGNAL_INTS) + len(POD_SIGNAL_FLOATS))
+NAMESPACE_NAMES = ("timestamp", "namespace") + METRIC_FIELDS + ("cpu_usage",)
+DEPLOYMENT_NAMES = ("timestamp", "namespace", "deployment") + METRIC_FIELDS + ("cpu_usage",)
+# 레코드별 실수 열 위치 (NaN → None)
+FLOAT_COLUMNS = {
+    NODE: (8,),
+    POD_V1: (11,),
+    POD: (11,) + tuple(range(18, 18 + len(POD_SIGNAL_FLOATS))),
+    NAMESPACE: (8,),
+    DEPLOYMENT: (9,),
+}
+
+class _Builder:
+    """디코딩한 레코드 값 → 모델
+
+    고정 레이아웃 값은 struct가 타입을 정하므로 모델 필드 순서로 재배열해 검증 없이 만든다.
+    JSON으로 온 extras는 임의의 값이므로 extras가 붙은 레코드만 모델 검증을 거친다
+    (pydantic v1은 construct).
+    """
+
+    def __init__(self, cls, names: Tuple[str, ...]):
+        self.construct = constructor(cls)
+        self.fields = list(get_type_hints(cls))
+        self.names = names
+        missing = [name for name in self.fields if name not in names]
+        order = list(names) + missing
+        self.arrange = itemgetter(*[order.index(name) for name in self.fields])
+        self.blank = [None] * len(missing)
+        self.template = dict.fromkeys(self.fields)
+        self.validate = getattr(cls, "model_validate", None) or (lambda fields: cls.construct(**fields))
+
+    def row(self, values: list):
+        """names 순서의 값 목록 → 모델"""
+        return self.construct(dict(zip(self.fields, self.arrange(values + self.blank))))
+
+    def dict(self, fields: dict):
+        """필드 dict → 모델"""
+        return self.construct({**self.template, **fields})
+
+BUILD = {KIND_NODE: _Builder(NodeMetrics, NODE_NAMES), KIND_POD: _Builder(PodMetrics, POD_NAMES),
+         KIND_NAMESPACE: _Builder(NamespaceMetrics, NAMESPACE_NAMES),
+         KIND_DEPLOYMENT: _Builder(DeploymentMetrics, DEPLOYMENT_NAMES)}
+
+def _numbers(row: tuple, floats: Tuple[int, ...]) -> list:
+    """레코드 값의 NONE_INT/NaN을 None으로 바꾼 목록"""
+    values = [None if v == NONE_INT else v for v in row] if NONE_INT in row else list(row)
+    for i in floats:
+        if values[i] != values[i]:
+            values[i] = None
+    return values
+
+def _node_legacy(fields: dict):
+    """노드 호환성 필드 복원 (series.py의 network_dict/disk_dict/node_memory_dict와 같은 규칙)
+
+    network/disk는 두 값이 모두 있을 때만, memory는 total_kb가 있을 때만 만든다.
+    복원 값과 다른 원래 값은 인코더가 extras에 담아 보내고 그 값이 우선한다.
+    """
+    fields["cpu_usage_percent"] = fields["cpu_usage"]
+    total_kb = fields.pop("memory_total_kb")
+    free_kb = fields.pop("memory_free_kb")
+    if fields["network_rx_bytes"] is not None and fields["network_tx_bytes"] is not None:
+        fields["network"] = network_dict(fields)
+    if fields["disk_read_bytes"] is not None and fields["disk_write_bytes"] is not None:
+        fields["disk"] = disk_dict(fields)
+    if total_kb is not None:
+        fields["memory"] = node_memory_dict({"memory_total_kb": total_kb, "memory_free_kb": free_kb,
+                                             "memory_bytes": fields["memory_bytes"]})
+
+def decode_batch(body: bytes) -> Tuple[List[NodeMetrics], List[PodMetrics], List[NamespaceMetrics], List[DeploymentMetrics]]:
+    """바이너리 배치를 (노드, 포드, 네임스페이스, 디플로이먼트) 모델 목록으로 디코딩"""
+    buf = memoryview(body)
+    try:
+        magic, version, str_count = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise WireFormatError("magic 불일치")
+        if version not in SUPPORTED_VERSIONS:
+            raise WireFormatError(f"지원하지 않는 버전: {version}")
+        records = RECORDS[version]
+        offset = HEADER.size
+        strings = []
+        for _ in range(str_count):
+            (length,) = STR_LEN.unpack_from(buf, offset)
+            offset += STR_LEN.size
+            strings.append(str(buf[offset:offset + length], "utf-8"))
+            offset += length
+        s = dict(enumerate(strings))
+        s[NONE_INDEX] = None
+
+        extras = {}
+        result = {KIND_NODE: [], KIND_POD: [], KIND_NAMESPACE: [], KIND_DEPLOYMENT: []}
+        while offset < len(buf):
+            kind, count = SECTION.unpack_from(buf, offset)
+            offset += SECTION.size
+            if kind == KIND_EXTRAS:
+                for _ in range(count):
+                    target, idx, length = EXTRAS.unpack_from(buf, offset)
+                    offset += EXTRAS.size
+                    extras[(target, idx)] = json.loads(bytes(buf[offset:offset + length]))
+                    offset += length
+                continue
+            record = records.get(kind)
+            if record is None:
+                raise WireFormatError(f"알 수 없는 섹션 종류: {kind}")
+            end = offset + record.size * count
+            if end > len(buf):
+                raise WireFormatError("섹션 길이가 본문보다 김")
+            rows = record.iter_unpack(buf[offset:end])
+            offset = end
+            floats = FLOAT_COLUMNS[record]
+            build = BUILD[kind]
+            items = []
+            if kind == KIND_NODE:
+                for row in rows:
+                    values = _numbers(row, floats)
+                    values[0] = _timestamp(values[0])
+                    values[1] = s[values[1]]
+                    items.append(values)
+            elif kind == KIND_POD:
+                pad = POD_V1_PAD if record is POD_V1 else []
+                for row in rows:
+                    values = _numbers(row, floats)
+                    values[0] = _timestamp(values[0])
+                    values[1:5] = pod = s[values[1]], s[values[2]], s[values[3]], s[values[4]]
+                    values += pad
+                    values.append(pod[3])  # pod_name
+                    items.append(values)
+            elif kind == KIND_NAMESPACE:
+                for row in rows:
+                    values = _numbers(row, floats)
+                    values[0] = _timestamp(values[0])
+                    values[1] = s[values[1]]
+                    items.append(values)
+            else:
+                for row in rows:
+                    values = _numbers(row, floats)
+                    values[0] = _timestamp(values[0])
+                    values[1] = s[values[1]]
+                    values[2] = s[values[2]]
+                    items.append(values)
+            for i, values in enumerate(items):
+                extra = extras.get((kind, i)) if extras else None
+                if kind == KIND_NODE or extra is not None:
+                    fields = dict(zip(build.names, values))
+                    if kind == KIND_NODE:
+                        _node_legacy(fields)
+                    if extra is not None:
+                        fields.update(extra)
+                        items[i] = build.validate(fields)
+                    else:
+                        items[i] = build.dict(fields)
+                else:
+                    items[i] = build.row(values)
+            result[kind].extend(items)
+        return result[KIND_NODE], result[KIND_POD], result[KIND_NAMESPACE], result[KIND_DEPLOYMENT]
+    except WireFormatError:
+        raise
+    except (struct.error, KeyError, UnicodeDecodeError, ValueError) as e:
+        raise WireFormatError(f"배치 해석 실패: {e}") from e
+
+def _timestamp(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc)
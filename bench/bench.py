@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""kubemonitor 오프라인 벤치마크
+
+클러스터 없이 Collector 파서, 가짜 cgroup/proc 트리 위의 수집 주기, MetricsStore, FastAPI 엔드포인트 성능을 측정하고
+결과를 JSON 베이스라인과 비교한다.
+
+사용 예:
+    python bench/bench.py                              # 전체 실행, 결과 출력
+    python bench/bench.py --only parse                 # 이름이 parse로 시작하는 항목만
+    python bench/bench.py --save-baseline local        # bench/baselines/local.json 저장
+    python bench/bench.py --only wire --save-baseline local   # wire 항목만 교체
+    python bench/bench.py --compare local              # 베이스라인 대비 회귀 확인 (회귀 시 exit 1)
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES = os.path.join(BENCH_DIR, "fixtures")
+BASELINES = os.path.join(BENCH_DIR, "baselines")
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "collector"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "api"))
+
+MISSING = os.path.join(FIXTURES, "__missing__")
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+BENCHMARKS = []
+
+def benchmark(name):
+    """벤치마크 함수 등록 데코레이터 (함수는 {이름: 결과} dict를 반환)"""
+    def decorator(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return decorator
+
+def measure(func, number, repeat=5):
+    """func를 number회 호출하는 측정을 repeat번 반복해 가장 빠른 회차 기준 결과 반환"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter_ns() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return result(best, number)
+
+def result(elapsed_ns, ops):
+    """경과 시간과 연산 수로 결과 항목 생성"""
+    ns_per_op = elapsed_ns / ops
+    return {"ns_per_op": round(ns_per_op, 1), "ops_per_sec": round(1e9 / ns_per_op, 1) if ns_per_op else 0.0}
+
+# ===== 1. Collector 파서 =====
+
+@benchmark("parse")
+def bench_parsers(args):
+    import collector
+    meminfo = os.path.join(FIXTURES, "meminfo")
+    net_dev = os.path.join(FIXTURES, "net_dev")
+    cpu_stat = os.path.join(FIXTURES, "cpu.stat")
+    io_stat = os.path.join(FIXTURES, "io.stat")
+    return {
+        "parse.meminfo": measure(lambda: collector.read_proc_meminfo(meminfo), 2000),
+        "parse.net_dev": measure(lambda: collector.read_proc_net_dev(net_dev), 2000),
+        "parse.cpu_stat": measure(lambda: collector.read_cgroup_cpu_usage(MISSING, cpu_stat), 2000),
+        "parse.io_stat": measure(lambda: collector.read_cgroup_blkio(MISSING, io_stat), 2000),
+    }
+
+# ===== 2. Collector 수집 주기 (가짜 cgroup/proc 트리) =====
+
+@contextmanager
+def fake_node_roots(collector, fake):
+    """Collector 모듈의 파일시스템 루트를 가짜 노드로 임시 교체"""
+    names = ("CGROUP_ROOT", "PROC_ROOT", "POD_LIST_FILE", "NODE_NAME")
+    saved = {name: getattr(collector, name) for name in names}
+    for name in names:
+        setattr(collector, name, fake.env[name])
+    # 이전 노드의 포드 캐시/idle 상태가 섞이지 않도록 초기화
+    collector.pod_cache.clear()
+    collector.idle_tracker.retain(())
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(collector, name, value)
+        collector.pod_cache.clear()
+        collector.idle_tracker.retain(())
+
+@benchmark("cycle")
+def bench_cycle(args):
+    import collector
+    from fakefs import FakeNode
+    results = {}
+    for version in ("v2", "v1"):
+        with tempfile.TemporaryDirectory() as tmp:
+            fake = FakeNode(os.path.join(tmp, "node"), pods=args.pods, version=version, qos="mixed",
+                            sidecars=0.2)
+            fake.build()
+            with fake_node_roots(collector, fake):
+                elapsed = 0
+                read = 0
+                prev_cpu_ns = None
+                for _ in range(args.cycles):
+                    fake.mutate(dt=1.0)  # 카운터 갱신은 측정에서 제외
+                    start = time.perf_counter_ns()
+                    node = collector.collect_node_metrics(prev_cpu_ns, 1.0)
+                    pods = collector.collect_pod_metrics()
+                    latest = list(collector.pod_cache.values())
+                    collector.collect_namespace_metrics(latest)
+                    collector.collect_deployment_metrics(latest)
+                    elapsed += time.perf_counter_ns() - start
+                    prev_cpu_ns = node.get("cgroup_cpu_ns")
+                    read += len(pods)
+                collected = len(collector.pod_cache)
+                containers = sum(len(p.get("containers", ())) for p in collector.pod_cache.values())
+            entry = result(elapsed, args.cycles)
+            entry["pods_collected"] = collected
+            entry["containers_collected"] = containers  # 사이드카가 있는 포드(20%)의 컨테이너 cgroup
+            entry["pods_read_per_cycle"] = round(read / args.cycles, 1)  # idle 포드 건너뛰기 반영
+            results[f"cycle.{version}.{args.pods}"] = entry
+    return results
+
+# ===== 3. 포드 cgroup 파일 읽기 (open/readlines vs fd 캐시 + pread) =====
+
+def read_pod_open_readlines(pod_dir):
+    """fd 캐시 도입 전 방식: 파일마다 open 후 줄 단위 파싱"""
+    cpu_ns = memory_bytes = read_bytes = write_bytes = 0
+    with open(os.path.join(pod_dir, "cpu.stat"), "r") as f:
+        for line in f.readlines():
+            if line.startswith("usage_usec"):
+                cpu_ns = int(line.split()[1]) * 1000
+                break
+    with open(os.path.join(pod_dir, "memory.current"), "r") as f:
+        memory_bytes = int(f.read().strip())
+    with open(os.path.join(pod_dir, "io.stat"), "r") as f:
+        for line in f.readlines():
+            if "rbytes=" in line:
+                read_bytes += int(line.split("rbytes=")[1].split()[0])
+            if "wbytes=" in line:
+                write_bytes += int(line.split("wbytes=")[1].split()[0])
+    return cpu_ns, memory_bytes, read_bytes, write_bytes
+
+@benchmark("files")
+def bench_files(args):
+    import cgroups
+    from fdcache import FileCache
+    from fakefs import FakeNode
+    with tempfile.TemporaryDirectory() as tmp:
+        fake = FakeNode(os.path.join(tmp, "node"), pods=args.pods, version="v2")
+        fake.build()
+        pods = list(fake.pods.values())
+        cache = FileCache(len(pods) * len(cgroups.CgroupV2.FILES))
+        backend = cgroups.CgroupV2(fake.cgroup_root, cache)
+        uncached = cgroups.CgroupV2(fake.cgroup_root)
+
+        def open_readlines():
+            for pod in pods:
+                read_pod_open_readlines(pod["dirs"][0])
+
+        def open_read():
+            for pod in pods:
+                uncached.read_pod(pod["uid"], pod["qos"])
+
+        def pread_cached():
+            for pod in pods:
+                backend.read_pod(pod["uid"], pod["qos"])
+
+        def pread_cached_counters():
+            # 신호 파일(memory.stat, PSI)을 건너뛰는 주기 (POD_SIGNAL_EVERY)
+            for pod in pods:
+                backend.read_pod(pod["uid"], pod["qos"], signals=False)
+
+        pread_cached()  # fd 열기 및 경로 탐색은 측정에서 제외
+        open_read()
+        results = {
+            f"files.open_readlines.{args.pods}": measure(open_readlines, 20),
+            f"files.open_read.{args.pods}": measure(open_read, 20),
+            f"files.pread_cached.{args.pods}": measure(pread_cached, 20),
+            f"files.pread_cached_counters.{args.pods}": measure(pread_cached_counters, 20),
+        }
+        # open_readlines는 도입 전 기준(포드당 3개 파일), 백엔드는 memory.stat·PSI 포함 전체 파일
+        results[f"files.open_readlines.{args.pods}"]["files_per_pod"] = 3
+        results[f"files.open_read.{args.pods}"]["files_per_pod"] = len(cgroups.CgroupV2.FILES)
+        results[f"files.pread_cached.{args.pods}"]["files_per_pod"] = len(cgroups.CgroupV2.FILES)
+        results[f"files.pread_cached.{args.pods}"]["open_fds"] = len(cache)
+        results[f"files.pread_cached_counters.{args.pods}"]["files_per_pod"] = 3
+        cache.clear()
+    return results
+
+# ===== 4. 전송 포맷 (JSON vs 바이너리 배치) =====
+
+def make_pod_payloads(count):
+    """Collector가 만드는 형태의 포드 payload dict 목록"""
+    ts = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return [{
+        "timestamp": ts, "node": "node-0", "namespace": f"ns-{i % 10}", "pod": f"app-{i // 5}-{i:05d}",
+        "deployment": f"app-{i // 5}", "cpu_millicores": 100 + i, "memory_bytes": 50_000_000 + i,
+        "disk_read_bytes": i * 4096, "disk_write_bytes": i * 512, "network_rx_bytes": 0, "network_tx_bytes": 0,
+        "pod_name": f"app-{i // 5}-{i:05d}", "cpu_usage": (100 + i) / 10,
+        # memory.stat 분해, CPU throttling, PSI (Collector가 cgroups.SIGNAL_FIELDS로 붙이는 필드)
+        "memory_anon_bytes": 30_000_000 + i, "memory_file_bytes": 20_000_000, "memory_working_set_bytes": 45_000_000 + i,
+        "cpu_nr_periods": 12_000 + i, "cpu_nr_throttled": i % 7, "cpu_throttled_usec": (i % 7) * 1000,
+        "cpu_pressure_some_avg10": 1.25, "memory_pressure_some_avg10": 0.0, "memory_pressure_full_avg10": 0.0,
+        "io_pressure_some_avg10": 0.42, "io_pressure_full_avg10": 0.1,
+    } for i in range(count)]
+
+@benchmark("wire")
+def bench_wire(args):
+    import wire_encoder
+    import wire_decoder
+    from models import PodMetrics
+    payloads = make_pod_payloads(args.pods)
+    binary = wire_encoder.encode_batch(pods=payloads)
+    text = json.dumps({"pods": payloads})
+
+    def decode_json():
+        return [PodMetrics(**d) for d in json.loads(text)["pods"]]
+
+    results = {
+        f"wire.encode_binary.{args.pods}": measure(lambda: wire_encoder.encode_batch(pods=payloads), 50),
+        f"wire.encode_json.{args.pods}": measure(lambda: json.dumps({"pods": payloads}), 50),
+        f"wire.decode_binary.{args.pods}": measure(lambda: wire_decoder.decode_batch(binary), 50),
+        f"wire.decode_json.{args.pods}": measure(decode_json, 50),
+    }
+    results[f"wire.encode_binary.{args.pods}"]["bytes"] = len(binary)
+    results[f"wire.encode_json.{args.pods}"]["bytes"] = len(text)
+    return results
+
+# ===== 5. MetricsStore =====
+
+def make_pod_samples(series, samples_per_series, pods_per_node=250):
+    """series개 포드 x samples_per_series개 샘플의 PodMetrics 생성 (측정 대상 아님)"""
+    from models import PodMetrics
+    now = datetime.now(timezone.utc)
+    result = []
+    for s in range(samples_per_series):
+        for i in range(series):
+            name = f"app-{i // 10}-{i:06d}"
+            result.append(PodMetrics(
+                timestamp=now, node=f"node-{i // pods_per_node}", namespace=f"ns-{i % 50}",
+                deployment=f"app-{i // 10}", pod=name, pod_name=name,
+                cpu_millicores=100 + s, memory_bytes=50_000_000 + i,
+                disk_read_bytes=i, disk_write_bytes=i, network_rx_bytes=0, network_tx_bytes=0,
+                cpu_usage=10.0 + s,
+            ))
+    return result
+
+def make_alert_rules(series, max_deployments=1000):
+    """make_pod_samples 라벨에 맞춘 알림 규칙 (디플로이먼트별 zscore/threshold + 네임스페이스별 rate/threshold + 전체 2개)"""
+    from models import AlertRule
+    rules = [AlertRule(name="all-mem", kind="pod", metric="memory_bytes", threshold=1e12),
+             AlertRule(name="all-cpu-rate", kind="pod", metric="cpu_millicores", type="rate", threshold=1e6)]
+    for ns in range(min(series, 50)):
+        rules.append(AlertRule(name=f"ns-{ns}-mem", kind="pod", metric="memory_bytes", threshold=1e12, namespace=f"ns-{ns}"))
+        rules.append(AlertRule(name=f"ns-{ns}-grow", kind="pod", metric="memory_bytes", type="rate", threshold=1e9,
+                               namespace=f"ns-{ns}"))
+    for dp in range(min(series // 10, max_deployments)):
+        rules.append(AlertRule(name=f"app-{dp}-cpu-z", kind="pod", metric="cpu_millicores", type="zscore", threshold=6,
+                               deployment=f"app-{dp}"))
+        rules.append(AlertRule(name=f"app-{dp}-cpu", kind="pod", metric="cpu_usage", threshold=1e6, deployment=f"app-{dp}"))
+    return rules
+
+@benchmark("store")
+def bench_store(args):
+    from storage import MetricsStore
+    results = {}
+    for size in args.sizes:
+        samples = make_pod_samples(size, args.samples)
+        store = MetricsStore()
+        start = time.perf_counter_ns()
+        for sample in samples:
+            store.add_pod_metrics(sample)
+        results[f"store.ingest.{size}"] = result(time.perf_counter_ns() - start, len(samples))
+
+        # 같은 수집을 알림 규칙(포드 샘플당 6개 해당)과 함께
+        alert_store = MetricsStore()
+        rules = make_alert_rules(size)
+        for rule in rules:
+            alert_store.alerts.add_rule(rule)
+        start = time.perf_counter_ns()
+        for sample in samples:
+            alert_store.add_pod_metrics(sample)
+        entry = result(time.perf_counter_ns() - start, len(samples))
+        entry["rules"] = len(rules)
+        results[f"store.ingest_alerts.{size}"] = entry
+        del alert_store
+
+        names = list(store.pod_store)
+        start = time.perf_counter_ns()
+        for name in names:
+            store.query_pod_metrics(name, 300)
+        results[f"store.query_window.{size}"] = result(time.perf_counter_ns() - start, len(names))
+
+        # 목록 조회가 시리즈마다 읽는 최신 샘플 (엔드포인트는 Series.last를 그대로 응답)
+        start = time.perf_counter_ns()
+        for name in names:
+            store.pod_store[name].last
+        results[f"store.latest.{size}"] = result(time.perf_counter_ns() - start, len(names))
+        del samples, store
+    # 저장된 샘플 1개당 실제 메모리 (수신 모델 객체 해제 후 tracemalloc 기준)
+    size = args.sizes[0]
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    samples = make_pod_samples(size, args.samples)
+    count = len(samples)
+    store = MetricsStore()
+    for sample in samples:
+        store.add_pod_metrics(sample)
+    del samples
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    results[f"store.ingest.{size}"]["bytes_per_sample"] = round(used / count, 1)
+    return results
+
+# ===== 6. FastAPI end-to-end (in-process) =====
+
+@benchmark("api")
+def bench_api(args):
+    try:
+        from fastapi.testclient import TestClient
+    except (ImportError, RuntimeError) as e:
+        print(f"  [SKIP] api 벤치마크: {e} (bench/requirements.txt 설치 필요)")
+        return {}
+    import main
+    main.store.__init__()
+    main.response_cache.clear()
+    client = TestClient(main.app)
+    pods = min(args.sizes[0], 1000)
+    payloads = [sample.model_dump(mode="json") if hasattr(sample, "model_dump") else json.loads(sample.json())
+                for sample in make_pod_samples(pods, 1)]
+
+    start = time.perf_counter_ns()
+    for payload in payloads:
+        client.post(f"/api/pods/{payload['pod']}", json=payload)
+    results = {f"api.ingest_pod.{pods}": result(time.perf_counter_ns() - start, len(payloads))}
+
+    import wire_encoder
+    batch = wire_encoder.encode_batch(pods=make_pod_payloads(args.pods))
+    headers = {"Content-Type": wire_encoder.CONTENT_TYPE}
+    entry = measure(lambda: client.post("/api/batch", content=batch, headers=headers), 10, repeat=3)
+    # 배치 1회가 아닌 샘플 1개 기준으로 환산
+    entry = result(entry["ns_per_op"] * 10, 10 * args.pods)
+    results[f"api.ingest_batch_binary.{args.pods}"] = entry
+
+    node = {"timestamp": datetime.now(timezone.utc).isoformat(), "node": "node-0", "cpu_millicores": 100}
+    results["api.ingest_node"] = measure(lambda: client.post("/api/nodes/node-0", json=node), 200, repeat=3)
+    results[f"api.get_pods.{pods}"] = measure(lambda: client.get("/api/pods"), 20, repeat=3)
+    results[f"api.get_pods_window.{pods}"] = measure(lambda: client.get("/api/pods?window=300"), 20, repeat=3)
+    results["api.get_nodes"] = measure(lambda: client.get("/api/nodes"), 200, repeat=3)
+    results["api.get_pod"] = measure(lambda: client.get(f"/api/pods/{payloads[0]['pod']}"), 200, repeat=3)
+    # 수집이 계속 들어오는 중의 목록 조회 (포드 샘플 1개 수집 + GET /api/pods 1회가 1 op)
+    ingest = iter(payloads * 1000)
+
+    def ingest_and_list():
+        payload = next(ingest)
+        client.post(f"/api/pods/{payload['pod']}", json=payload)
+        client.get("/api/pods")
+
+    hits, misses = main.response_cache.hits, main.response_cache.misses
+    entry = measure(ingest_and_list, 50, repeat=3)
+    hits, misses = main.response_cache.hits - hits, main.response_cache.misses - misses
+    entry["list_hit_ratio"] = round(hits / (hits + misses), 3)
+    results[f"api.get_pods_during_ingest.{pods}"] = entry
+    # 응답 캐시 없이 매번 계산/직렬화하는 경우 (위 GET 항목은 반복 요청이 캐시에 적중)
+    ttl = main.response_cache.ttl
+    main.response_cache.ttl = 0
+    try:
+        results[f"api.get_pods_window_uncached.{pods}"] = measure(lambda: client.get("/api/pods?window=300"), 20, repeat=3)
+    finally:
+        main.response_cache.ttl = ttl
+    return results
+
+# ===== 실행 / 비교 =====
+
+def run(args):
+    results = {}
+    for name, func in BENCHMARKS:
+        if args.only and not any(name.startswith(p) or p.startswith(name) for p in args.only):
+            continue
+        print(f"▶ {name}")
+        for key, value in func(args).items():
+            if args.only and not any(key.startswith(p) for p in args.only):
+                continue
+            results[key] = value
+            extra = "".join(f" {k}={v}" for k, v in value.items() if k not in ("ns_per_op", "ops_per_sec"))
+            print(f"  {key:<32} {value['ns_per_op']:>14,.1f} ns/op {value['ops_per_sec']:>14,.1f} ops/s{extra}")
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(args.sizes),
+            "samples_per_series": args.samples,
+            "pods_per_node": args.pods,
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, threshold):
+    """베이스라인 대비 ns/op가 threshold 비율 이상 증가한 항목 목록 반환"""
+    regressions = []
+    print(f"\n=== 베이스라인 비교 (허용 {threshold * 100:.0f}%) ===")
+    for key, value in sorted(current["results"].items()):
+        base = baseline["results"].get(key)
+        if not base:
+            print(f"  {key:<32} (베이스라인 없음)")
+            continue
+        ratio = value["ns_per_op"] / base["ns_per_op"] if base["ns_per_op"] else 1.0
+        mark = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"  {key:<32} {ratio:6.2f}x  {mark}")
+        if ratio > 1 + threshold:
+            regressions.append(key)
+    return regressions
+
+def baseline_path(name):
+    return name if name.endswith(".json") else os.path.join(BASELINES, f"{name}.json")
+
+def main():
+    parser = argparse.ArgumentParser(description="kubemonitor 오프라인 벤치마크")
+    parser.add_argument("--only", nargs="*", default=[], help="이름 접두사로 벤치마크 선택 (parse, store, api, ...)")
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in v.split(",")], default=list(DEFAULT_SIZES),
+                        help="MetricsStore 시리즈 수 목록 (쉼표 구분, 기본 1000,10000,100000)")
+    parser.add_argument("--samples", type=int, default=3, help="시리즈당 샘플 수 (기본 3)")
+    parser.add_argument("--pods", type=int, default=250, help="수집 주기 벤치마크의 노드당 포드 수 (기본 250)")
+    parser.add_argument("--cycles", type=int, default=10, help="수집 주기 벤치마크 반복 횟수 (기본 10)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--save-baseline", metavar="NAME", help="결과를 bench/baselines/NAME.json으로 저장")
+    parser.add_argument("--compare", metavar="NAME", help="bench/baselines/NAME.json과 비교")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀 판정 비율 (기본 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    current = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.save_baseline:
+        path = baseline_path(args.save_baseline)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        saved = current
+        if args.only and os.path.exists(path):
+            # 일부만 실행했으면 기존 베이스라인에서 실행한 항목만 교체 (나머지 수치는 그대로)
+            with open(path) as f:
+                saved = json.load(f)
+            saved["results"].update(current["results"])
+            saved["meta"]["updated_at"] = current["meta"]["created_at"]
+        with open(path, "w") as f:
+            json.dump(saved, f, indent=2)
+        print(f"\n베이스라인 저장: {path} ({len(current['results'])}개 항목)")
+    if args.compare:
+        with open(baseline_path(args.compare)) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ 회귀 없음")
+
+if __name__ == "__main__":
+    main()
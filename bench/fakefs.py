@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""오프라인 Collector 실행용 가짜 cgroup/proc 파일시스템 생성기
+
+cgroup v1 또는 v2 계층에 kubepods 슬라이스 수천 개와 그에 맞는 /proc 파일,
+PodList JSON(POD_LIST_FILE)을 만들고(--sidecars를 주면 일부 포드에 사이드카 컨테이너 cgroup 추가),
+--mutate-every를 주면 카운터를 계속 증가시킨다.
+
+사용 예:
+    python bench/fakefs.py --root /tmp/kubefake --pods 250 --cgroup v2 --mutate-every 1
+    # 출력된 환경 변수로 Collector 실행
+    CGROUP_ROOT=/tmp/kubefake/sys/fs/cgroup PROC_ROOT=/tmp/kubefake/proc \\
+    POD_LIST_FILE=/tmp/kubefake/pods.json NODE_NAME=fake-node python collector/collector.py
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import time
+import uuid
+
+QOS_CLASSES = ("Guaranteed", "Burstable", "BestEffort")
+
+def write_file(path, content):
+    """파일 내용을 제자리(in-place)에서 교체 (열린 fd가 같은 inode를 계속 보도록 rename 사용 안 함)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content.encode())
+    finally:
+        os.close(fd)
+
+class FakeNode:
+    """가짜 노드 하나의 cgroup/proc 트리와 포드 목록"""
+
+    def __init__(self, root, pods=250, version="v2", node="fake-node", qos="burstable",
+                 namespaces=10, deployments_per_ns=5, seed=1, sidecars=0.0):
+        self.root = os.path.abspath(root)
+        self.version = version
+        self.node = node
+        self.qos = qos
+        self.sidecars = sidecars  # 사이드카 컨테이너(istio-proxy)를 가진 포드 비율
+        self.rng = random.Random(seed)
+        self.cgroup_root = os.path.join(self.root, "sys", "fs", "cgroup")
+        self.proc_root = os.path.join(self.root, "proc")
+        self.pod_list_file = os.path.join(self.root, "pods.json")
+        self.deployments = [(f"ns-{i:02d}", f"app-{j:02d}", uuid.UUID(int=self.rng.getrandbits(128)).hex[:10])
+                            for i in range(namespaces) for j in range(deployments_per_ns)]
+        self.pods = {}
+        self.node_counters = {"cpu_usec": 10 ** 9, "rbytes": 0, "wbytes": 0}
+        self.initial_pods = pods
+
+    @property
+    def env(self):
+        """Collector 실행에 필요한 환경 변수"""
+        return {
+            "CGROUP_ROOT": self.cgroup_root,
+            "PROC_ROOT": self.proc_root,
+            "POD_LIST_FILE": self.pod_list_file,
+            "NODE_NAME": self.node,
+        }
+
+    def build(self):
+        """트리 전체 생성 (기존 root는 삭제)"""
+        if os.path.exists(self.root):
+            shutil.rmtree(self.root)
+        os.makedirs(os.path.join(self.proc_root, "net"))
+        os.makedirs(os.path.join(self.proc_root, "pressure"))
+        os.makedirs(self.cgroup_root)
+        if self.version == "v2":
+            write_file(os.path.join(self.cgroup_root, "cgroup.controllers"), "cpuset cpu io memory hugetlb pids rdma misc\n")
+        else:
+            for controller in ("cpu,cpuacct", "memory", "blkio"):
+                os.makedirs(os.path.join(self.cgroup_root, controller))
+            os.symlink("cpu,cpuacct", os.path.join(self.cgroup_root, "cpu"))
+            os.symlink("cpu,cpuacct", os.path.join(self.cgroup_root, "cpuacct"))
+        for _ in range(self.initial_pods):
+            self._spawn()
+        self.mutate(0.0, dt=0.0)
+
+    def _pick_qos(self):
+        if self.qos == "mixed":
+            return self.rng.choices(QOS_CLASSES, weights=(2, 7, 1))[0]
+        return {"guaranteed": "Guaranteed", "burstable": "Burstable", "besteffort": "BestEffort"}[self.qos]
+
+    def _pod_dirs(self, uid, qos):
+        """포드 cgroup 디렉토리 목록 (v2는 1개, v1은 컨트롤러별)"""
+        if self.version == "v2":
+            u = uid.replace("-", "_")
+            if qos == "Guaranteed":
+                rel = f"kubepods.slice/kubepods-pod{u}.slice"
+            else:
+                q = qos.lower()
+                rel = f"kubepods.slice/kubepods-{q}.slice/kubepods-{q}-pod{u}.slice"
+            return [os.path.join(self.cgroup_root, rel)]
+        sub = f"kubepods/pod{uid}" if qos == "Guaranteed" else f"kubepods/{qos.lower()}/pod{uid}"
+        return [os.path.join(self.cgroup_root, c, sub) for c in ("cpu,cpuacct", "memory", "blkio")]
+
+    def _container_dir(self, pod_dir, container_id):
+        """컨테이너 cgroup 디렉토리 (v2는 systemd 드라이버 이름, v1은 cgroupfs 드라이버 이름)"""
+        if self.version == "v2":
+            return os.path.join(pod_dir, f"cri-containerd-{container_id}.scope")
+        return os.path.join(pod_dir, container_id)
+
+    def _spawn(self):
+        ns, dp, rs_hash = self.rng.choice(self.deployments)
+        uid = str(uuid.UUID(int=self.rng.getrandbits(128)))
+        qos = self._pick_qos()
+        name = f"{dp}-{rs_hash}-{uid[:5]}"
+        pod = {
+            "name": name, "namespace": ns, "deployment": dp, "rs": f"{dp}-{rs_hash}",
+            "uid": uid, "qos": qos,
+            "containers": [{"name": "app", "id": uuid.UUID(int=self.rng.getrandbits(128)).hex * 2}],
+            "cpu_rate": self.rng.uniform(0.001, 0.8),       # 코어 단위
+            "mem_base": self.rng.randint(16, 1024) * 2 ** 20,
+            "io_rate": self.rng.randint(0, 2 ** 20),          # bytes/s
+            "idle": self.rng.random() < 0.3,                   # 카운터가 거의 변하지 않는 포드
+            "cpu_usec": 0, "rbytes": 0, "wbytes": 0, "nr_periods": 0, "nr_throttled": 0, "throttled_usec": 0,
+            "dirs": self._pod_dirs(uid, qos),
+        }
+        for d in pod["dirs"]:
+            os.makedirs(d, exist_ok=True)
+        if self.sidecars and self.rng.random() < self.sidecars:
+            pod["containers"][0]["share"] = 0.8
+            pod["containers"].append({"name": "istio-proxy", "id": uuid.UUID(int=self.rng.getrandbits(128)).hex * 2,
+                                      "share": 0.2})
+            # pause(sandbox) 컨테이너 cgroup - containerStatuses에 없으므로 Collector는 무시해야 함
+            sandbox = uuid.UUID(int=self.rng.getrandbits(128)).hex * 2
+            for c in pod["containers"] + [{"id": sandbox}]:
+                c["dirs"] = [self._container_dir(d, c["id"]) for d in pod["dirs"]]
+                for d in c["dirs"]:
+                    os.makedirs(d, exist_ok=True)
+        self.pods[uid] = pod
+
+    def _remove(self, uid):
+        pod = self.pods.pop(uid)
+        for d in pod["dirs"]:
+            shutil.rmtree(d, ignore_errors=True)
+
+    def mutate(self, churn=0.0, dt=1.0):
+        """카운터를 dt초만큼 진행시키고 churn 비율의 포드를 교체"""
+        if churn > 0:
+            for uid in self.rng.sample(list(self.pods), int(len(self.pods) * churn)):
+                self._remove(uid)
+                self._spawn()
+        total_cpu = 0
+        for pod in self.pods.values():
+            if not pod["idle"] or pod["cpu_usec"] == 0:
+                self._advance(pod, dt)
+            self._write_pod(pod)
+            total_cpu += pod["cpu_usec"]
+        self.node_counters["cpu_usec"] += int(dt * 150_000) + total_cpu // 1000
+        self.node_counters["rbytes"] += self.rng.randint(0, 2 ** 20)
+        self.node_counters["wbytes"] += self.rng.randint(0, 2 ** 21)
+        self._write_node()
+        self._write_pod_list()
+
+    def _advance(self, pod, dt):
+        usec = int(pod["cpu_rate"] * dt * 1_000_000 * self.rng.uniform(0.5, 1.5))
+        pod["cpu_usec"] += usec
+        pod["rbytes"] += int(pod["io_rate"] * dt * self.rng.random())
+        pod["wbytes"] += int(pod["io_rate"] * dt * self.rng.random())
+        periods = int(dt * 10)
+        pod["nr_periods"] += periods
+        if pod["cpu_rate"] > 0.5:
+            pod["nr_throttled"] += periods // 3
+            pod["throttled_usec"] += usec // 10
+
+    def _write_pod(self, pod):
+        mem = int(pod["mem_base"] * self.rng.uniform(0.97, 1.03))
+        avgs = [round(self.rng.uniform(0, 5), 2) if not pod["idle"] else 0.0 for _ in range(3)] \
+            if self.version == "v2" else None
+        counters = {k: pod[k] for k in ("cpu_usec", "rbytes", "wbytes", "nr_periods", "nr_throttled", "throttled_usec")}
+        self._write_group(pod["dirs"], counters, mem, avgs)
+        if len(pod["containers"]) > 1:
+            # 컨테이너 cgroup 값은 포드 값을 share 비율로 나눈 것 (합계가 포드 값과 대략 일치)
+            for c in pod["containers"]:
+                self._write_group(c["dirs"], {k: int(v * c["share"]) for k, v in counters.items()},
+                                  int(mem * c["share"]), avgs)
+
+    def _write_group(self, dirs, c, mem, avgs):
+        """포드 또는 컨테이너 cgroup 하나의 파일 쓰기"""
+        anon = mem * 7 // 10
+        file_bytes = mem - anon
+        if self.version == "v2":
+            d = dirs[0]
+            write_file(os.path.join(d, "cpu.stat"),
+                       f"usage_usec {c['cpu_usec']}\nuser_usec {c['cpu_usec'] * 2 // 3}\n"
+                       f"system_usec {c['cpu_usec'] // 3}\nnr_periods {c['nr_periods']}\n"
+                       f"nr_throttled {c['nr_throttled']}\nthrottled_usec {c['throttled_usec']}\n"
+                       f"nr_bursts 0\nburst_usec 0\n")
+            write_file(os.path.join(d, "memory.current"), f"{mem}\n")
+            write_file(os.path.join(d, "memory.stat"),
+                       f"anon {anon}\nfile {file_bytes}\nkernel_stack 16384\nshmem 0\n"
+                       f"active_anon {anon}\ninactive_anon 0\nactive_file {file_bytes // 2}\n"
+                       f"inactive_file {file_bytes - file_bytes // 2}\n")
+            write_file(os.path.join(d, "io.stat"),
+                       f"8:0 rbytes={c['rbytes']} wbytes={c['wbytes']} rios={c['rbytes'] // 4096} "
+                       f"wios={c['wbytes'] // 4096} dbytes=0 dios=0\n")
+            for res, avg in zip(("cpu", "memory", "io"), avgs):
+                write_file(os.path.join(d, f"{res}.pressure"),
+                           f"some avg10={avg:.2f} avg60={avg:.2f} avg300={avg:.2f} total={c['throttled_usec']}\n"
+                           f"full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+        else:
+            cpu_dir, mem_dir, blkio_dir = dirs
+            write_file(os.path.join(cpu_dir, "cpuacct.usage"), f"{c['cpu_usec'] * 1000}\n")
+            write_file(os.path.join(cpu_dir, "cpu.stat"),
+                       f"nr_periods {c['nr_periods']}\nnr_throttled {c['nr_throttled']}\n"
+                       f"throttled_time {c['throttled_usec'] * 1000}\n")
+            write_file(os.path.join(mem_dir, "memory.usage_in_bytes"), f"{mem}\n")
+            write_file(os.path.join(mem_dir, "memory.stat"),
+                       f"cache {file_bytes}\nrss {anon}\nmapped_file 0\n"
+                       f"total_cache {file_bytes}\ntotal_rss {anon}\n"
+                       f"total_inactive_file {file_bytes - file_bytes // 2}\ntotal_active_file {file_bytes // 2}\n")
+            write_file(os.path.join(blkio_dir, "blkio.throttle.io_service_bytes"),
+                       f"8:0 Read {c['rbytes']}\n8:0 Write {c['wbytes']}\n8:0 Sync 0\n8:0 Async 0\n"
+                       f"8:0 Total {c['rbytes'] + c['wbytes']}\nTotal {c['rbytes'] + c['wbytes']}\n")
+
+    def _write_node(self):
+        c = self.node_counters
+        if self.version == "v2":
+            write_file(os.path.join(self.cgroup_root, "cpu.stat"),
+                       f"usage_usec {c['cpu_usec']}\nuser_usec {c['cpu_usec'] // 2}\nsystem_usec {c['cpu_usec'] // 2}\n")
+            write_file(os.path.join(self.cgroup_root, "io.stat"),
+                       f"8:0 rbytes={c['rbytes']} wbytes={c['wbytes']} rios=0 wios=0 dbytes=0 dios=0\n")
+        else:
+            write_file(os.path.join(self.cgroup_root, "cpu,cpuacct", "cpuacct.usage"), f"{c['cpu_usec'] * 1000}\n")
+            write_file(os.path.join(self.cgroup_root, "blkio", "blkio.throttle.io_service_bytes"),
+                       f"8:0 Read {c['rbytes']}\n8:0 Write {c['wbytes']}\nTotal {c['rbytes'] + c['wbytes']}\n")
+        total_kb = 16 * 1024 * 1024
+        used_kb = sum(p["mem_base"] for p in self.pods.values()) // 1024 + 1024 * 1024
+        free_kb = max(0, total_kb - used_kb - 2 * 1024 * 1024)
+        write_file(os.path.join(self.proc_root, "meminfo"),
+                   f"MemTotal:       {total_kb} kB\nMemFree:        {free_kb} kB\n"
+                   f"MemAvailable:   {free_kb + 1536 * 1024} kB\nBuffers:          {512 * 1024} kB\n"
+                   f"Cached:         {1536 * 1024} kB\nSwapCached:            0 kB\n"
+                   f"Active:         {used_kb // 2} kB\nInactive:       {used_kb // 2} kB\n"
+                   f"Inactive(file): {used_kb // 4} kB\nSwapTotal:             0 kB\nSwapFree:              0 kB\n"
+                   f"AnonPages:      {used_kb * 7 // 10} kB\n")
+        for res in ("cpu", "memory", "io"):
+            avg = round(self.rng.uniform(0, 2), 2)
+            write_file(os.path.join(self.proc_root, "pressure", res),
+                       f"some avg10={avg:.2f} avg60={avg:.2f} avg300={avg:.2f} total={c['cpu_usec']}\n"
+                       f"full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+        lines = ["Inter-|   Receive                                                |  Transmit",
+                 " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed",
+                 f"    lo: {c['cpu_usec'] // 7} {c['cpu_usec'] // 700} 0 0 0 0 0 0 {c['cpu_usec'] // 7} {c['cpu_usec'] // 700} 0 0 0 0 0 0",
+                 f"  eth0: {c['rbytes'] * 3} {c['rbytes'] // 900} 0 0 0 0 0 0 {c['wbytes'] * 2} {c['wbytes'] // 900} 0 0 0 0 0 0"]
+        for pod in self.pods.values():
+            lines.append(f"veth{pod['uid'][:8]}: {pod['rbytes']} {pod['rbytes'] // 1500} 0 0 0 0 0 0 "
+                         f"{pod['wbytes']} {pod['wbytes'] // 1500} 0 0 0 0 0 0")
+        write_file(os.path.join(self.proc_root, "net", "dev"), "\n".join(lines) + "\n")
+
+    def pod_list(self):
+        """Kubernetes PodList 형식의 포드 목록"""
+        items = []
+        for pod in self.pods.values():
+            items.append({
+                "metadata": {
+                    "name": pod["name"], "namespace": pod["namespace"], "uid": pod["uid"],
+                    "ownerReferences": [{"kind": "ReplicaSet", "name": pod["rs"]}],
+                },
+                "spec": {"nodeName": self.node, "containers": [{"name": c["name"]} for c in pod["containers"]]},
+                "status": {
+                    "phase": "Running", "qosClass": pod["qos"],
+                    "containerStatuses": [{"name": c["name"], "containerID": f"containerd://{c['id']}"}
+                                          for c in pod["containers"]],
+                },
+            })
+        return {"kind": "PodList", "apiVersion": "v1", "items": items}
+
+    def _write_pod_list(self):
+        # 포드 목록은 매번 새로 열어 읽으므로 원자적으로 교체
+        tmp = self.pod_list_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.pod_list(), f)
+        os.replace(tmp, self.pod_list_file)
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 cgroup/proc 파일시스템 생성기")
+    parser.add_argument("--root", required=True, help="생성할 루트 디렉토리 (기존 내용 삭제)")
+    parser.add_argument("--pods", type=int, default=250, help="포드 수")
+    parser.add_argument("--cgroup", choices=("v1", "v2"), default="v2", help="cgroup 버전")
+    parser.add_argument("--qos", choices=("burstable", "guaranteed", "besteffort", "mixed"), default="burstable",
+                        help="포드 QoS 클래스 분포")
+    parser.add_argument("--node", default="fake-node", help="노드 이름 (PodList의 spec.nodeName)")
+    parser.add_argument("--seed", type=int, default=1, help="난수 시드")
+    parser.add_argument("--mutate-every", type=float, default=0.0, help="카운터 갱신 주기(초), 0이면 생성 후 종료")
+    parser.add_argument("--sidecars", type=float, default=0.0, help="사이드카 컨테이너를 가진 포드 비율")
+    parser.add_argument("--churn", type=float, default=0.0, help="갱신마다 교체할 포드 비율")
+    args = parser.parse_args()
+
+    fake = FakeNode(args.root, pods=args.pods, version=args.cgroup, node=args.node, qos=args.qos, seed=args.seed,
+                    sidecars=args.sidecars)
+    fake.build()
+    print(" ".join(f"{k}={v}" for k, v in fake.env.items()))
+    if args.mutate_every <= 0:
+        return 0
+    print(f"{args.mutate_every}초마다 카운터 갱신 중 (Ctrl+C로 종료)", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(args.mutate_every)
+            fake.mutate(args.churn, dt=args.mutate_every)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""kubemonitor 합성 클러스터 부하 생성기
+
+실제 클러스터 없이 N개의 Collector(노드)를 흉내 내어 API 서버에 메트릭을 전송한다.
+포드는 네임스페이스/디플로이먼트에 분산되며, 매 주기 일부 포드가 교체(churn)된다.
+달성한 수집률, 오류율, 지연 백분위를 보고해 API의 포화 지점을 찾는 데 사용한다.
+
+사용 예:
+    uvicorn main:app --app-dir api --port 8080 &
+    python bench/loadgen.py --nodes 50 --pods-per-node 100 --duration 60
+    python bench/loadgen.py --nodes 500 --pods-per-node 100 --concurrency 64 --json-out load.json
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "collector"))
+import wire_encoder
+
+def _suffix(rng, n=5):
+    return "".join(rng.choice(string.ascii_lowercase + string.digits) for _ in range(n))
+
+class SyntheticCluster:
+    """노드/네임스페이스/디플로이먼트/포드로 구성된 합성 클러스터 상태"""
+
+    def __init__(self, nodes, pods_per_node, namespaces, deployments_per_ns, seed=42):
+        self.rng = random.Random(seed)
+        self.nodes = [f"sim-node-{i:04d}" for i in range(nodes)]
+        self.namespaces = [f"sim-ns-{i:03d}" for i in range(namespaces)]
+        self.deployments = [(ns, f"app-{j:03d}", _suffix(self.rng, 10))
+                            for ns in self.namespaces for j in range(deployments_per_ns)]
+        # node -> {pod_name: pod_info}
+        self.pods = {node: {} for node in self.nodes}
+        for node in self.nodes:
+            for _ in range(pods_per_node):
+                self._spawn(node)
+
+    def _spawn(self, node, pods=None):
+        ns, dp, rs_hash = self.rng.choice(self.deployments)
+        name = f"{dp}-{rs_hash}-{_suffix(self.rng)}"
+        (self.pods[node] if pods is None else pods)[name] = {
+            "namespace": ns,
+            "deployment": dp,
+            "cpu_base": self.rng.randint(5, 800),
+            "mem_base": self.rng.randint(20, 900) * 1024 * 1024,
+            "io": 0,
+            "net": 0,
+        }
+
+    def churn(self, fraction):
+        """노드마다 fraction 비율의 포드를 종료하고 새 포드로 교체 (롤아웃 흉내)
+
+        전송 스레드가 scrape 중인 포드 dict를 바꾸지 않도록 노드마다 새 dict를 만들어 참조만 교체한다.
+        """
+        replaced = 0
+        for node in self.nodes:
+            pods = self.pods[node]
+            count = int(len(pods) * fraction)
+            if fraction > 0 and self.rng.random() < len(pods) * fraction - count:
+                count += 1
+            if not count:
+                continue
+            gone = set(self.rng.sample(list(pods), min(count, len(pods))))
+            fresh = {name: info for name, info in pods.items() if name not in gone}
+            for _ in gone:
+                self._spawn(node, fresh)
+            self.pods[node] = fresh
+            replaced += len(gone)
+        return replaced
+
+    def scrape(self, node, rng):
+        """한 노드의 한 주기 분량 payload 목록 생성 [(endpoint, payload), ...]"""
+        ts = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        requests_out = []
+        pods = self.pods[node]  # churn은 dict를 교체만 하므로 이 주기 동안 바뀌지 않음
+        node_cpu = 0
+        node_mem = 0
+        ns_stats = {}
+        dp_stats = {}
+        for name, info in pods.items():
+            cpu = max(0, int(info["cpu_base"] * rng.uniform(0.5, 1.5)))
+            mem = int(info["mem_base"] * rng.uniform(0.95, 1.05))
+            info["io"] += rng.randint(0, 65536)
+            info["net"] += rng.randint(0, 262144)
+            node_cpu += cpu
+            node_mem += mem
+            pod = {
+                "timestamp": ts, "node": node, "namespace": info["namespace"],
+                "deployment": info["deployment"], "pod": name,
+                "cpu_millicores": cpu, "memory_bytes": mem,
+                "disk_read_bytes": info["io"], "disk_write_bytes": info["io"] // 2,
+                "network_rx_bytes": info["net"], "network_tx_bytes": info["net"] // 3,
+                "pod_name": name, "cpu_usage": cpu / 10,
+            }
+            requests_out.append((f"api/pods/{name}", pod))
+            for stats, key in ((ns_stats, info["namespace"]), (dp_stats, (info["namespace"], info["deployment"]))):
+                agg = stats.setdefault(key, [0, 0, 0, 0, 0, 0])
+                agg[0] += cpu
+                agg[1] += mem
+                agg[2] += pod["disk_read_bytes"]
+                agg[3] += pod["disk_write_bytes"]
+                agg[4] += pod["network_rx_bytes"]
+                agg[5] += pod["network_tx_bytes"]
+        node_payload = {
+            "timestamp": ts, "node": node, "cpu_millicores": node_cpu + rng.randint(50, 300),
+            "memory_bytes": node_mem + 512 * 1024 * 1024,
+            "disk_read_bytes": 0, "disk_write_bytes": 0, "network_rx_bytes": 0, "network_tx_bytes": 0,
+        }
+        requests_out.insert(0, (f"api/nodes/{node}", node_payload))
+        for ns, agg in ns_stats.items():
+            requests_out.append((f"api/namespaces/{ns}", dict(_aggregate(ts, agg), namespace=ns)))
+        for (ns, dp), agg in dp_stats.items():
+            requests_out.append((f"api/namespaces/{ns}/deployments/{dp}",
+                                 dict(_aggregate(ts, agg), namespace=ns, deployment=dp)))
+        return requests_out
+
+def _aggregate(ts, agg):
+    return {
+        "timestamp": ts, "cpu_millicores": agg[0], "memory_bytes": agg[1],
+        "disk_read_bytes": agg[2], "disk_write_bytes": agg[3],
+        "network_rx_bytes": agg[4], "network_tx_bytes": agg[5], "cpu_usage": agg[0] / 10,
+    }
+
+class LoadStats:
+    """요청 결과 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.status = Counter()
+        self.samples = 0
+        self.late_cycles = 0
+        self.cycles = 0
+
+    def record(self, latency, status, samples):
+        with self.lock:
+            self.latencies.append(latency)
+            self.status[status] += 1
+            if status == 200:
+                self.samples += samples
+
+    def snapshot(self, elapsed):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            status = dict(self.status)
+            samples = self.samples
+        total = len(latencies)
+        errors = total - status.get(200, 0)
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "requests": total,
+            "requests_per_sec": round(total / elapsed, 1) if elapsed else 0.0,
+            "samples_per_sec": round(samples / elapsed, 1) if elapsed else 0.0,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "status": {str(k): v for k, v in sorted(status.items(), key=lambda kv: str(kv[0]))},
+            "cycles": self.cycles,
+            "late_cycles": self.late_cycles,
+            "latency_ms": {
+                "p50": _pct(latencies, 50), "p90": _pct(latencies, 90),
+                "p99": _pct(latencies, 99), "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            },
+        }
+
+def _pct(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = max(0, min(len(sorted_values) - 1, int(len(sorted_values) * q / 100.0 + 0.5) - 1))
+    return round(sorted_values[idx] * 1000, 2)
+
+_local = threading.local()
+
+def _session():
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+def run_collector_cycle(base_url, cluster, node, stats, timeout, batch="none"):
+    """한 노드의 한 주기 전송 (실제 Collector처럼 순차 전송, batch 지정 시 /api/batch 1회)"""
+    session = _session()
+    rng = random.Random()
+    scraped = cluster.scrape(node, rng)
+    if batch != "none":
+        groups = {"nodes": [], "pods": [], "namespaces": [], "deployments": []}
+        for endpoint, payload in scraped:
+            if endpoint.startswith("api/nodes/"):
+                groups["nodes"].append(payload)
+            elif endpoint.startswith("api/pods/"):
+                groups["pods"].append(payload)
+            elif "/deployments/" in endpoint:
+                groups["deployments"].append(payload)
+            else:
+                groups["namespaces"].append(payload)
+        if batch == "binary":
+            body = wire_encoder.encode_batch(**groups)
+            content_type = wire_encoder.CONTENT_TYPE
+        else:
+            body = json.dumps(groups)
+            content_type = "application/json"
+        start = time.perf_counter()
+        try:
+            resp = session.post(f"{base_url}/api/batch", data=body, headers={"Content-Type": content_type},
+                                timeout=timeout)
+            status = resp.status_code
+        except requests.RequestException as e:
+            status = type(e).__name__
+        stats.record(time.perf_counter() - start, status, len(scraped))
+        return
+    for endpoint, payload in scraped:
+        start = time.perf_counter()
+        try:
+            resp = session.post(f"{base_url}/{endpoint}", data=json.dumps(payload),
+                                headers={"Content-Type": "application/json"}, timeout=timeout)
+            status = resp.status_code
+        except requests.RequestException as e:
+            status = type(e).__name__
+        stats.record(time.perf_counter() - start, status, 1)
+
+def main():
+    parser = argparse.ArgumentParser(description="kubemonitor 합성 클러스터 부하 생성기")
+    parser.add_argument("--url", default="http://localhost:8080", help="API 서버 주소")
+    parser.add_argument("--nodes", type=int, default=10, help="시뮬레이션할 노드(Collector) 수")
+    parser.add_argument("--pods-per-node", type=int, default=100, help="노드당 포드 수")
+    parser.add_argument("--namespaces", type=int, default=20, help="네임스페이스 수")
+    parser.add_argument("--deployments-per-ns", type=int, default=10, help="네임스페이스당 디플로이먼트 수")
+    parser.add_argument("--interval", type=float, default=5.0, help="Collector 수집 주기(초)")
+    parser.add_argument("--churn", type=float, default=0.02, help="주기마다 교체되는 포드 비율")
+    parser.add_argument("--duration", type=float, default=60.0, help="실행 시간(초)")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 전송 스레드 수")
+    parser.add_argument("--timeout", type=float, default=10.0, help="요청 타임아웃(초)")
+    parser.add_argument("--batch", choices=("none", "json", "binary"), default="none",
+                        help="노드별 주기 전송 방식 (none: 객체별 POST, json/binary: /api/batch 1회)")
+    parser.add_argument("--report-every", type=float, default=5.0, help="진행 상황 출력 주기(초)")
+    parser.add_argument("--json-out", help="최종 결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    cluster = SyntheticCluster(args.nodes, args.pods_per_node, args.namespaces, args.deployments_per_ns)
+    stats = LoadStats()
+    print(f"합성 클러스터: 노드 {args.nodes}, 포드 {args.nodes * args.pods_per_node}, "
+          f"디플로이먼트 {len(cluster.deployments)}, 목표 {args.nodes * args.pods_per_node / args.interval:,.0f} pod samples/s")
+
+    inflight = {}
+    start = time.monotonic()
+    next_cycle = start
+    next_report = start + args.report_every
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        while time.monotonic() - start < args.duration:
+            now = time.monotonic()
+            if now >= next_cycle:
+                stats.cycles += 1
+                cluster.churn(args.churn)
+                for node in cluster.nodes:
+                    future = inflight.get(node)
+                    if future is not None and not future.done():
+                        # 이전 주기 전송이 끝나지 않음 -> API가 따라오지 못하는 상태
+                        stats.late_cycles += 1
+                        continue
+                    inflight[node] = pool.submit(run_collector_cycle, args.url, cluster, node, stats,
+                                                 args.timeout, args.batch)
+                next_cycle += args.interval
+            if now >= next_report:
+                snap = stats.snapshot(now - start)
+                print(f"[{snap['elapsed_seconds']:>6.1f}s] {snap['requests_per_sec']:>9,.1f} req/s "
+                      f"{snap['samples_per_sec']:>9,.1f} samples/s err={snap['error_rate']:.2%} "
+                      f"p50={snap['latency_ms']['p50']}ms p99={snap['latency_ms']['p99']}ms late={stats.late_cycles}")
+                next_report += args.report_every
+            time.sleep(min(0.05, max(0.0, min(next_cycle, next_report) - time.monotonic())))
+        for future in inflight.values():
+            future.cancel()
+
+    result = stats.snapshot(time.monotonic() - start)
+    result["config"] = vars(args)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    return 0 if result["error_rate"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+import os
+import re
+
+# 포드 QoS 클래스별 cgroup 상대 경로 후보 (systemd 드라이버 → cgroupfs 드라이버 순, v1은 컨트롤러 디렉토리 아래)
+POD_PATTERNS = {
+    "Guaranteed": ("kubepods.slice/kubepods-pod{u}.slice", "kubepods/pod{uid}"),
+    "Burstable": ("kubepods.slice/kubepods-burstable.slice/kubepods-burstable-pod{u}.slice",
+                  "kubepods/burstable/pod{uid}"),
+    "BestEffort": ("kubepods.slice/kubepods-besteffort.slice/kubepods-besteffort-pod{u}.slice",
+                   "kubepods/besteffort/pod{uid}"),
+}
+IO_RBYTES = re.compile(rb"rbytes=(\d+)")
+IO_WBYTES = re.compile(rb"wbytes=(\d+)")
+BLKIO_READ = re.compile(rb" Read (\d+)")
+BLKIO_WRITE = re.compile(rb" Write (\d+)")
+# read_pod() 결과 중 기본 4개 지표 외의 포드 신호 필드 (PodMetrics 필드명과 동일)
+SIGNAL_FIELDS = ("memory_anon_bytes", "memory_file_bytes", "memory_working_set_bytes",
+                 "cpu_nr_periods", "cpu_nr_throttled", "cpu_throttled_usec",
+                 "cpu_pressure_some_avg10", "memory_pressure_some_avg10", "memory_pressure_full_avg10",
+                 "io_pressure_some_avg10", "io_pressure_full_avg10")
+V1_CONTROLLERS = {
+    "cpuacct": ("cpu,cpuacct", "cpuacct", "cpuacct,cpu"),
+    "cpu": ("cpu,cpuacct", "cpu", "cpuacct,cpu"),
+    "memory": ("memory",),
+    "blkio": ("blkio",),
+}
+
+def read_file(path):
+    """파일 전체를 bytes로 읽기 (없으면 None)"""
+    try:
+        with open(path, "rb", buffering=0) as f:
+            return f.read()
+    except OSError:
+        return None
+
+def parse_int(data):
+    """단일 정수 파일(memory.current, cpuacct.usage 등) 파싱"""
+    try:
+        return int(data)
+    except (TypeError, ValueError):
+        return 0
+
+def parse_key(data, key):
+    """'key value' 형식 파일(cpu.stat, memory.stat, meminfo)에서 key 값 하나 추출 (없으면 0, 'kB' 단위 표기 무시)"""
+    if not data:
+        return 0
+    needle = key + b" "
+    if data.startswith(needle):
+        start = len(needle)
+    else:
+        idx = data.find(b"\n" + needle)
+        if idx < 0:
+            return 0
+        start = idx + 1 + len(needle)
+    end = data.find(b"\n", start)
+    value = data[start:end] if end >= 0 else data[start:]
+    if value.endswith(b"kB"):
+        value = value[:-2]
+    return int(value)
+
+def parse_io_stat(data):
+    """cgroup v2 io.stat의 장치별 rbytes/wbytes 합계"""
+    if not data:
+        return 0, 0
+    return sum(map(int, IO_RBYTES.findall(data))), sum(map(int, IO_WBYTES.findall(data)))
+
+def parse_blkio(data):
+    """cgroup v1 blkio.throttle.io_service_bytes의 장치별 Read/Write 합계 (마지막 Total 줄 제외)"""
+    if not data:
+        return 0, 0
+    return sum(map(int, BLKIO_READ.findall(data))), sum(map(int, BLKIO_WRITE.findall(data)))
+
+def parse_psi(data):
+    """PSI(*.pressure) 파일의 some/full avg10 (%) - 파일이 없으면 (None, None)"""
+    if data is None:
+        return None, None
+    return _psi_avg10(data, b"some avg10="), _psi_avg10(data, b"full avg10=")
+
+def _psi_avg10(data, needle):
+    idx = data.find(needle)
+    if idx < 0:
+        return None
+    start = idx + len(needle)
+    end = data.find(b" ", start)
+    return float(data[start:end] if end >= 0 else data[start:])
+
+def stat_value(data, key):
+    """'key value' 파일의 값 (파일이 없으면 None)"""
+    return None if data is None else parse_key(data, key)
+
+def working_set(usage, inactive_file):
+    """working set = 사용량 - inactive_file (kubelet 기준)"""
+    if usage is None or inactive_file is None:
+        return None
+    return max(0, usage - inactive_file)
+
+class CgroupBackend:
+    """포드 cgroup 탐색 및 메트릭 읽기 공통 부분
+
+    포드 경로는 처음 한 번만 탐색해 uid별로 캐시하고, retain()으로 사라진 포드를 정리한다.
+    read_pod()는 포드에 필요한 컨트롤러 파일을 한 번씩만 읽어 cpu_ns와 PodMetrics 필드명과 같은
+    키(memory_bytes, disk_*_bytes, memory.stat 분해, CPU throttling, PSI avg10)의 dict를 돌려준다.
+    읽을 수 없는 선택 항목은 None이다. signals=False면 느리게 변하는 신호 파일(memory.stat, PSI,
+    v1의 cpu.stat)은 읽지 않고 마지막으로 읽은 값을 쓴다 (working set은 이번 사용량으로 다시 계산).
+    files(FileCache)가 주어지면 열린 fd를 재사용하고, 포드가 사라질 때 fd도 닫는다.
+    read_containers()는 포드 cgroup의 하위 cgroup(컨테이너)을 같은 방식으로 읽는다.
+    """
+    version = None
+
+    def __init__(self, root, files=None):
+        self.root = root
+        self.files = files
+        self._dirs = {}        # uid -> 포드 cgroup 디렉토리 (v2는 1개, v1은 컨트롤러별)
+        self._paths = {}       # uid -> 포드 파일 경로
+        self._containers = {}  # uid -> {container_id: 파일 경로 또는 None(하위 cgroup 없음)}
+        self._signals = {}     # 파일 경로 -> 마지막으로 읽은 신호 값 tuple
+
+    def read_file(self, path):
+        """파일 읽기 (FileCache가 있으면 캐시된 fd 사용)"""
+        return self.files.read(path) if self.files is not None else read_file(path)
+
+    def pod_paths(self, uid, qos=None):
+        """포드 cgroup 경로 (없으면 None). qos가 주어지면 해당 클래스부터 탐색"""
+        paths = self._paths.get(uid)
+        if paths is None:
+            dirs = self._discover(uid, qos)
+            if dirs is not None:
+                self._dirs[uid] = dirs
+                paths = self._paths[uid] = self._files(dirs)
+        return paths
+
+    def _candidates(self, uid, qos):
+        classes = list(POD_PATTERNS)
+        if qos in POD_PATTERNS:
+            classes.remove(qos)
+            classes.insert(0, qos)
+        u = uid.replace("-", "_")
+        for qos_class in classes:
+            for pattern in POD_PATTERNS[qos_class]:
+                yield pattern.format(uid=uid, u=u)
+
+    def read_pod(self, uid, qos=None, signals=True):
+        """포드 메트릭 읽기 (cgroup이 없으면 None)"""
+        paths = self.pod_paths(uid, qos)
+        if paths is None:
+            return None
+        sample = self._read(paths, signals)
+        if sample is None:
+            # 포드가 재시작되어 경로가 바뀌었을 수 있으므로 다음에 다시 탐색
+            self._forget(uid)
+        return sample
+
+    def read_containers(self, uid, container_ids, qos=None, signals=True):
+        """포드 안 컨테이너별 메트릭 {container_id: sample} (하위 cgroup이 없는 컨테이너는 제외)
+
+        하위 cgroup 이름(cri-containerd-<id>.scope, docker-<id>.scope, crio-<id>.scope, cgroupfs는 <id>)은
+        컨테이너 ID 목록이 바뀔 때만 다시 탐색한다.
+        """
+        if self.pod_paths(uid, qos) is None:
+            return {}
+        known = self._containers.get(uid)
+        if known is None or known.keys() != set(container_ids):
+            known = self._scan_containers(uid, container_ids, known or {})
+        result = {}
+        for cid in container_ids:
+            paths = known.get(cid)
+            if paths is None:
+                continue
+            sample = self._read(paths, signals)
+            if sample is None:
+                # 컨테이너가 재시작되었을 수 있으므로 다음에 다시 탐색
+                del known[cid]
+                self._evict(paths)
+            else:
+                result[cid] = sample
+        return result
+
+    def _scan_containers(self, uid, container_ids, known):
+        dirs = self._dirs[uid]
+        try:
+            entries = os.listdir(dirs[0])
+        except OSError:
+            entries = []
+        by_id = {}
+        for entry in entries:
+            if "conmon" in entry:  # CRI-O 모니터 프로세스 cgroup
+                continue
+            by_id[entry[:-6].rsplit("-", 1)[-1] if entry.endswith(".scope") else entry] = entry
+        wanted = set(container_ids)
+        for cid in known.keys() - wanted:
+            self._evict(known.pop(cid))
+        for cid in wanted - known.keys():
+            entry = by_id.get(cid)
+            known[cid] = None if entry is None else self._files(tuple(os.path.join(d, entry) for d in dirs))
+        self._containers[uid] = known
+        return known
+
+    def retain(self, uids):
+        """목록에 없는 포드의 경로 캐시와 fd 정리"""
+        for uid in self._paths.keys() - set(uids):
+            self._forget(uid)
+
+    def _forget(self, uid):
+        self._dirs.pop(uid, None)
+        self._evict(self._paths.pop(uid, None))
+        for paths in self._containers.pop(uid, {}).values():
+            self._evict(paths)
+
+    def _evict(self, paths):
+        if paths:
+            self._signals.pop(paths, None)
+            if self.files is not None:
+                self.files.evict(*paths)
+
+    def _cached_signals(self, paths, signals):
+        """signals=False면 마지막으로 읽은 신호 값 (없으면 None - 이번에 읽어야 함)"""
+        return None if signals else self._signals.get(paths)
+
+class CgroupV2(CgroupBackend):
+    """cgroup v2 (통합 계층): cpu.stat, memory.current, memory.stat, io.stat, {cpu,memory,io}.pressure"""
+    version = "v2"
+    FILES = ("cpu.stat", "memory.current", "memory.stat", "io.stat",
+             "cpu.pressure", "memory.pressure", "io.pressure")
+
+    def _discover(self, uid, qos):
+        for rel in self._candidates(uid, qos):
+            path = os.path.join(self.root, rel)
+            if os.path.isdir(path):
+                return (path,)
+        return None
+
+    def _files(self, dirs):
+        return tuple(os.path.join(dirs[0], name) for name in self.FILES)
+
+    def _read(self, paths, signals=True):
+        read = self.read_file
+        cpu_stat = read(paths[0])
+        if cpu_stat is None:
+            return None
+        memory_bytes = parse_int(read(paths[1]))
+        disk_read, disk_write = parse_io_stat(read(paths[3]))
+        cached = self._cached_signals(paths, signals)
+        if cached is None:
+            memory_stat = read(paths[2])
+            cached = self._signals[paths] = (
+                stat_value(memory_stat, b"anon"), stat_value(memory_stat, b"file"),
+                stat_value(memory_stat, b"inactive_file"),
+                parse_psi(read(paths[4]))[0], *parse_psi(read(paths[5])), *parse_psi(read(paths[6])))
+        anon, file_bytes, inactive_file, cpu_some, memory_some, memory_full, io_some, io_full = cached
+        return {
+            "cpu_ns": parse_key(cpu_stat, b"usage_usec") * 1000,  # microseconds to nanoseconds
+            "memory_bytes": memory_bytes,
+            "disk_read_bytes": disk_read,
+            "disk_write_bytes": disk_write,
+            "memory_anon_bytes": anon,
+            "memory_file_bytes": file_bytes,
+            "memory_working_set_bytes": working_set(memory_bytes, inactive_file),
+            "cpu_nr_periods": parse_key(cpu_stat, b"nr_periods"),
+            "cpu_nr_throttled": parse_key(cpu_stat, b"nr_throttled"),
+            "cpu_throttled_usec": parse_key(cpu_stat, b"throttled_usec"),
+            "cpu_pressure_some_avg10": cpu_some,
+            "memory_pressure_some_avg10": memory_some,
+            "memory_pressure_full_avg10": memory_full,
+            "io_pressure_some_avg10": io_some,
+            "io_pressure_full_avg10": io_full,
+        }
+
+class CgroupV1(CgroupBackend):
+    """cgroup v1 (컨트롤러별 계층): cpuacct.usage, cpu.stat, memory.usage_in_bytes, memory.stat,
+    blkio.throttle.io_service_bytes (v1에는 포드 단위 PSI가 없음)"""
+    version = "v1"
+
+    def __init__(self, root, files=None):
+        super().__init__(root, files)
+        self.controllers = {}
+        for name, dirs in V1_CONTROLLERS.items():
+            for d in dirs:
+                if os.path.isdir(os.path.join(root, d)):
+                    self.controllers[name] = os.path.join(root, d)
+                    break
+
+    def _discover(self, uid, qos):
+        cpuacct = self.controllers.get("cpuacct")
+        if cpuacct is None:
+            return None
+        for rel in self._candidates(uid, qos):
+            if os.path.isdir(os.path.join(cpuacct, rel)):
+                return tuple(os.path.join(self.controllers.get(name, cpuacct), rel)
+                             for name in ("cpuacct", "memory", "blkio", "cpu"))
+        return None
+
+    def _files(self, dirs):
+        cpuacct, memory, blkio, cpu = dirs
+        return (os.path.join(cpuacct, "cpuacct.usage"),
+                os.path.join(memory, "memory.usage_in_bytes"),
+                os.path.join(memory, "memory.stat"),
+                os.path.join(blkio, "blkio.throttle.io_service_bytes"),
+                os.path.join(cpu, "cpu.stat"))
+
+    def _read(self, paths, signals=True):
+        read = self.read_file
+        usage = read(paths[0])
+        if usage is None:
+            return None
+        memory_bytes = parse_int(read(paths[1]))
+        disk_read, disk_write = parse_blkio(read(paths[3]))
+        cached = self._cached_signals(paths, signals)
+        if cached is None:
+            memory_stat = read(paths[2])
+            cpu_stat = read(paths[4])
+            cached = self._signals[paths] = (
+                stat_value(memory_stat, b"total_rss"), stat_value(memory_stat, b"total_cache"),
+                stat_value(memory_stat, b"total_inactive_file"),
+                stat_value(cpu_stat, b"nr_periods"), stat_value(cpu_stat, b"nr_throttled"),
+                None if cpu_stat is None else parse_key(cpu_stat, b"throttled_time") // 1000)  # ns → us
+        anon, file_bytes, inactive_file, nr_periods, nr_throttled, throttled_usec = cached
+        return {
+            "cpu_ns": parse_int(usage),
+            "memory_bytes": memory_bytes,
+            "disk_read_bytes": disk_read,
+            "disk_write_bytes": disk_write,
+            # 계층 합계(total_*) 사용
+            "memory_anon_bytes": anon,
+            "memory_file_bytes": file_bytes,
+            "memory_working_set_bytes": working_set(memory_bytes, inactive_file),
+            "cpu_nr_periods": nr_periods,
+            "cpu_nr_throttled": nr_throttled,
+            "cpu_throttled_usec": throttled_usec,
+            "cpu_pressure_some_avg10": None,
+            "memory_pressure_some_avg10": None,
+            "memory_pressure_full_avg10": None,
+            "io_pressure_some_avg10": None,
+            "io_pressure_full_avg10": None,
+        }
+
+def detect_backend(root, files=None):
+    """cgroup 루트의 계층 버전에 맞는 백엔드 생성"""
+    if os.path.exists(os.path.join(root, "cgroup.controllers")):
+        return CgroupV2(root, files)
+    return CgroupV1(root, files)
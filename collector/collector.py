@@ -4,9 +4,16 @@ import sys
 import time
 import json
 import requests
-import glob
 import re
-from datetime import datetime
+import resource
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from profiling import CycleProfiler, SamplingProfiler
+import wire_encoder
+from spool import Spool
+from scheduler import Scheduler, IdleTracker
+import cgroups
+from fdcache import FileCache
 
 # stdout 버퍼링 비활성화 (로그 즉시 출력)
 sys.stdout.reconfigure(line_buffering=True)
@@ -17,37 +24,75 @@ NODE_NAME       = os.getenv("NODE_NAME", "unknown-node")
 INTERVAL        = int(os.getenv("COLLECT_INTERVAL", "5"))
 DEBUG           = os.getenv("DEBUG", "false").lower() == "true"
 
+# 파일시스템 루트 (오프라인 실행/벤치마크 시 가짜 cgroup·proc 트리로 교체 가능)
+CGROUP_ROOT     = os.getenv("CGROUP_ROOT", "/sys/fs/cgroup")
+PROC_ROOT       = os.getenv("PROC_ROOT", "/host/proc")
+POD_LIST_FILE   = os.getenv("POD_LIST_FILE", "")  # 설정 시 Kubernetes API 대신 PodList JSON 파일 사용
+FD_CACHE_MAX    = int(os.getenv("FD_CACHE_MAX", "8192"))  # 열어 둘 cgroup/proc 파일 fd 최대 개수 (RLIMIT_NOFILE 이내로 제한)
+# 전송 포맷: json(객체별 POST), batch-json(주기당 1회 JSON 배치), binary(주기당 1회 바이너리 배치)
+WIRE_FORMAT     = os.getenv("WIRE_FORMAT", "json").lower()
+API_TIMEOUT     = float(os.getenv("API_TIMEOUT", "3"))  # API 요청 타임아웃(초) - 길면 수집 주기가 밀림
+
+# 전송 실패 시 스풀 설정
+SPOOL_MAX_CYCLES    = int(os.getenv("SPOOL_MAX_CYCLES", "120"))                  # 보관할 최대 주기 수
+SPOOL_MAX_BYTES     = int(os.getenv("SPOOL_MAX_BYTES", str(32 * 1024 * 1024)))   # 보관 용량 한도 (0이면 무제한)
+SPOOL_REPLAY_BATCH  = int(os.getenv("SPOOL_REPLAY_BATCH", "10"))                 # 배치 재전송 시 한 요청에 담을 주기 수
+SPOOL_FLUSH_BUDGET  = float(os.getenv("SPOOL_FLUSH_BUDGET", str(INTERVAL / 2)))  # 주기당 재전송에 쓸 최대 시간(초)
+SPOOL_MAX_BACKOFF   = float(os.getenv("SPOOL_MAX_BACKOFF", "60"))                # 재시도 대기 상한(초)
+
+# 수집 스케줄링 설정 (계열별 주기는 기본값이 COLLECT_INTERVAL)
+NODE_INTERVAL         = float(os.getenv("NODE_INTERVAL", str(INTERVAL)))
+POD_INTERVAL          = float(os.getenv("POD_INTERVAL", str(INTERVAL)))
+NAMESPACE_INTERVAL    = float(os.getenv("NAMESPACE_INTERVAL", str(INTERVAL)))
+DEPLOYMENT_INTERVAL   = float(os.getenv("DEPLOYMENT_INTERVAL", str(INTERVAL)))
+CPU_BUDGET_MILLICORES = float(os.getenv("CPU_BUDGET_MILLICORES", "80"))  # 초과 시 주기 자동 연장 (0이면 비활성화)
+SCHED_MAX_STRETCH     = float(os.getenv("SCHED_MAX_STRETCH", "4"))       # 주기 연장 최대 배수
+POD_IDLE_AFTER        = int(os.getenv("POD_IDLE_AFTER", "3"))            # 카운터가 이 횟수만큼 그대로면 idle (0이면 비활성화)
+POD_IDLE_EVERY        = int(os.getenv("POD_IDLE_EVERY", "6"))            # idle 포드는 포드 주기 N번에 한 번만 읽기
+CONTAINER_METRICS     = os.getenv("CONTAINER_METRICS", "true").lower() == "true"  # 컨테이너 2개 이상인 포드의 컨테이너별 메트릭
+POD_SIGNAL_EVERY      = int(os.getenv("POD_SIGNAL_EVERY", "3"))          # memory.stat·PSI는 포드 주기 N번에 한 번만 읽기 (포드별로 분산)
+
+# 자체 프로파일링 설정
+PROFILE_WINDOW       = int(os.getenv("PROFILE_WINDOW", "120"))       # 요약에 사용할 최근 주기 수
+PROFILE_SAMPLE_HZ    = int(os.getenv("PROFILE_SAMPLE_HZ", "0"))      # 0이면 샘플링 프로파일러 비활성화
+PROFILE_REPORT_EVERY = int(os.getenv("PROFILE_REPORT_EVERY", "60"))  # 리포트 출력 주기 (루프 횟수)
+PROFILE_REPORT_PATH  = os.getenv("PROFILE_REPORT_PATH", "")          # 비어 있으면 stdout 출력
+
+profiler = CycleProfiler(INTERVAL, PROFILE_WINDOW)
+scheduler = Scheduler({"node": NODE_INTERVAL, "pod": POD_INTERVAL,
+                       "namespace": NAMESPACE_INTERVAL, "deployment": DEPLOYMENT_INTERVAL},
+                      cpu_budget=CPU_BUDGET_MILLICORES, max_stretch=SCHED_MAX_STRETCH)
+idle_tracker = IdleTracker(POD_IDLE_AFTER, POD_IDLE_EVERY)
+_nofile = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+# 노드·포드 파일 fd 재사용 (open/close 시스템 콜 제거), 소켓 등을 위해 여유 fd 64개 남김
+file_cache = FileCache(FD_CACHE_MAX if _nofile == resource.RLIM_INFINITY else min(FD_CACHE_MAX, max(0, _nofile - 64)))
+pod_cache = {}  # uid -> 마지막으로 읽은 포드 메트릭 (idle 포드를 건너뛴 주기에도 집계에 사용)
+pod_cycles = 0  # 포드 수집 횟수 (신호 파일 읽기 주기 계산용)
+spool = Spool(SPOOL_MAX_CYCLES, SPOOL_MAX_BYTES, base_backoff=INTERVAL, max_backoff=SPOOL_MAX_BACKOFF)
+
 def debug_print(msg):
     """디버그 메시지 출력"""
     if DEBUG:
         print(f"[DEBUG] {msg}")
 
-def read_cgroup_cpu_usage():
-    """cgroup v1/v2에서 CPU 사용량 읽기"""
+def read_cgroup_cpu_usage(v1_path=None, v2_path=None):
+    """cgroup v1/v2에서 CPU 사용량 읽기 (v1 경로 우선, 없으면 v2 경로)"""
     debug_print("CPU 사용량 읽기 시작")
-    
-    # cgroup v1 경로 시도
-    v1_path = "/sys/fs/cgroup/cpu,cpuacct/cpuacct.usage"
-    # cgroup v2 경로 시도
-    v2_path = "/sys/fs/cgroup/cpu.stat"
+    v1_path = v1_path or os.path.join(CGROUP_ROOT, "cpu,cpuacct", "cpuacct.usage")
+    v2_path = v2_path or os.path.join(CGROUP_ROOT, "cpu.stat")
     
     try:
-        if os.path.exists(v1_path):
-            debug_print(f"cgroup v1 CPU 경로 사용: {v1_path}")
-            with open(v1_path, "r") as f:
-                result = int(f.read().strip())
-                debug_print(f"CPU 사용량 (v1): {result} ns")
-                return result
-        elif os.path.exists(v2_path):
-            debug_print(f"cgroup v2 CPU 경로 사용: {v2_path}")
-            with open(v2_path, "r") as f:
-                for line in f:
-                    if line.startswith("usage_usec"):
-                        result = int(line.split()[1]) * 1000  # microseconds to nanoseconds
-                        debug_print(f"CPU 사용량 (v2): {result} ns")
-                        return result
-        else:
-            debug_print(f"CPU cgroup 경로를 찾을 수 없음: v1={v1_path}, v2={v2_path}")
+        data = file_cache.read(v1_path)
+        if data is not None:
+            result = cgroups.parse_int(data)
+            debug_print(f"CPU 사용량 (v1): {result} ns")
+            return result
+        data = file_cache.read(v2_path)
+        if data is not None:
+            result = cgroups.parse_key(data, b"usage_usec") * 1000  # microseconds to nanoseconds
+            debug_print(f"CPU 사용량 (v2): {result} ns")
+            return result
+        debug_print(f"CPU cgroup 경로를 찾을 수 없음: v1={v1_path}, v2={v2_path}")
     except Exception as e:
         debug_print(f"CPU 사용량 읽기 실패: {e}")
     return None
@@ -67,25 +112,20 @@ def calculate_cpu_usage_percent(current_ns, previous_ns, interval_seconds):
     debug_print(f"CPU 계산: current={current_ns}, previous={previous_ns}, delta={cpu_delta_ns}, interval={interval_ns}, percent={cpu_percent:.2f}%")
     return round(cpu_percent, 2)
 
-def read_proc_meminfo():
+def read_proc_meminfo(mem_path=None):
     """호스트의 /proc/meminfo에서 메모리 정보 읽기"""
     debug_print("메모리 정보 읽기 시작")
-    meminfo = {}
+    mem_path = mem_path or os.path.join(PROC_ROOT, "meminfo")
     try:
-        mem_path = "/host/proc/meminfo"
-        if not os.path.exists(mem_path):
+        data = file_cache.read(mem_path)
+        if data is None:
             debug_print(f"메모리 경로 없음: {mem_path}")
             return {}
-            
-        debug_print(f"메모리 경로 사용: {mem_path}")
-        with open(mem_path, "r") as f:
-            for line in f:
-                key, val = line.split(":", 1)
-                meminfo[key.strip()] = int(val.strip().split()[0])
-        total   = meminfo.get("MemTotal", 0)
-        free    = meminfo.get("MemFree", 0)
-        buffers = meminfo.get("Buffers", 0)
-        cached  = meminfo.get("Cached", 0)
+        
+        total   = cgroups.parse_key(data, b"MemTotal:")
+        free    = cgroups.parse_key(data, b"MemFree:")
+        buffers = cgroups.parse_key(data, b"Buffers:")
+        cached  = cgroups.parse_key(data, b"Cached:")
         used    = total - free - buffers - cached
         result = {"total_kb": total, "used_kb": used, "free_kb": free}
         debug_print(f"메모리 정보: Total={total}KB, Used={used}KB, Free={free}KB")
@@ -94,23 +134,61 @@ def read_proc_meminfo():
         debug_print(f"메모리 정보 읽기 실패: {e}")
         return {}
 
-def read_proc_net_dev():
+# /proc/net/dev 인터페이스 줄: "iface: rx_bytes ... (수신 8칸) tx_bytes ..." (헤더 2줄에는 ':'가 없음)
+NET_DEV_LINE = re.compile(rb":\s*(\d+)(?:\s+\d+){7}\s+(\d+)")
+
+def read_proc_memory_breakdown(mem_path=None):
+    """/proc/meminfo에서 노드 메모리 분해 (anon, file, working set) - bytes 단위"""
+    mem_path = mem_path or os.path.join(PROC_ROOT, "meminfo")
+    empty = {"memory_anon_bytes": None, "memory_file_bytes": None, "memory_working_set_bytes": None}
+    try:
+        data = file_cache.read(mem_path)
+        if data is None:
+            return empty
+        total = cgroups.parse_key(data, b"MemTotal:")
+        free = cgroups.parse_key(data, b"MemFree:")
+        return {
+            "memory_anon_bytes": cgroups.parse_key(data, b"AnonPages:") * 1024,
+            "memory_file_bytes": cgroups.parse_key(data, b"Cached:") * 1024,
+            "memory_working_set_bytes": cgroups.working_set(total - free, cgroups.parse_key(data, b"Inactive(file):")) * 1024,
+        }
+    except Exception as e:
+        debug_print(f"메모리 분해 정보 읽기 실패: {e}")
+        return empty
+
+def read_proc_pressure(pressure_dir=None):
+    """호스트의 /proc/pressure/{cpu,memory,io}에서 PSI avg10 읽기 (PSI 미지원 커널이면 None)"""
+    pressure_dir = pressure_dir or os.path.join(PROC_ROOT, "pressure")
+    cpu_some, _ = cgroups.parse_psi(file_cache.read(os.path.join(pressure_dir, "cpu")))
+    memory_some, memory_full = cgroups.parse_psi(file_cache.read(os.path.join(pressure_dir, "memory")))
+    io_some, io_full = cgroups.parse_psi(file_cache.read(os.path.join(pressure_dir, "io")))
+    return {
+        "cpu_pressure_some_avg10": cpu_some,
+        "memory_pressure_some_avg10": memory_some,
+        "memory_pressure_full_avg10": memory_full,
+        "io_pressure_some_avg10": io_some,
+        "io_pressure_full_avg10": io_full,
+    }
+
+def parse_net_dev(data):
+    """/proc/net/dev 내용에서 전체 인터페이스 RX/TX bytes 합계"""
+    rx, tx = 0, 0
+    for rx_bytes, tx_bytes in NET_DEV_LINE.findall(data):
+        rx += int(rx_bytes)
+        tx += int(tx_bytes)
+    return rx, tx
+
+def read_proc_net_dev(net_path=None):
     """호스트의 /proc/net/dev에서 네트워크 통계 읽기"""
     debug_print("네트워크 정보 읽기 시작")
-    rx, tx = 0, 0
+    net_path = net_path or os.path.join(PROC_ROOT, "net", "dev")
     try:
-        net_path = "/host/proc/net/dev"
-        if not os.path.exists(net_path):
+        data = file_cache.read(net_path)
+        if data is None:
             debug_print(f"네트워크 경로 없음: {net_path}")
             return {"rx_bytes": 0, "tx_bytes": 0}
-            
-        debug_print(f"네트워크 경로 사용: {net_path}")
-        with open(net_path, "r") as f:
-            for line in f.readlines()[2:]:  # 헤더 2줄 건너뛰기
-                parts = line.split()
-                if len(parts) >= 10:
-                    rx += int(parts[1])  # RX bytes
-                    tx += int(parts[9])  # TX bytes
+        
+        rx, tx = parse_net_dev(data)
         result = {"rx_bytes": rx, "tx_bytes": tx}
         debug_print(f"네트워크 정보: RX={rx} bytes, TX={tx} bytes")
         return result
@@ -118,62 +196,83 @@ def read_proc_net_dev():
         debug_print(f"네트워크 정보 읽기 실패: {e}")
         return {"rx_bytes": 0, "tx_bytes": 0}
 
-def read_cgroup_blkio():
-    """cgroup v1/v2에서 블록 I/O 통계 읽기"""
+def read_cgroup_blkio(v1_path=None, v2_path=None):
+    """cgroup v1/v2에서 블록 I/O 통계 읽기 (v1 경로 우선, 없으면 v2 경로)"""
     debug_print("블록 I/O 정보 읽기 시작")
-    # cgroup v1 경로 시도
-    v1_path = "/sys/fs/cgroup/blkio/blkio.throttle.io_service_bytes"
-    # cgroup v2 경로 시도  
-    v2_path = "/sys/fs/cgroup/io.stat"
+    v1_path = v1_path or os.path.join(CGROUP_ROOT, "blkio", "blkio.throttle.io_service_bytes")
+    v2_path = v2_path or os.path.join(CGROUP_ROOT, "io.stat")
     
     try:
-        if os.path.exists(v1_path):
-            debug_print(f"cgroup v1 블록 I/O 경로 사용: {v1_path}")
-            return read_cgroup_v1_blkio(v1_path)
-        elif os.path.exists(v2_path):
-            debug_print(f"cgroup v2 블록 I/O 경로 사용: {v2_path}")
-            return read_cgroup_v2_blkio(v2_path)
+        data = file_cache.read(v1_path)
+        if data is not None:
+            read_bytes, write_bytes = cgroups.parse_blkio(data)
         else:
-            debug_print(f"블록 I/O cgroup 경로를 찾을 수 없음: v1={v1_path}, v2={v2_path}")
-            return {"read_bytes": 0, "write_bytes": 0}
+            data = file_cache.read(v2_path)
+            if data is None:
+                debug_print(f"블록 I/O cgroup 경로를 찾을 수 없음: v1={v1_path}, v2={v2_path}")
+                return {"read_bytes": 0, "write_bytes": 0}
+            read_bytes, write_bytes = cgroups.parse_io_stat(data)
+        io_stat = {"read_bytes": read_bytes, "write_bytes": write_bytes}
+        debug_print(f"블록 I/O: {io_stat}")
+        return io_stat
     except Exception as e:
         debug_print(f"블록 I/O 정보 읽기 실패: {e}")
         return {"read_bytes": 0, "write_bytes": 0}
 
-def read_cgroup_v1_blkio(path):
-    """cgroup v1 블록 I/O 읽기"""
-    io_stat = {"read_bytes": 0, "write_bytes": 0}
-    try:
-        with open(path, "r") as f:
-            for line in f:
-                parts = line.split()
-                if len(parts) >= 3:
-                    if parts[1] == "Read":
-                        io_stat["read_bytes"] += int(parts[2])
-                    elif parts[1] == "Write":
-                        io_stat["write_bytes"] += int(parts[2])
-        debug_print(f"cgroup v1 블록 I/O: {io_stat}")
-    except Exception as e:
-        debug_print(f"cgroup v1 블록 I/O 읽기 실패: {e}")
-    return io_stat
+def parse_pod_list(pods_data):
+    """Kubernetes PodList JSON에서 포드 정보 목록 추출"""
+    pods = []
+    for item in pods_data.get("items", []):
+        pod_info = {
+            "name": item["metadata"]["name"],
+            "namespace": item["metadata"]["namespace"],
+            "uid": item["metadata"]["uid"],
+            "status": item["status"]["phase"],
+            "qos": item["status"].get("qosClass"),  # cgroup 경로 탐색 순서 힌트
+            "containers": parse_container_ids(item["status"].get("containerStatuses")),
+        }
+        # 포드의 소유자 정보 추가 (디플로이먼트 추적용)
+        if "ownerReferences" in item["metadata"]:
+            for owner in item["metadata"]["ownerReferences"]:
+                if owner["kind"] == "ReplicaSet":
+                    # ReplicaSet 이름에서 디플로이먼트 이름 추출
+                    rs_name = owner["name"]
+                    # ReplicaSet 이름 패턴: {deployment-name}-{hash}
+                    deployment_name = "-".join(rs_name.split("-")[:-1])
+                    pod_info["deployment"] = deployment_name
+                    break
+        pods.append(pod_info)
+    return pods
+
+def parse_container_ids(statuses):
+    """containerStatuses에서 {컨테이너 ID: 컨테이너 이름} 추출 (ID의 containerd:// 등 런타임 접두사 제거)"""
+    containers = {}
+    for status in statuses or ():
+        container_id = status.get("containerID")
+        if container_id:
+            containers[container_id.split("://", 1)[-1]] = status["name"]
+    return containers
 
-def read_cgroup_v2_blkio(path):
-    """cgroup v2 블록 I/O 읽기"""
-    io_stat = {"read_bytes": 0, "write_bytes": 0}
+def get_pods_from_file(path):
+    """PodList JSON 파일에서 현재 노드의 포드 목록 읽기 (오프라인 실행용)"""
+    debug_print(f"포드 목록 파일 사용: {path}")
     try:
         with open(path, "r") as f:
-            for line in f:
-                if "rbytes=" in line:
-                    io_stat["read_bytes"] = int(line.split("rbytes=")[1].split()[0])
-                if "wbytes=" in line:
-                    io_stat["write_bytes"] = int(line.split("wbytes=")[1].split()[0])
-        debug_print(f"cgroup v2 블록 I/O: {io_stat}")
+            pods_data = json.load(f)
+        items = [item for item in pods_data.get("items", [])
+                 if item.get("spec", {}).get("nodeName", NODE_NAME) == NODE_NAME]
+        pods = parse_pod_list({"items": items})
+        debug_print(f"포드 목록 파일 읽기 성공: {len(pods)}개")
+        return pods
     except Exception as e:
-        debug_print(f"cgroup v2 블록 I/O 읽기 실패: {e}")
-    return io_stat
+        debug_print(f"포드 목록 파일 읽기 실패: {e}")
+        return []
 
 def get_kubernetes_pods():
-    """Kubernetes API를 통해 현재 노드의 포드 목록 가져오기"""
+    """Kubernetes API를 통해 현재 노드의 포드 목록 가져오기 (POD_LIST_FILE 설정 시 파일에서 읽기)"""
+    if POD_LIST_FILE:
+        return get_pods_from_file(POD_LIST_FILE)
+    
     debug_print("Kubernetes 포드 목록 조회 시작")
     try:
         # Kubernetes 서비스 계정 토큰 읽기
@@ -197,26 +296,7 @@ def get_kubernetes_pods():
                               verify=ca_cert_path, timeout=10)
         
         if response.status_code == 200:
-            pods_data = response.json()
-            pods = []
-            for item in pods_data.get("items", []):
-                pod_info = {
-                    "name": item["metadata"]["name"],
-                    "namespace": item["metadata"]["namespace"],
-                    "uid": item["metadata"]["uid"],
-                    "status": item["status"]["phase"]
-                }
-                # 포드의 소유자 정보 추가 (디플로이먼트 추적용)
-                if "ownerReferences" in item["metadata"]:
-                    for owner in item["metadata"]["ownerReferences"]:
-                        if owner["kind"] == "ReplicaSet":
-                            # ReplicaSet 이름에서 디플로이먼트 이름 추출
-                            rs_name = owner["name"]
-                            # ReplicaSet 이름 패턴: {deployment-name}-{hash}
-                            deployment_name = "-".join(rs_name.split("-")[:-1])
-                            pod_info["deployment"] = deployment_name
-                            break
-                pods.append(pod_info)
+            pods = parse_pod_list(response.json())
             debug_print(f"포드 목록 조회 성공: {len(pods)}개")
             return pods
         else:
@@ -227,90 +307,32 @@ def get_kubernetes_pods():
         debug_print(f"Kubernetes 포드 목록 조회 실패: {e}")
         return []
 
-def collect_pod_metrics_from_cgroup(pod_info):
-    """cgroup을 통해 특정 포드의 메트릭 수집"""
+# 포드 cgroup 백엔드 (CGROUP_ROOT가 바뀌면 다시 감지)
+_cgroup_backend = None
+
+def get_cgroup_backend():
+    """현재 CGROUP_ROOT의 계층 버전(v1/v2)에 맞는 cgroup 백엔드"""
+    global _cgroup_backend
+    if _cgroup_backend is None or _cgroup_backend.root != CGROUP_ROOT:
+        if _cgroup_backend is not None:
+            file_cache.clear()  # 이전 루트의 fd 정리
+        _cgroup_backend = cgroups.detect_backend(CGROUP_ROOT, file_cache)
+        debug_print(f"cgroup 버전: {_cgroup_backend.version}")
+    return _cgroup_backend
+
+def collect_pod_metrics_from_cgroup(pod_info, signals=True):
+    """cgroup을 통해 특정 포드의 메트릭 수집 (signals=False면 신호 파일은 마지막으로 읽은 값 사용)"""
     debug_print(f"포드 메트릭 수집: {pod_info['name']}")
     
-    # 먼저 cgroup 버전 확인
-    cgroup_v2_path = "/sys/fs/cgroup/cgroup.controllers"
-    is_cgroup_v2 = os.path.exists(cgroup_v2_path)
-    debug_print(f"cgroup 버전: {'v2' if is_cgroup_v2 else 'v1'}")
-    
-    # 실제 cgroup 경로 탐색 강화
-    pod_uid = pod_info["uid"]
-    pod_uid_underscore = pod_uid.replace('-', '_')
-    
-    # Minikube 환경에 맞는 실제 패턴들
-    if is_cgroup_v2:
-        cgroup_patterns = [
-            # 실제 테스트를 통해 검증된 패턴들 (자동 생성됨)
-            f"/sys/fs/cgroup/kubepods.slice/kubepods-burstable.slice/kubepods-burstable-pod{pod_uid_underscore}.slice",
-        ]
-    else:
-        cgroup_patterns = [
-            f"/sys/fs/cgroup/cpu/kubepods/pod{pod_uid}",
-            f"/sys/fs/cgroup/memory/kubepods/pod{pod_uid}",
-        ]
-    
-    # 실제 존재하는 경로 디버깅
-    debug_print("=== cgroup 경로 디버깅 ===")
-    base_paths = ["/sys/fs/cgroup/kubepods.slice/kubepods-burstable.slice", 
-                  "/sys/fs/cgroup/kubepods.slice/kubepods-besteffort.slice"]
-    for base_path in base_paths:
-        if os.path.exists(base_path):
-            try:
-                entries = os.listdir(base_path)
-                pod_entries = [e for e in entries if 'pod' in e]
-                debug_print(f"{base_path} 내 포드 관련 항목: {pod_entries[:3]}...")
-            except Exception as e:
-                debug_print(f"{base_path} 읽기 실패: {e}")
-    
-    # 패턴 매칭 시도
-    pod_cgroup_path = None
-    for pattern in cgroup_patterns:
-        debug_print(f"패턴 시도: {pattern}")
-        matches = glob.glob(pattern)
-        if matches:
-            pod_cgroup_path = matches[0]
-            debug_print(f"포드 cgroup 경로 발견: {pod_cgroup_path}")
-            break
-    
-    if not pod_cgroup_path:
-        debug_print(f"포드 cgroup 경로를 찾을 수 없음: {pod_info['name']}")
-        return None
-    
-    # 실제 메트릭 수집 로직 추가
     try:
-        timestamp = datetime.utcnow().isoformat() + "Z"
+        sample = get_cgroup_backend().read_pod(pod_info["uid"], pod_info.get("qos"), signals)
+        if sample is None:
+            debug_print(f"포드 cgroup 경로를 찾을 수 없음: {pod_info['name']}")
+            return None
         
-        # CPU 메트릭 수집
-        cpu_usage_ns = 0
-        cpu_stat_path = os.path.join(pod_cgroup_path, "cpu.stat")
-        if os.path.exists(cpu_stat_path):
-            with open(cpu_stat_path, "r") as f:
-                for line in f:
-                    if line.startswith("usage_usec"):
-                        cpu_usage_ns = int(line.split()[1]) * 1000  # microseconds to nanoseconds
-                        break
-        
-        # 메모리 메트릭 수집
-        memory_bytes = 0
-        memory_current_path = os.path.join(pod_cgroup_path, "memory.current")
-        if os.path.exists(memory_current_path):
-            with open(memory_current_path, "r") as f:
-                memory_bytes = int(f.read().strip())
-        
-        # I/O 메트릭 수집
-        disk_read_bytes = 0
-        disk_write_bytes = 0
-        io_stat_path = os.path.join(pod_cgroup_path, "io.stat")
-        if os.path.exists(io_stat_path):
-            with open(io_stat_path, "r") as f:
-                for line in f:
-                    if "rbytes=" in line:
-                        disk_read_bytes += int(line.split("rbytes=")[1].split()[0])
-                    if "wbytes=" in line:
-                        disk_write_bytes += int(line.split("wbytes=")[1].split()[0])
+        timestamp = datetime.utcnow().isoformat() + "Z"
+        cpu_usage_ns = sample["cpu_ns"]
+        memory_bytes = sample["memory_bytes"]
         
         # 네트워크 메트릭은 포드별로 분리하기 어려우므로 0으로 설정
         network_rx_bytes = 0
@@ -328,8 +350,8 @@ def collect_pod_metrics_from_cgroup(pod_info):
             "deployment": pod_info.get("deployment", ""),
             "cpu_millicores": cpu_millicores,
             "memory_bytes": memory_bytes,
-            "disk_read_bytes": disk_read_bytes,
-            "disk_write_bytes": disk_write_bytes,
+            "disk_read_bytes": sample["disk_read_bytes"],
+            "disk_write_bytes": sample["disk_write_bytes"],
             "network_rx_bytes": network_rx_bytes,
             "network_tx_bytes": network_tx_bytes,
             
@@ -337,6 +359,18 @@ def collect_pod_metrics_from_cgroup(pod_info):
             "pod_name": pod_info["name"],  # 기존 호환성
             "cpu_usage": cpu_millicores / 10 if cpu_millicores > 0 else 0,  # 대략적인 퍼센트 변환
         }
+        # memory.stat 분해, CPU throttling, PSI (신호 파일은 POD_SIGNAL_EVERY 주기마다 읽음)
+        for field in cgroups.SIGNAL_FIELDS:
+            pod_metrics[field] = sample[field]
+        
+        # 컨테이너가 2개 이상인 포드만 하위 cgroup을 읽음 (단일 컨테이너는 포드 값과 같음)
+        containers = pod_info.get("containers")
+        if CONTAINER_METRICS and containers and len(containers) > 1:
+            samples = get_cgroup_backend().read_containers(pod_info["uid"], list(containers), pod_info.get("qos"),
+                                                           signals)
+            if samples:
+                pod_metrics["containers"] = [container_metrics(name, samples[cid])
+                                             for cid, name in containers.items() if cid in samples]
         
         debug_print(f"포드 메트릭 수집 성공: {pod_info['name']} - CPU: {cpu_millicores}m, Memory: {memory_bytes}B")
         return pod_metrics
@@ -345,39 +379,74 @@ def collect_pod_metrics_from_cgroup(pod_info):
         debug_print(f"포드 메트릭 수집 중 오류: {pod_info['name']} - {e}")
         return None
 
+def container_metrics(name, sample):
+    """하위 cgroup 읽기 결과로 컨테이너 메트릭 구성 (PodMetrics와 같은 단위/필드명)"""
+    cpu_ns = sample["cpu_ns"]
+    metrics = {
+        "container": name,
+        "cpu_millicores": int(cpu_ns / 1_000_000) if cpu_ns > 0 else 0,
+        "memory_bytes": sample["memory_bytes"],
+        "disk_read_bytes": sample["disk_read_bytes"],
+        "disk_write_bytes": sample["disk_write_bytes"],
+    }
+    for field in cgroups.SIGNAL_FIELDS:
+        metrics[field] = sample[field]
+    return metrics
+
 def collect_pod_metrics():
-    """포드별 메트릭 수집"""
+    """포드별 메트릭 수집 - 이번 주기에 실제로 읽은 포드 메트릭 목록 반환
+
+    idle 포드는 IdleTracker에 따라 건너뛰며, 집계용 최신 값은 pod_cache에 유지된다.
+    느리게 변하는 신호 파일(memory.stat, PSI)은 포드마다 POD_SIGNAL_EVERY번에 한 번 읽되, 한 주기에
+    몰리지 않도록 uid 해시로 읽는 주기를 나눈다.
+    """
+    global pod_cycles
     debug_print("포드 메트릭 수집 시작")
     pod_metrics = []
     
     # Kubernetes API를 통해 포드 목록 가져오기
-    pods = get_kubernetes_pods()
+    with profiler.phase("pod_list"):
+        pods = get_kubernetes_pods()
     debug_print(f"발견된 포드 수: {len(pods)}")
     
+    running = [pod_info for pod_info in pods if pod_info["status"] == "Running"]  # 실행 중인 포드만
+    running_uids = {pod_info["uid"] for pod_info in running}
+    for uid in pod_cache.keys() - running_uids:
+        del pod_cache[uid]
+    idle_tracker.retain(running_uids)
+    get_cgroup_backend().retain(running_uids)
+    
     if not pods:
         debug_print("포드를 찾을 수 없음 - Kubernetes API 권한 확인 필요")
         return pod_metrics
     
-    for pod_info in pods:
-        debug_print(f"포드 처리 중: {pod_info['name']} (상태: {pod_info['status']})")
-        if pod_info["status"] == "Running":  # 실행 중인 포드만
-            metrics = collect_pod_metrics_from_cgroup(pod_info)
+    skipped = 0
+    pod_cycles += 1
+    with profiler.phase("cgroup_read"):
+        for pod_info in running:
+            uid = pod_info["uid"]
+            if uid in pod_cache and not idle_tracker.should_read(uid):
+                skipped += 1
+                continue
+            debug_print(f"포드 처리 중: {pod_info['name']} (상태: {pod_info['status']})")
+            signals = POD_SIGNAL_EVERY <= 1 or (pod_cycles + hash(uid)) % POD_SIGNAL_EVERY == 0
+            metrics = collect_pod_metrics_from_cgroup(pod_info, signals)
             if metrics:
                 pod_metrics.append(metrics)
+                pod_cache[uid] = metrics
+                idle_tracker.observe(uid, (metrics["cpu_millicores"], metrics["disk_read_bytes"],
+                                           metrics["disk_write_bytes"]))
                 debug_print(f"포드 메트릭 수집 성공: {pod_info['name']}")
             else:
                 debug_print(f"포드 메트릭 수집 실패: {pod_info['name']}")
     
-    debug_print(f"포드 메트릭 수집 완료: {len(pod_metrics)}개")
+    debug_print(f"포드 메트릭 수집 완료: {len(pod_metrics)}개 (idle 건너뜀 {skipped}개)")
     return pod_metrics
 
-def collect_namespace_metrics():
-    """네임스페이스별 집계 메트릭 수집"""
+def collect_namespace_metrics(pod_metrics):
+    """포드 메트릭 목록으로 네임스페이스별 집계 메트릭 생성"""
     debug_print("네임스페이스 메트릭 수집 시작")
     
-    # 포드 메트릭을 먼저 수집
-    pod_metrics = collect_pod_metrics()
-    
     # 네임스페이스별로 집계
     namespace_stats = {}
     
@@ -432,14 +501,10 @@ def collect_namespace_metrics():
     debug_print(f"네임스페이스 메트릭 수집 완료: {len(namespace_metrics)}개")
     return namespace_metrics
 
-def collect_deployment_metrics():
-    """디플로이먼트별 집계 메트릭 수집"""
+def collect_deployment_metrics(pod_metrics):
+    """포드 메트릭 목록으로 디플로이먼트별 집계 메트릭 생성"""
     debug_print("디플로이먼트 메트릭 수집 시작")
     
-    # 포드 메트릭을 먼저 수집
-    pod_metrics = collect_pod_metrics()
-    pods = get_kubernetes_pods()
-    
     # 디플로이먼트별로 집계
     deployment_stats = {}
     
@@ -503,8 +568,8 @@ def collect_deployment_metrics():
     debug_print(f"디플로이먼트 메트릭 수집 완료: {len(deployment_metrics)}개")
     return deployment_metrics
 
-def collect_node_metrics(prev_cpu_stat=None):
-    """노드 메트릭 수집 - CPU, 메모리, 네트워크, 디스크"""
+def collect_node_metrics(prev_cpu_stat=None, elapsed=None):
+    """노드 메트릭 수집 - CPU, 메모리, 네트워크, 디스크 (elapsed: 직전 수집 이후 경과 초)"""
     debug_print(f"=== 노드 메트릭 수집 시작: {NODE_NAME} ===")
     
     cgroup_cpu_ns = read_cgroup_cpu_usage()
@@ -513,7 +578,7 @@ def collect_node_metrics(prev_cpu_stat=None):
     # CPU 사용률 계산 (이전 값이 있는 경우)
     if prev_cpu_stat and cgroup_cpu_ns:
         cpu_usage_percent = calculate_cpu_usage_percent(
-            cgroup_cpu_ns, prev_cpu_stat, INTERVAL
+            cgroup_cpu_ns, prev_cpu_stat, elapsed or NODE_INTERVAL
         )
     
     mem          = read_proc_meminfo()
@@ -540,6 +605,9 @@ def collect_node_metrics(prev_cpu_stat=None):
         "network": net,
         "disk": blk
     }
+    # 메모리 분해(anon/file/working set)와 PSI
+    metrics.update(read_proc_memory_breakdown())
+    metrics.update(read_proc_pressure())
     
     debug_print(f"=== 노드 메트릭 수집 완료 ===")
     debug_print(f"CPU 사용률: {cpu_usage_percent}%")
@@ -550,25 +618,187 @@ def collect_node_metrics(prev_cpu_stat=None):
     
     return metrics
 
+class SendDeferred(Exception):
+    """API 장애·backpressure(429/503/5xx, 연결 실패)로 전송을 미뤄야 할 때"""
+    def __init__(self, reason, retry_after=None):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP-date)를 초 단위로 변환. 해석 불가면 None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def post_to_api(path, body, content_type):
+    """API 서버로 POST. 성공 시 응답, 재시도해야 하면 SendDeferred 발생"""
+    url = f"{API_SERVER_URL}/{path}"
+    try:
+        resp = requests.post(url, data=body, headers={"Content-Type": content_type}, timeout=API_TIMEOUT)
+    except requests.RequestException as e:
+        raise SendDeferred(f"{url}: {e}")
+    debug_print(f"응답 상태: {resp.status_code}")
+    if resp.status_code == 429 or resp.status_code >= 500:
+        raise SendDeferred(f"{url}: HTTP {resp.status_code}",
+                           parse_retry_after(resp.headers.get("Retry-After")))
+    return resp
+
 def send_to_api(endpoint, payload):
-    """API 서버로 메트릭 데이터 전송"""
-    url = f"{API_SERVER_URL}/{endpoint}"
-    headers = {"Content-Type": "application/json"}
+    """API 서버로 메트릭 데이터 전송. API가 거부하면(4xx) False, 재시도가 필요하면 SendDeferred"""
     debug_print(f"=== API 전송 시작 ===")
-    debug_print(f"URL: {url}")
-    debug_print(f"Payload: {json.dumps(payload, indent=2)}")
-    
-    try:
-        resp = requests.post(url, data=json.dumps(payload), headers=headers, timeout=10)
-        debug_print(f"응답 상태: {resp.status_code}")
-        debug_print(f"응답 내용: {resp.text}")
-        
-        if resp.status_code != 200:
-            debug_print(f"[WARN] API 응답 {resp.status_code}: {resp.text}")
-        else:
-            debug_print(f"[SUCCESS] 메트릭 전송 성공: {endpoint}")
-    except Exception as e:
-        debug_print(f"[ERROR] API 전송 실패: {e}")
+    debug_print(f"URL: {API_SERVER_URL}/{endpoint}")
+    if DEBUG:
+        debug_print(f"Payload: {json.dumps(payload, indent=2)}")
+    
+    resp = post_to_api(endpoint, json.dumps(payload), "application/json")
+    debug_print(f"응답 내용: {resp.text}")
+    if resp.status_code != 200:
+        debug_print(f"[WARN] API 응답 {resp.status_code}: {resp.text}")
+        return False
+    debug_print(f"[SUCCESS] 메트릭 전송 성공: {endpoint}")
+    return True
+
+# API 서버가 /api/batch를 지원하지 않으면(404/415) 객체별 전송으로 전환
+batch_supported = True
+
+def send_batch(cycles):
+    """여러 주기의 메트릭을 /api/batch로 한 번에 전송
+
+    성공 시 True, API가 거부하면 False, 배치를 지원하지 않는 서버면 None 반환.
+    재시도가 필요하면 SendDeferred 발생.
+    """
+    global batch_supported
+    nodes = [c["node"] for c in cycles if c["node"]]
+    pods = [p for c in cycles for p in c["pods"]]
+    namespaces = [n for c in cycles for n in c["namespaces"]]
+    deployments = [d for c in cycles for d in c["deployments"]]
+    if WIRE_FORMAT == "binary":
+        body = wire_encoder.encode_batch(nodes, pods, namespaces, deployments)
+        content_type = wire_encoder.CONTENT_TYPE
+    else:
+        body = json.dumps({"nodes": nodes, "pods": pods,
+                           "namespaces": namespaces, "deployments": deployments})
+        content_type = "application/json"
+    debug_print(f"=== 배치 전송 시작 ({WIRE_FORMAT}, {len(cycles)}주기, {len(body)} bytes) ===")
+    
+    resp = post_to_api("api/batch", body, content_type)
+    if resp.status_code in (404, 415):
+        debug_print(f"[WARN] API 서버가 {WIRE_FORMAT} 배치를 지원하지 않음 - 객체별 JSON 전송으로 전환")
+        batch_supported = False
+        return None
+    if resp.status_code != 200:
+        debug_print(f"[WARN] API 응답 {resp.status_code}: {resp.text}")
+        return False
+    debug_print(f"[SUCCESS] 배치 전송 성공: {resp.text}")
+    return True
+
+def cycle_requests(cycle):
+    """한 주기를 객체별 (endpoint, payload) 목록으로 변환"""
+    items = [(f"api/nodes/{cycle['node']['node']}", cycle["node"])] if cycle["node"] else []
+    items += [(f"api/pods/{pod['pod']}", pod) for pod in cycle["pods"]]
+    items += [(f"api/namespaces/{ns['namespace']}", ns) for ns in cycle["namespaces"]]
+    items += [(f"api/namespaces/{dp['namespace']}/deployments/{dp['deployment']}", dp)
+              for dp in cycle["deployments"]]
+    return items
+
+def send_cycle(cycle, start=0):
+    """한 주기를 객체별로 전송. 진행한 객체 수를 돌려주며, 중간에 미뤄지면 SendDeferred.progress에 기록"""
+    items = cycle_requests(cycle)
+    for i in range(start, len(items)):
+        endpoint, payload = items[i]
+        try:
+            send_to_api(endpoint, payload)
+        except SendDeferred as e:
+            e.progress = i
+            raise
+    return len(items)
+
+def ship_cycle(node_data, pod_list, namespace_list, deployment_list):
+    """한 주기 수집 결과 전송 (WIRE_FORMAT에 따라 배치 또는 객체별)
+
+    스풀이 비어 있으면 바로 보내고, 실패하면 스풀에 쌓는다. 스풀에 밀린 주기가 있으면
+    순서를 지키기 위해 뒤에 추가한 뒤 오래된 것부터 재전송한다. 이번 주기에 수집하지 않은
+    계열은 None/빈 목록으로 넘긴다.
+    """
+    if not (node_data or pod_list or namespace_list or deployment_list):
+        if spool:
+            flush_spool()
+        return
+    cycle = {"node": node_data, "pods": pod_list,
+             "namespaces": namespace_list, "deployments": deployment_list}
+    if not spool and spool.ready():
+        try:
+            if WIRE_FORMAT != "json" and batch_supported and send_batch([cycle]) is not None:
+                return
+            send_cycle(cycle)
+            return
+        except SendDeferred as e:
+            spool.push(cycle)
+            spool.head_sent = getattr(e, "progress", 0)
+            wait = spool.backoff(e.retry_after)
+            debug_print(f"[WARN] 전송 지연, 스풀에 보관 (깊이 {len(spool)}, {wait:.1f}초 후 재시도): {e}")
+            return
+    
+    spool.push(cycle)
+    flush_spool()
+
+def flush_spool():
+    """스풀에 밀린 주기를 오래된 순서대로 재전송 (SPOOL_FLUSH_BUDGET 초 안에서만)
+
+    배치를 지원하는 서버에는 WIRE_FORMAT이 json이어도 /api/batch로 여러 주기를 한 번에 보낸다
+    (json이면 JSON 배치). 여러 주기를 담은 배치를 API가 거부하면 그 주기들을 한 주기씩 다시 보내
+    거부된 주기만 버린다. 객체별 전송 중 멈춘 맨 앞 주기는 중복을 피해 남은 객체부터 객체별로 보낸다.
+    """
+    deadline = time.monotonic() + SPOOL_FLUSH_BUDGET
+    isolate = 0  # 거부된 배치에서 아직 한 주기씩 확인하지 않은 주기 수
+    while spool and spool.ready() and time.monotonic() < deadline:
+        try:
+            if batch_supported and not spool.head_sent:
+                cycles = spool.peek(1 if isolate else SPOOL_REPLAY_BATCH)
+                ok = send_batch(cycles)
+                if ok is None:
+                    continue
+                if ok:
+                    spool.ack(len(cycles))
+                elif len(cycles) > 1:
+                    isolate = len(cycles)
+                    debug_print(f"[WARN] 재전송 배치 거부 - {isolate}주기를 한 주기씩 재전송")
+                    continue
+                else:
+                    spool.discard(1)
+                isolate = max(0, isolate - 1)
+            else:
+                send_cycle(spool.peek(1)[0], spool.head_sent)
+                spool.ack(1)
+        except SendDeferred as e:
+            if hasattr(e, "progress"):
+                spool.head_sent = e.progress
+            wait = spool.backoff(e.retry_after)
+            debug_print(f"[WARN] 스풀 재전송 지연 (깊이 {len(spool)}, {wait:.1f}초 후 재시도): {e}")
+            return
+    if spool:
+        debug_print(f"스풀 잔여 {len(spool)}주기")
+
+def dump_profile_report(report):
+    """샘플링 프로파일 리포트 출력 (PROFILE_REPORT_PATH가 있으면 파일에 추가)"""
+    if PROFILE_REPORT_PATH:
+        try:
+            with open(PROFILE_REPORT_PATH, "a") as f:
+                f.write(f"[{datetime.utcnow().isoformat()}Z]\n{report}\n\n")
+            return
+        except Exception as e:
+            debug_print(f"프로파일 리포트 저장 실패: {e}")
+    print(report)
 
 def main():
     """메인 루프 - 주기적으로 메트릭 수집 및 전송"""
@@ -577,18 +807,19 @@ def main():
     debug_print("=" * 50)
     debug_print(f"Node: {NODE_NAME}")
     debug_print(f"API: {API_SERVER_URL}")
-    debug_print(f"Interval: {INTERVAL}s")
+    debug_print(f"Interval: {INTERVAL}s (node={NODE_INTERVAL}s, pod={POD_INTERVAL}s, "
+                f"namespace={NAMESPACE_INTERVAL}s, deployment={DEPLOYMENT_INTERVAL}s)")
     debug_print(f"Debug: {DEBUG}")
     
     # 시작 시 환경 확인
     debug_print("=== 환경 확인 ===")
     paths_to_check = [
-        "/sys/fs/cgroup",
-        "/host/proc",
-        "/sys/fs/cgroup/cpu,cpuacct/cpuacct.usage",
-        "/sys/fs/cgroup/cpu.stat",
-        "/host/proc/meminfo",
-        "/host/proc/net/dev",
+        CGROUP_ROOT,
+        PROC_ROOT,
+        os.path.join(CGROUP_ROOT, "cpu,cpuacct", "cpuacct.usage"),
+        os.path.join(CGROUP_ROOT, "cpu.stat"),
+        os.path.join(PROC_ROOT, "meminfo"),
+        os.path.join(PROC_ROOT, "net", "dev"),
         "/var/run/secrets/kubernetes.io/serviceaccount/token"
     ]
     
@@ -602,35 +833,67 @@ def main():
     prev_cpu_ns = None
     loop_count = 0
     
+    # 샘플링 프로파일러 (PROFILE_SAMPLE_HZ > 0 일 때만)
+    sampler = None
+    if PROFILE_SAMPLE_HZ > 0:
+        sampler = SamplingProfiler(PROFILE_SAMPLE_HZ)
+        sampler.start()
+        debug_print(f"샘플링 프로파일러 시작: {PROFILE_SAMPLE_HZ}Hz, {PROFILE_REPORT_EVERY}루프마다 리포트")
+    
     while True:
         try:
             loop_count += 1
-            debug_print(f"\n>>> 루프 #{loop_count} 시작 <<<")
+            now = time.monotonic()  # 같은 시각으로 기록해야 계열 주기가 어긋나지 않음
+            due = scheduler.due(now)
+            debug_print(f"\n>>> 루프 #{loop_count} 시작: {due} <<<")
+            profiler.start_cycle()
+            node_data, pod_list, namespace_list, deployment_list = None, [], [], []
             
-            # 노드 메트릭 수집 및 전송
-            node_data = collect_node_metrics(prev_cpu_ns)
-            send_to_api(f"api/nodes/{NODE_NAME}", node_data)
+            # 노드 메트릭 수집 (직전 주기까지의 자체 프로파일링 요약 포함)
+            if "node" in due:
+                with profiler.phase("node"):
+                    elapsed = scheduler.mark("node", now)
+                    node_data = collect_node_metrics(prev_cpu_ns, elapsed)
+                    collector_stats = {**profiler.summary(), **spool.summary(),
+                                       **scheduler.summary(), "pods_idle": idle_tracker.idle_count()}
+                    node_data["collector_stats"] = collector_stats
+                    # 조회·알림용 숫자 필드 (collector_stats는 시리즈 열이 아닌 샘플별 dict로 저장됨)
+                    node_data["collector_cpu_millicores"] = collector_stats.get("cpu_millicores_avg")
+                    node_data["collector_cycle_ms_p99"] = collector_stats.get("cycle_wall_ms_p99")
+                    node_data["collector_overruns"] = collector_stats["overruns"]
+                
+                # 다음 CPU 계산을 위해 현재 값 저장
+                prev_cpu_ns = node_data.get("cgroup_cpu_ns")
             
-            # 다음 CPU 계산을 위해 현재 값 저장
-            prev_cpu_ns = node_data.get("cgroup_cpu_ns")
+            # 포드 메트릭 수집
+            if "pod" in due:
+                scheduler.mark("pod", now)
+                pod_list = collect_pod_metrics()
             
-            # 포드 메트릭 수집 및 전송
-            pod_list = collect_pod_metrics()
-            for pod in pod_list:
-                send_to_api(f"api/pods/{pod['pod']}", pod)
+            # 네임스페이스 / 디플로이먼트 메트릭 집계 (idle로 건너뛴 포드 포함, 포드 목록 1회 수집 결과 사용)
+            with profiler.phase("aggregate"):
+                if "namespace" in due:
+                    scheduler.mark("namespace", now)
+                    namespace_list = collect_namespace_metrics(list(pod_cache.values()))
+                if "deployment" in due:
+                    scheduler.mark("deployment", now)
+                    deployment_list = collect_deployment_metrics(list(pod_cache.values()))
             
-            # 네임스페이스 메트릭 수집 및 전송
-            namespace_list = collect_namespace_metrics()
-            for ns in namespace_list:
-                send_to_api(f"api/namespaces/{ns['namespace']}", ns)
+            # 한 주기 결과 전송
+            with profiler.phase("ship"):
+                ship_cycle(node_data, pod_list, namespace_list, deployment_list)
             
-            # 디플로이먼트 메트릭 수집 및 전송
-            deployment_list = collect_deployment_metrics()
-            for dp in deployment_list:
-                send_to_api(f"api/namespaces/{dp['namespace']}/deployments/{dp['deployment']}", dp)
+            profiler.end_cycle()
+            # CPU 예산 초과 시 주기 연장
+            stretch = scheduler.adapt()
+            profiler.interval = scheduler.tick * stretch
+            debug_print(f"주기 프로파일: {profiler.summary()}")
+            if sampler and loop_count % PROFILE_REPORT_EVERY == 0:
+                dump_profile_report(sampler.report())
             
-            debug_print(f">>> 루프 #{loop_count} 완료, {INTERVAL}초 대기 <<<")
-            time.sleep(INTERVAL)
+            wait = scheduler.sleep_seconds()
+            debug_print(f">>> 루프 #{loop_count} 완료, {wait:.2f}초 대기 (stretch x{stretch:.2f}) <<<")
+            time.sleep(wait)
         except KeyboardInterrupt:
             debug_print("[INFO] Collector 종료")
             break
@@ -638,7 +901,10 @@ def main():
             debug_print(f"[ERROR] 수집 루프 오류: {e}")
             import traceback
             debug_print(f"[ERROR] 상세 오류: {traceback.format_exc()}")
-            time.sleep(INTERVAL)
+            time.sleep(scheduler.tick)
+    
+    if sampler:
+        sampler.stop()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,67 @@
+import os
+
+class FileCache:
+    """자주 읽는 cgroup/proc 파일의 fd를 열어 두고 pread로 처음부터 다시 읽는 캐시
+
+    파일마다 미리 할당한 bytearray에 os.preadv로 읽으므로 주기마다 open/close 시스템 콜이 없다.
+    내용이 버퍼보다 크면 버퍼를 두 배로 늘려 다시 읽는다. fd 수가 max_fds에 도달하면
+    새 파일은 캐시하지 않고 한 번 열어 읽는다. 열린 fd는 이전 inode를 계속 가리키므로 커널이 제자리에서
+    갱신하는 cgroup/proc 파일용이다 (cgroup이 삭제되면 pread가 실패해 다시 연다).
+    """
+
+    def __init__(self, max_fds=2048, buffer_size=1024):
+        self.max_fds = max_fds
+        self.buffer_size = buffer_size
+        self._entries = {}  # path -> [fd, bytearray]
+        self.opens = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def read(self, path):
+        """파일 전체 내용 (bytearray). 없거나 읽을 수 없으면 None"""
+        entry = self._entries.get(path)
+        if entry is not None:
+            try:
+                return self._pread(entry)
+            except OSError:
+                # cgroup 삭제(ENODEV) 등 - fd를 버리고 새로 열어 본다
+                self.evict(path)
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            return None
+        self.opens += 1
+        entry = [fd, bytearray(self.buffer_size)]
+        try:
+            data = self._pread(entry)
+        except OSError:
+            os.close(fd)
+            return None
+        if len(self._entries) < self.max_fds:
+            self._entries[path] = entry
+        else:
+            os.close(fd)
+        return data
+
+    def _pread(self, entry):
+        fd, buf = entry
+        while True:
+            n = os.preadv(fd, [buf], 0)
+            if n < len(buf):
+                return buf[:n]
+            buf = entry[1] = bytearray(len(buf) * 2)
+
+    def evict(self, *paths):
+        """주어진 경로의 fd 닫기 (포드가 사라졌을 때)"""
+        for path in paths:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                try:
+                    os.close(entry[0])
+                except OSError:
+                    pass
+
+    def clear(self):
+        """모든 fd 닫기"""
+        self.evict(*list(self._entries))
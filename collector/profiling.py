@@ -0,0 +1,146 @@
+import os
+import signal
+import time
+from collections import Counter, deque
+
+class CycleProfiler:
+    """수집 주기별 단계(phase) wall/CPU 시간 측정기
+
+    단계가 중첩되면 바깥 단계의 시간은 안쪽 단계가 실행되는 동안 멈춘다 (exclusive time).
+    """
+
+    def __init__(self, interval, window=120):
+        self.interval = interval
+        self.history = deque(maxlen=window)  # 주기별 {phase: (wall_s, cpu_s)}
+        self.overruns = 0
+        self.cycles = 0
+        self._current = {}
+        self._stack = []
+        self._cycle_start = None
+
+    def start_cycle(self):
+        """새 수집 주기 시작"""
+        self._current = {}
+        self._stack = []
+        self._cycle_start = (time.perf_counter(), time.process_time())
+
+    def end_cycle(self):
+        """수집 주기 종료 - 주기 합계를 기록하고 INTERVAL 초과 여부 확인"""
+        if self._cycle_start is None:
+            return
+        wall = time.perf_counter() - self._cycle_start[0]
+        cpu = time.process_time() - self._cycle_start[1]
+        self._current["cycle"] = (wall, cpu)
+        self.history.append(self._current)
+        self.cycles += 1
+        if wall > self.interval:
+            self.overruns += 1
+        self._cycle_start = None
+
+    def phase(self, name):
+        """단계 측정 컨텍스트 매니저"""
+        return _Phase(self, name)
+
+    def _push(self, name):
+        now = (time.perf_counter(), time.process_time())
+        if self._stack:
+            self._accumulate(self._stack[-1], now)
+        self._stack.append([name, now])
+
+    def _pop(self):
+        now = (time.perf_counter(), time.process_time())
+        self._accumulate(self._stack.pop(), now)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    def _accumulate(self, entry, now):
+        name, (wall0, cpu0) = entry
+        wall, cpu = self._current.get(name, (0.0, 0.0))
+        self._current[name] = (wall + now[0] - wall0, cpu + now[1] - cpu0)
+
+    def summary(self):
+        """최근 주기들의 단계별 p50/p99 (ms) 및 INTERVAL 초과 횟수"""
+        result = {"cycles": self.cycles, "overruns": self.overruns}
+        if not self.history:
+            return result
+        phases = sorted({name for cycle in self.history for name in cycle})
+        for name in phases:
+            walls = sorted(cycle.get(name, (0.0, 0.0))[0] for cycle in self.history)
+            cpus = sorted(cycle.get(name, (0.0, 0.0))[1] for cycle in self.history)
+            result[f"{name}_wall_ms_p50"] = round(_percentile(walls, 50) * 1000, 3)
+            result[f"{name}_wall_ms_p99"] = round(_percentile(walls, 99) * 1000, 3)
+            result[f"{name}_cpu_ms_p50"] = round(_percentile(cpus, 50) * 1000, 3)
+            result[f"{name}_cpu_ms_p99"] = round(_percentile(cpus, 99) * 1000, 3)
+        # 주기당 CPU 사용량을 코어 단위로 환산 (DaemonSet limits.cpu 비교용)
+        cycle_cpu = sum(cycle["cycle"][1] for cycle in self.history) / len(self.history)
+        result["cpu_millicores_avg"] = round(cycle_cpu / self.interval * 1000, 2)
+        return result
+
+class _Phase:
+    __slots__ = ("profiler", "name")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._push(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._pop()
+        return False
+
+def _percentile(sorted_values, q):
+    """정렬된 리스트의 백분위 값 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    idx = max(0, min(len(sorted_values) - 1, int(len(sorted_values) * q / 100.0 + 0.5) - 1))
+    return sorted_values[idx]
+
+class SamplingProfiler:
+    """SIGPROF 기반 샘플링 프로파일러 (CPU 시간 기준으로 스택을 주기적으로 샘플링)"""
+
+    def __init__(self, hz, max_depth=16):
+        self.interval = 1.0 / hz
+        self.max_depth = max_depth
+        self.samples = Counter()
+        self.total = 0
+
+    def start(self):
+        """프로파일링 시작 (메인 스레드에서 호출해야 함)"""
+        signal.signal(signal.SIGPROF, self._handle)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        """프로파일링 중지"""
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def _handle(self, signum, frame):
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        self.samples[tuple(reversed(stack))] += 1
+        self.total += 1
+
+    def report(self, top=15):
+        """함수별 self/누적 샘플 비율 리포트 문자열 생성 후 샘플 초기화"""
+        self_counts = Counter()
+        cumulative = Counter()
+        for stack, count in self.samples.items():
+            if not stack:
+                continue
+            self_counts[stack[-1]] += count
+            for func in set(stack):
+                cumulative[func] += count
+        total = self.total or 1
+        lines = [f"=== 샘플링 프로파일 ({self.total} samples, {1 / self.interval:.0f}Hz) ==="]
+        lines.append(f"{'self%':>7} {'cum%':>7}  function")
+        for func, count in self_counts.most_common(top):
+            lines.append(f"{count * 100 / total:6.1f}% {cumulative[func] * 100 / total:6.1f}%  {func}")
+        self.samples.clear()
+        self.total = 0
+        return "\n".join(lines)
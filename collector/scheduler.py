@@ -0,0 +1,115 @@
+import time
+from collections import deque
+
+class Scheduler:
+    """메트릭 계열(node, pod, namespace, deployment)별 수집 주기 스케줄러
+
+    루프는 가장 짧은 주기(tick)마다 깨어나 due() 계열만 수집한다. 최근 tick들의 CPU 사용량이
+    예산(cpu_budget, 밀리코어)을 넘으면 모든 주기를 stretch배로 늘리고, 여유가 생기면 되돌린다.
+    """
+
+    def __init__(self, intervals, cpu_budget=0, max_stretch=4.0, window=6):
+        self.intervals = dict(intervals)
+        self.tick = min(self.intervals.values())
+        self.cpu_budget = cpu_budget      # 0이면 자동 연장 비활성화
+        self.max_stretch = max_stretch
+        self.stretch = 1.0
+        self.next_due = {family: 0.0 for family in self.intervals}
+        self.last_run = {}
+        self.cpu_millicores = 0.0
+        self._samples = deque(maxlen=window)  # (monotonic, process_time)
+
+    def due(self, now=None):
+        """지금 수집할 계열 목록"""
+        now = time.monotonic() if now is None else now
+        return [family for family, due in self.next_due.items() if now >= due]
+
+    def mark(self, family, now=None):
+        """계열 수집 완료 기록 후 직전 수집으로부터 지난 시간(초) 반환 (첫 수집이면 None)"""
+        now = time.monotonic() if now is None else now
+        period = self.intervals[family] * self.stretch
+        due = self.next_due[family] + period
+        self.next_due[family] = due if due > now else now + period
+        elapsed = now - self.last_run[family] if family in self.last_run else None
+        self.last_run[family] = now
+        return elapsed
+
+    def sleep_seconds(self, now=None):
+        """다음 계열 수집까지 남은 시간(초)"""
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(self.next_due.values()) - now)
+
+    def adapt(self, now=None, cpu=None):
+        """tick 종료 시 호출 - 최근 CPU 사용량으로 stretch 조정"""
+        now = time.monotonic() if now is None else now
+        cpu = time.process_time() if cpu is None else cpu
+        self._samples.append((now, cpu))
+        if len(self._samples) < self._samples.maxlen:
+            return self.stretch
+        (wall0, cpu0), (wall1, cpu1) = self._samples[0], self._samples[-1]
+        if wall1 <= wall0:
+            return self.stretch
+        self.cpu_millicores = (cpu1 - cpu0) / (wall1 - wall0) * 1000
+        if not self.cpu_budget:
+            return self.stretch
+        previous = self.stretch
+        if self.cpu_millicores > self.cpu_budget:
+            self.stretch = min(self.max_stretch, self.stretch * 1.5)
+        elif self.cpu_millicores < self.cpu_budget * 0.5:
+            self.stretch = max(1.0, self.stretch / 1.25)
+        if self.stretch != previous:
+            # 바뀐 주기로 다시 측정한 뒤에 판단 (연속 과잉 반응 방지)
+            self._samples.clear()
+            self._samples.append((now, cpu))
+        return self.stretch
+
+    def summary(self):
+        """자체 모니터링용 상태"""
+        return {
+            "sched_stretch": round(self.stretch, 3),
+            "sched_cpu_millicores": round(self.cpu_millicores, 2),
+        }
+
+class IdleTracker:
+    """카운터가 연속으로 변하지 않은 포드를 idle로 보고 읽기 빈도를 낮춤
+
+    idle_after번 연속 같은 fingerprint가 관측되면 이후 idle_every번에 한 번만 읽는다.
+    다시 읽었을 때 카운터가 움직였으면 즉시 매번 읽기로 돌아간다.
+    """
+
+    def __init__(self, idle_after=3, idle_every=6):
+        self.idle_after = idle_after      # 0이면 비활성화
+        self.idle_every = idle_every
+        self._state = {}                  # uid -> [fingerprint, 연속 동일 횟수, 건너뛴 횟수]
+
+    def should_read(self, uid):
+        """이번 주기에 포드를 읽어야 하는지 여부"""
+        state = self._state.get(uid)
+        if not self.idle_after or state is None or state[1] < self.idle_after:
+            return True
+        state[2] += 1
+        if state[2] >= self.idle_every:
+            state[2] = 0
+            return True
+        return False
+
+    def observe(self, uid, fingerprint):
+        """읽은 포드의 카운터 fingerprint 기록"""
+        state = self._state.get(uid)
+        if state is None:
+            self._state[uid] = [fingerprint, 0, 0]
+        elif state[0] == fingerprint:
+            state[1] += 1
+        else:
+            state[0] = fingerprint
+            state[1] = 0
+            state[2] = 0
+
+    def retain(self, uids):
+        """사라진 포드 상태 정리"""
+        for uid in self._state.keys() - set(uids):
+            del self._state[uid]
+
+    def idle_count(self):
+        """현재 idle로 분류된 포드 수"""
+        return sum(1 for state in self._state.values() if self.idle_after and state[1] >= self.idle_after)
@@ -0,0 +1,81 @@
+import json
+import time
+from collections import deque
+
+class Spool:
+    """전송하지 못한 수집 주기를 보관하는 메모리 버퍼
+
+    항목은 한 주기 분량 dict {"node": ..., "pods": [...], "namespaces": [...], "deployments": [...]}이며
+    메모리 절약을 위해 압축 JSON bytes로 보관한다. 주기 수(max_cycles) 또는 용량(max_bytes)을
+    넘으면 가장 오래된 주기부터 버린다. 재전송은 오래된 순서대로 하며, 실패 시 backoff 동안 멈춘다.
+    """
+
+    def __init__(self, max_cycles, max_bytes=0, base_backoff=1.0, max_backoff=60.0):
+        self.cycles = deque()
+        self.max_cycles = max_cycles
+        self.max_bytes = max_bytes      # 0이면 용량 제한 없음
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.bytes = 0
+        self.head_sent = 0              # 객체별 재전송 시 맨 앞 주기에서 이미 보낸 객체 수
+        self.dropped = 0
+        self.replayed = 0
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def __len__(self):
+        return len(self.cycles)
+
+    def push(self, cycle):
+        """새 주기 추가 (한도 초과 시 가장 오래된 주기 제거)"""
+        blob = json.dumps(cycle, separators=(",", ":")).encode()
+        self.cycles.append(blob)
+        self.bytes += len(blob)
+        while len(self.cycles) > max(self.max_cycles, 1) or \
+                (self.max_bytes and self.bytes > self.max_bytes and len(self.cycles) > 1):
+            self._pop()
+            self.dropped += 1
+
+    def peek(self, count):
+        """가장 오래된 주기부터 최대 count개 (제거하지 않음)"""
+        return [json.loads(self.cycles[i]) for i in range(min(count, len(self.cycles)))]
+
+    def ack(self, count):
+        """전송 완료된 앞쪽 count개 주기 제거"""
+        for _ in range(min(count, len(self.cycles))):
+            self._pop()
+            self.replayed += 1
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def discard(self, count):
+        """API가 거부한(재전송해도 실패할) 앞쪽 count개 주기 제거"""
+        for _ in range(min(count, len(self.cycles))):
+            self._pop()
+            self.dropped += 1
+
+    def _pop(self):
+        self.bytes -= len(self.cycles.popleft())
+        self.head_sent = 0
+
+    def ready(self, now=None):
+        """backoff가 끝나 재전송 가능한지 여부"""
+        return (now if now is not None else time.monotonic()) >= self.retry_at
+
+    def backoff(self, retry_after=None, now=None):
+        """전송 실패 기록 후 대기 시간(초) 반환. retry_after가 없으면 지수 backoff"""
+        self.failures += 1
+        if retry_after is None:
+            retry_after = self.base_backoff * (2 ** min(self.failures - 1, 16))
+        retry_after = min(self.max_backoff, max(0.0, retry_after))
+        self.retry_at = (now if now is not None else time.monotonic()) + retry_after
+        return retry_after
+
+    def summary(self):
+        """자체 모니터링용 상태"""
+        return {
+            "spool_depth": len(self.cycles),
+            "spool_bytes": self.bytes,
+            "spool_dropped": self.dropped,
+            "spool_replayed": self.replayed,
+        }
@@ -0,0 +1,200 @@
+"""Collector→API 배치 전송용 바이너리 포맷 인코더
+
+레이아웃(리틀 엔디언)은 api/wire_decoder.py의 디코더와 동일하게 유지해야 한다.
+
+    헤더      : magic "KMB" | version u8 | 문자열 수 u32
+    문자열 표 : (길이 u16 | UTF-8 bytes) * 문자열 수
+    섹션      : (종류 u8 | 레코드 수 u32 | 고정 길이 레코드 * 레코드 수) * N
+
+버전 2는 포드 레코드 뒤에 memory.stat 분해·CPU throttling(i64 6개)과 PSI avg10(f64 5개)을 붙인다.
+
+고정 레이아웃에 없는 노드/포드 필드(collector_stats 등)는 레코드 섹션 앞의 extras 섹션에 JSON으로 담는다.
+노드/포드/네임스페이스 이름처럼 반복되는 문자열은 문자열 표에 한 번만 담고 레코드는 인덱스만 가진다.
+레거시 호환 필드(pod_name, cpu_usage_percent, memory/network/disk dict)는 API가 디코딩 시 복원하므로
+복원 값과 다를 때만(None 포함) extras로 보낸다.
+"""
+import json
+import struct
+from operator import itemgetter
+from datetime import datetime, timezone
+
+CONTENT_TYPE = "application/x-kubemonitor-batch"
+MAGIC = b"KMB"
+VERSION = 2
+
+NONE_INDEX = 0xFFFFFFFF
+NONE_INT = -(2 ** 63)
+NAN = float("nan")
+
+KIND_NODE, KIND_POD, KIND_NAMESPACE, KIND_DEPLOYMENT, KIND_EXTRAS = 1, 2, 3, 4, 5
+
+HEADER = struct.Struct("<3sBI")
+STR_LEN = struct.Struct("<H")
+SECTION = struct.Struct("<BI")
+EXTRAS = struct.Struct("<BII")
+NODE = struct.Struct("<dI6qdqqq")
+POD = struct.Struct("<dIIII6qd6q5d")
+NAMESPACE = struct.Struct("<dI6qd")
+DEPLOYMENT = struct.Struct("<dII6qd")
+
+METRIC_FIELDS = ("cpu_millicores", "memory_bytes", "disk_read_bytes", "disk_write_bytes",
+                 "network_rx_bytes", "network_tx_bytes")
+
+# 고정 레이아웃으로 전송되거나 API에서 복원되는 필드 (extras에서 제외)
+NODE_FIXED = frozenset(METRIC_FIELDS + ("timestamp", "node", "cpu_usage", "cpu_usage_percent",
+                                        "cgroup_cpu_ns", "memory", "network", "disk"))
+POD_SIGNAL_INTS = ("memory_anon_bytes", "memory_file_bytes", "memory_working_set_bytes",
+                   "cpu_nr_periods", "cpu_nr_throttled", "cpu_throttled_usec")
+POD_SIGNAL_FLOATS = ("cpu_pressure_some_avg10", "memory_pressure_some_avg10", "memory_pressure_full_avg10",
+                     "io_pressure_some_avg10", "io_pressure_full_avg10")
+POD_FIXED = frozenset(METRIC_FIELDS + POD_SIGNAL_INTS + POD_SIGNAL_FLOATS +
+                      ("timestamp", "node", "namespace", "deployment", "pod", "pod_name", "cpu_usage"))
+
+class _StringTable:
+    """문자열 → 인덱스 매핑 (등장 순서대로)"""
+
+    def __init__(self):
+        self.index = {}
+        self.parts = []
+
+    def __call__(self, value):
+        if value is None:
+            return NONE_INDEX
+        idx = self.index.get(value)
+        if idx is None:
+            raw = value.encode("utf-8")
+            idx = self.index[value] = len(self.index)
+            self.parts.append(STR_LEN.pack(len(raw)))
+            self.parts.append(raw)
+        return idx
+
+class _EpochCache:
+    """Collector timestamp 문자열 → epoch 초 변환 캐시
+
+    Collector는 "YYYY-MM-DDTHH:MM:SS.ffffffZ" 형식만 만들고, 한 주기 안의 레코드는 초 단위 앞부분이
+    거의 같다. 앞 19자의 epoch 초를 캐시하고 소수부만 정수 마이크로초로 더한다
+    (datetime.timestamp()와 같은 값). 다른 형식이나 datetime은 _epoch로 변환한다.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+
+    def __call__(self, ts):
+        if isinstance(ts, str) and ts[-1:] == "Z" and len(ts) <= 27 and ts[19:20] in (".", "Z"):
+            base = self.seconds.get(ts[:19])
+            if base is None:
+                base = self.seconds[ts[:19]] = round(_epoch(ts[:19])) * 1_000_000
+            frac = ts[20:-1]
+            if not frac:
+                return base / 1_000_000
+            if frac.isdigit():
+                return (base + int(frac.ljust(6, "0"))) / 1_000_000
+        return _epoch(ts)
+
+def _epoch(ts):
+    """ISO 8601 문자열(또는 datetime)을 epoch 초로 변환"""
+    if isinstance(ts, str):
+        if ts.endswith("Z"):
+            ts = ts[:-1] + "+00:00"
+        ts = datetime.fromisoformat(ts)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+def _layout(names, kinds):
+    """숫자 필드 이름, itemgetter, None 대체값, 열 타입 (struct 레이아웃과 같은 순서)"""
+    fills = tuple(NONE_INT if kind == "q" else NAN for kind in kinds)
+    return names, itemgetter(*names), fills, kinds
+
+NODE_NUMBERS = _layout(METRIC_FIELDS + ("cpu_usage", "cgroup_cpu_ns"), "qqqqqqdq")
+POD_NUMBERS = _layout(METRIC_FIELDS + ("cpu_usage",) + POD_SIGNAL_INTS + POD_SIGNAL_FLOATS, "qqqqqqd" + "q" * 6 + "d" * 5)
+NAMESPACE_NUMBERS = _layout(METRIC_FIELDS + ("cpu_usage",), "qqqqqqd")
+
+def _pack(record, head, d, layout, tail=()):
+    """고정 길이 레코드 하나 (head: timestamp와 문자열 인덱스, tail: 숫자 필드 뒤 추가 값)
+
+    Collector payload는 항상 같은 키를 가지므로 숫자 필드는 보통 itemgetter 한 번으로 꺼낸다.
+    키가 빠졌으면 필드별로 꺼내고, 정수 열에 int가 아닌 값이 있으면 int()/float()로 맞춰 다시 시도한다.
+    """
+    names, getter, fills, kinds = layout
+    try:
+        values = getter(d)
+    except KeyError:
+        values = tuple(d.get(name) for name in names)
+    if None in values:
+        values = [fill if v is None else v for v, fill in zip(values, fills)]
+    try:
+        return record.pack(*head, *values, *tail)
+    except struct.error:
+        values = [int(v) if kind == "q" else float(v) for v, kind in zip(values, kinds)]
+        return record.pack(*head, *values, *tail)
+
+def _node_legacy(d):
+    """API가 디코딩 시 복원하는 노드 호환성 필드 값 (api/series.py와 같은 규칙)"""
+    mem = d.get("memory") or {}
+    rx, tx = d.get("network_rx_bytes"), d.get("network_tx_bytes")
+    read, write = d.get("disk_read_bytes"), d.get("disk_write_bytes")
+    return {
+        "cpu_usage_percent": d.get("cpu_usage"),
+        "network": {"rx_bytes": rx, "tx_bytes": tx} if rx is not None and tx is not None else None,
+        "disk": {"read_bytes": read, "write_bytes": write} if read is not None and write is not None else None,
+        "memory": {"total_kb": mem["total_kb"], "used_kb": (d.get("memory_bytes") or 0) // 1024,
+                   "free_kb": mem.get("free_kb")} if mem.get("total_kb") is not None else None,
+    }
+
+def _pod_legacy(d):
+    """API가 디코딩 시 복원하는 포드 호환성 필드 값"""
+    return {"pod_name": d.get("pod") or d.get("pod_name")}
+
+def _extras(out, kind, idx, d, fixed, legacy):
+    """고정 레이아웃에 없는 필드나 복원 값과 다른 호환성 필드가 있으면 extras 항목 추가
+
+    호환성 필드는 None도 그대로 보낸다 (복원된 dict를 None으로 되돌림).
+    """
+    keys = d.keys() - fixed
+    extra = {k: d[k] for k in keys if d[k] is not None} if keys else {}
+    for name, derived in legacy(d).items():
+        value = d.get(name)
+        if value != derived:
+            extra[name] = value
+    if extra:
+        raw = json.dumps(extra, separators=(",", ":")).encode("utf-8")
+        out.append(EXTRAS.pack(kind, idx, len(raw)) + raw)
+
+def encode_batch(nodes=(), pods=(), namespaces=(), deployments=()):
+    """Collector가 만든 payload dict 목록들을 하나의 바이너리 배치로 인코딩"""
+    s = _StringTable()
+    epoch = _EpochCache()
+    body = []
+    extras = []
+    if nodes:
+        body.append(SECTION.pack(KIND_NODE, len(nodes)))
+        for i, d in enumerate(nodes):
+            mem = d.get("memory") or {}
+            body.append(_pack(NODE, (epoch(d["timestamp"]), s(d["node"])), d, NODE_NUMBERS,
+                              (_int(mem.get("total_kb")), _int(mem.get("free_kb")))))
+            _extras(extras, KIND_NODE, i, d, NODE_FIXED, _node_legacy)
+    if pods:
+        body.append(SECTION.pack(KIND_POD, len(pods)))
+        for i, d in enumerate(pods):
+            pod = d.get("pod") or d.get("pod_name")
+            body.append(_pack(POD, (epoch(d["timestamp"]), s(d["node"]), s(d["namespace"]),
+                                    s(d.get("deployment")), s(pod)), d, POD_NUMBERS))
+            if d.get("pod_name") != pod or not d.keys() <= POD_FIXED:
+                _extras(extras, KIND_POD, i, d, POD_FIXED, _pod_legacy)
+    if namespaces:
+        body.append(SECTION.pack(KIND_NAMESPACE, len(namespaces)))
+        for d in namespaces:
+            body.append(_pack(NAMESPACE, (epoch(d["timestamp"]), s(d["namespace"])), d, NAMESPACE_NUMBERS))
+    if deployments:
+        body.append(SECTION.pack(KIND_DEPLOYMENT, len(deployments)))
+        for d in deployments:
+            body.append(_pack(DEPLOYMENT, (epoch(d["timestamp"]), s(d["namespace"]), s(d["deployment"])), d,
+                              NAMESPACE_NUMBERS))
+    header = HEADER.pack(MAGIC, VERSION, len(s.index))
+    if extras:
+        extras.insert(0, SECTION.pack(KIND_EXTRAS, len(extras)))
+    return b"".join([header] + s.parts + extras + body)
+
+def _int(v):
+    return NONE_INT if v is None else int(v)
@@ -0,0 +1,10 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# api/, collector/ 모듈은 각 Docker 이미지에서 최상위 모듈로 import 되므로 테스트도 같은 방식으로 import
+for name in ("api", "collector"):
+    sys.path.insert(0, os.path.join(ROOT, name))
+# 가짜 cgroup/proc 트리 생성기 (bench/fakefs.py)
+sys.path.append(os.path.join(ROOT, "bench"))
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from models import AlertRule, NodeMetrics, PodMetrics
+from storage import MetricsStore
+
+START = datetime(2026, 10, 19, 1, 0, 0, tzinfo=timezone.utc)
+
+def pod(name: str, second: float, **fields) -> PodMetrics:
+    labels = {"node": "n1", "namespace": "ns", "deployment": "dp", "pod": name}
+    return PodMetrics(timestamp=START + timedelta(seconds=second), **dict(labels, **fields))
+
+def feed(store: MetricsStore, name: str, values, start: float = 0, field: str = "memory_bytes"):
+    for i, value in enumerate(values):
+        store.add_pod_metrics(pod(name, start + i * 5, **{field: value}))
+
+def firing(store: MetricsStore):
+    return [(alert["rule"], alert["series"]) for alert in store.alerts.firing_alerts()]
+
+def test_threshold_fires_after_for_samples_and_resolves():
+    store = MetricsStore()
+    store.alerts.add_rule(AlertRule(name="mem", kind="pod", metric="memory_bytes", threshold=100, for_samples=2))
+    feed(store, "p1", [50, 150])
+    assert firing(store) == []
+    feed(store, "p1", [200], start=10)
+    assert firing(store) == [("mem", "p1")]
+    feed(store, "p1", [10], start=15)
+    assert firing(store) == []
+    summary = store.alerts.summary()
+    assert (summary["fired"], summary["resolved"]) == (1, 1)
+
+def test_scope_limits_matching_series():
+    store = MetricsStore()
+    store.alerts.add_rule(AlertRule(name="mem", kind="pod", metric="memory_bytes", threshold=100,
+                                    namespace="ns", deployment="other"))
+    feed(store, "p1", [500])
+    assert firing(store) == []
+
+def test_rate_uses_per_second_change():
+    store = MetricsStore()
+    store.alerts.add_rule(AlertRule(name="growth", kind="pod", metric="memory_bytes", type="rate", threshold=10))
+    feed(store, "p1", [0, 40])          # 8/s
+    assert firing(store) == []
+    feed(store, "p1", [100], start=10)  # 12/s
+    assert firing(store) == [("growth", "p1")]
+
+def test_zscore_fires_on_jump_after_flat_series():
+    store = MetricsStore()
+    store.alerts.add_rule(AlertRule(name="jump", kind="pod", metric="cpu_usage", type="zscore",
+                                    threshold=3, warmup=5))
+    feed(store, "p1", [0.5] * 10 + [5.0], field="cpu_usage")
+    assert firing(store) == [("jump", "p1")]
+    alert = store.alerts.firing_alerts()[0]
+    assert alert["value"] == 5.0 and alert["observed"] > 3
+
+def test_zscore_flat_zero_series_fires_on_any_jump():
+    store = MetricsStore()
+    store.alerts.add_rule(AlertRule(name="jump", kind="pod", metric="cpu_usage", type="zscore",
+                                    threshold=3, warmup=5))
+    feed(store, "p1", [0.0] * 10, field="cpu_usage")
+    assert firing(store) == []
+    feed(store, "p1", [0.01], start=50, field="cpu_usage")
+    assert firing(store) == [("jump", "p1")]
+
+def test_remove_rule_clears_series_state():
+    store = MetricsStore()
+    store.alerts.add_rule(AlertRule(name="mem", kind="pod", metric="memory_bytes", threshold=100))
+    store.alerts.add_rule(AlertRule(name="cpu", kind="pod", metric="cpu_usage", threshold=1))
+    store.add_pod_metrics(pod("p1", 0, memory_bytes=500, cpu_usage=0.1))
+    store.add_pod_metrics(pod("p2", 0, memory_bytes=500))
+    assert store.alerts.summary()["series"] == 2
+    assert store.alerts.remove_rule("mem")
+    assert firing(store) == []
+    assert store.alerts.summary()["series"] == 2
+    assert store.alerts.remove_rule("cpu")
+    assert store.alerts.summary()["series"] == 0
+    assert not store.alerts.remove_rule("cpu")
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("alerts.time.monotonic", lambda: now[0])
+    return now
+
+def test_stale_series_state_expires(clock):
+    store = MetricsStore()
+    store.alerts.state_ttl = 60
+    store.alerts.add_rule(AlertRule(name="mem", kind="pod", metric="memory_bytes", threshold=100))
+    feed(store, "gone", [500])
+    assert firing(store) == [("mem", "gone")]
+    clock[0] += 30
+    feed(store, "p1", [50], start=10)
+    assert firing(store) == [("mem", "gone")]
+    clock[0] += 61
+    feed(store, "p1", [50], start=15)
+    assert firing(store) == []
+    summary = store.alerts.summary()
+    assert (summary["series"], summary["expired"]) == (1, 1)
+
+def test_skewed_sample_timestamp_does_not_expire_other_series(clock):
+    store = MetricsStore()
+    store.alerts.state_ttl = 60
+    store.alerts.add_rule(AlertRule(name="mem", kind="pod", metric="memory_bytes", threshold=100))
+    feed(store, "p1", [500])
+    # 시계가 하루 앞선 노드의 포드 샘플
+    feed(store, "future", [50], start=86400)
+    clock[0] += 1
+    feed(store, "future", [50], start=86405)
+    assert firing(store) == [("mem", "p1")]
+    assert store.alerts.summary()["expired"] == 0
+
+def test_scope_follows_latest_sample_labels():
+    store = MetricsStore()
+    store.alerts.add_rule(AlertRule(name="mem", kind="pod", metric="memory_bytes", threshold=100,
+                                    deployment="dp2"))
+    store.add_pod_metrics(pod("p1", 0, memory_bytes=500))
+    assert firing(store) == []
+    store.add_pod_metrics(pod("p1", 5, memory_bytes=500, deployment="dp2"))
+    assert firing(store) == [("mem", "p1")]
+    assert store.alerts.firing_alerts()[0]["labels"]["deployment"] == "dp2"
+    # 범위를 벗어나면 발생 중인 알림도 해제
+    store.add_pod_metrics(pod("p1", 10, memory_bytes=500))
+    assert firing(store) == []
+
+def test_node_rule_on_collector_field():
+    store = MetricsStore()
+    store.alerts.add_rule(AlertRule(name="collector-cpu", kind="node", metric="collector_cpu_millicores",
+                                    threshold=80))
+    for i, value in enumerate([40.0, 95.0]):
+        store.add_node_metrics(NodeMetrics(timestamp=START + timedelta(seconds=i * 5), node="n1",
+                                           collector_cpu_millicores=value,
+                                           collector_stats={"cpu_millicores_avg": value}))
+    assert firing(store) == [("collector-cpu", "n1")]
+    rows = store.node_store["n1"].render()
+    assert [row.collector_cpu_millicores for row in rows] == [40.0, 95.0]
@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from cache import ResponseCache
+
+NODE = {"timestamp": "2026-10-19T01:02:03Z", "node": "n1", "cpu_millicores": 100}
+POD = {"timestamp": "2026-10-19T01:02:03Z", "node": "n1", "namespace": "ns", "deployment": "dp",
+       "pod": "p1", "cpu_millicores": 5}
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "store", main.MetricsStore())
+    main.response_cache.clear()
+    monkeypatch.setattr(main.response_cache, "ttl", 60)
+    monkeypatch.setattr(main.response_cache, "coalesce", 0)
+    return TestClient(main.app)
+
+def test_lookup_checks_version_and_ttl(monkeypatch):
+    cache = ResponseCache(ttl=5)
+    now = [100.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    cache.put("k", 1, b"body")
+    assert cache.lookup("k", 1) == b"body"
+    assert cache.lookup("k", 2) is None
+    now[0] += 5
+    assert cache.lookup("k", 1) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_coalesced_lookup_ignores_version_until_settled(monkeypatch):
+    cache = ResponseCache(ttl=5, coalesce=1)
+    now = [100.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    cache.put("k", 1, b"body")
+    assert cache.lookup("k", 2) is None
+    assert cache.lookup("k", 2, coalesce=True) == b"body"
+    now[0] += 1
+    assert cache.lookup("k", 2, coalesce=True) is None
+    assert cache.lookup("k", 1, coalesce=True) == b"body"
+
+def test_put_evicts_oldest_over_max_bytes():
+    cache = ResponseCache(ttl=5, max_bytes=10)
+    cache.put("a", 1, b"12345")
+    cache.put("b", 1, b"12345")
+    cache.put("c", 1, b"1")
+    assert cache.lookup("a", 1) is None
+    assert cache.lookup("b", 1) == b"12345"
+    assert cache.bytes == 6
+    # 한도보다 큰 항목 하나는 보관
+    cache.put("d", 1, b"x" * 20)
+    assert cache.summary()["entries"] == 1 and cache.bytes == 20
+
+def test_cached_computes_once_per_version():
+    cache = ResponseCache(ttl=60)
+    version = [0]
+    calls = []
+
+    @cache.cached(lambda p: version[0])
+    async def endpoint(name: str):
+        calls.append(name)
+        return {"name": name, "calls": len(calls)}
+
+    def get(name):
+        return json.loads(asyncio.run(endpoint(name=name)).body)
+
+    assert get("a") == get("a") == {"name": "a", "calls": 1}
+    assert get("b")["calls"] == 2
+    version[0] += 1
+    assert get("a")["calls"] == 3
+
+def test_ingest_invalidates_only_dependent_series(client):
+    client.post("/api/nodes/n1", json=NODE)
+    client.post("/api/pods/p1", json=POD)
+    assert len(client.get("/api/nodes/n1").json()) == 1
+    pods = client.get("/api/pods/p1").content
+    misses = main.response_cache.misses
+
+    client.post("/api/nodes/n1", json=dict(NODE, timestamp="2026-10-19T01:02:08Z"))
+    assert len(client.get("/api/nodes/n1").json()) == 2
+    assert client.get("/api/pods/p1").content == pods
+    assert main.response_cache.misses == misses + 1
+
+def test_batch_ingest_invalidates(client):
+    client.post("/api/pods/p1", json=POD)
+    assert len(client.get("/api/pods").json()) == 1
+    resp = client.post("/api/batch", json={"pods": [dict(POD, pod="p2")]})
+    assert resp.status_code == 200
+    assert set(client.get("/api/pods").json()) == {"p1", "p2"}
+
+def test_not_found_is_not_cached(client):
+    assert client.get("/api/nodes/n9").status_code == 404
+    client.post("/api/nodes/n9", json=dict(NODE, node="n9"))
+    assert client.get("/api/nodes/n9").status_code == 200
+
+def test_list_endpoints_coalesce_continuous_ingest(client, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(main.response_cache, "coalesce", 1)
+    client.post("/api/pods/p1", json=POD)
+    assert set(client.get("/api/pods").json()) == {"p1"}
+    misses = main.response_cache.misses
+    # 목록은 coalesce초 동안 재사용, 시리즈 응답은 바로 갱신
+    client.post("/api/pods/p2", json=dict(POD, pod="p2"))
+    assert set(client.get("/api/pods").json()) == {"p1"}
+    assert client.get("/api/pods/p2").status_code == 200
+    now[0] += 1
+    assert set(client.get("/api/pods").json()) == {"p1", "p2"}
+    assert main.response_cache.misses == misses + 2
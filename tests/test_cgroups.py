@@ -0,0 +1,132 @@
+import os
+
+import pytest
+
+import cgroups
+from fakefs import FakeNode
+from fdcache import FileCache
+
+@pytest.fixture(params=["v2", "v1"])
+def node(request, tmp_path):
+    fake = FakeNode(str(tmp_path / "node"), pods=6, version=request.param, qos="mixed", seed=3)
+    fake.build()
+    fake.mutate(dt=1.0)
+    return fake
+
+def test_detect_backend(node):
+    backend = cgroups.detect_backend(node.cgroup_root)
+    assert backend.version == node.version
+
+def test_read_pod_values(node):
+    backend = cgroups.detect_backend(node.cgroup_root, FileCache())
+    for pod in node.pods.values():
+        sample = backend.read_pod(pod["uid"], pod["qos"])
+        assert sample["cpu_ns"] == pod["cpu_usec"] * 1000 > 0
+        assert sample["memory_bytes"] > 0
+        assert (sample["disk_read_bytes"], sample["disk_write_bytes"]) == (pod["rbytes"], pod["wbytes"])
+        assert sample["cpu_nr_periods"] == pod["nr_periods"] > 0
+        assert sample["cpu_throttled_usec"] == pod["throttled_usec"]
+        assert 0 < sample["memory_working_set_bytes"] < sample["memory_bytes"]
+        if node.version == "v2":
+            assert sample["cpu_pressure_some_avg10"] is not None
+        else:
+            assert sample["cpu_pressure_some_avg10"] is None
+
+def test_discovery_follows_driver_layout(node):
+    backend = cgroups.detect_backend(node.cgroup_root)
+    for pod in node.pods.values():
+        backend.read_pod(pod["uid"])  # QoS 없이도 모든 클래스를 탐색
+        dirs = backend._dirs[pod["uid"]]
+        if node.version == "v2":
+            # systemd 드라이버: kubepods-<qos>-pod<uid의 -는 _>.slice
+            assert dirs == tuple(pod["dirs"])
+            assert pod["uid"].replace("-", "_") in dirs[0]
+        else:
+            # cgroupfs 드라이버: 컨트롤러별 kubepods/<qos>/pod<uid>
+            assert dirs[:3] == tuple(pod["dirs"])
+            assert dirs[0].endswith(f"pod{pod['uid']}")
+
+def test_wrong_qos_hint_still_finds_pod(node):
+    backend = cgroups.detect_backend(node.cgroup_root)
+    pod = next(iter(node.pods.values()))
+    wrong = next(q for q in cgroups.POD_PATTERNS if q != pod["qos"])
+    assert backend.read_pod(pod["uid"], wrong)["cpu_ns"] > 0
+
+def test_cgroupfs_driver_on_v2(tmp_path):
+    root = tmp_path / "cgroup"
+    uid = "1234-abcd"
+    pod_dir = root / "kubepods" / "besteffort" / f"pod{uid}"
+    pod_dir.mkdir(parents=True)
+    (root / "cgroup.controllers").write_text("cpu io memory\n")
+    (pod_dir / "cpu.stat").write_text("usage_usec 7\n")
+    (pod_dir / "memory.current").write_text("4096\n")
+    sample = cgroups.detect_backend(str(root)).read_pod(uid, "BestEffort")
+    assert (sample["cpu_ns"], sample["memory_bytes"]) == (7000, 4096)
+    assert sample["memory_anon_bytes"] is None and sample["io_pressure_some_avg10"] is None
+
+def test_retain_forgets_deleted_pods(node):
+    files = FileCache()
+    backend = cgroups.detect_backend(node.cgroup_root, files)
+    for pod in node.pods.values():
+        backend.read_pod(pod["uid"], pod["qos"])
+    gone = next(iter(node.pods))
+    gone_paths = backend._paths[gone]
+    node._remove(gone)
+    backend.retain(node.pods)
+    assert gone not in backend._paths and gone not in backend._dirs
+    assert not any(path in files._entries for path in gone_paths)
+    assert len(backend._paths) == len(node.pods)
+    assert backend.read_pod(gone) is None
+
+def test_parse_key():
+    data = b"usage_usec 120\nnr_periods 7\nthrottled_usec 9\n"
+    assert cgroups.parse_key(data, b"usage_usec") == 120
+    assert cgroups.parse_key(data, b"throttled_usec") == 9
+    # 다른 키의 접미사/접두사와 헷갈리지 않음
+    assert cgroups.parse_key(b"total_anon 5\nanon 3\n", b"anon") == 3
+    assert cgroups.parse_key(b"MemTotal:       1024 kB\n", b"MemTotal:") == 1024
+    assert cgroups.parse_key(data, b"missing") == 0
+    assert cgroups.parse_key(None, b"usage_usec") == 0
+
+def test_parse_psi():
+    data = b"some avg10=1.25 avg60=0.50 avg300=0.10 total=123\nfull avg10=0.75 avg60=0.00 avg300=0.00 total=4\n"
+    assert cgroups.parse_psi(data) == (1.25, 0.75)
+    # cpu.pressure는 커널 버전에 따라 full 줄이 없음
+    assert cgroups.parse_psi(b"some avg10=2.00 avg60=0.00 avg300=0.00 total=1\n") == (2.0, None)
+    assert cgroups.parse_psi(None) == (None, None)
+
+def test_working_set_clamps_at_zero():
+    assert cgroups.working_set(1000, 300) == 700
+    assert cgroups.working_set(100, 300) == 0
+    assert cgroups.working_set(None, 300) is None
+    assert cgroups.working_set(100, None) is None
+
+def test_v1_throttled_time_in_microseconds(tmp_path):
+    fake = FakeNode(str(tmp_path / "node"), pods=1, version="v1", qos="guaranteed")
+    fake.build()
+    pod = next(iter(fake.pods.values()))
+    cpu_dir = pod["dirs"][0]
+    with open(os.path.join(cpu_dir, "cpu.stat"), "w") as f:
+        f.write("nr_periods 10\nnr_throttled 4\nthrottled_time 2500999\n")
+    sample = cgroups.detect_backend(fake.cgroup_root).read_pod(pod["uid"])
+    assert (sample["cpu_nr_periods"], sample["cpu_nr_throttled"], sample["cpu_throttled_usec"]) == (10, 4, 2500)
+
+def test_signal_files_reused_between_signal_reads(node):
+    files = FileCache()
+    backend = cgroups.detect_backend(node.cgroup_root, files)
+    pod = next(iter(node.pods.values()))
+    first = backend.read_pod(pod["uid"], pod["qos"], signals=False)  # 처음에는 신호 파일도 읽음
+    assert first["memory_anon_bytes"] is not None
+    opens = files.opens
+    node.mutate(dt=1.0)
+    second = backend.read_pod(pod["uid"], pod["qos"], signals=False)
+    assert second["cpu_ns"] == pod["cpu_usec"] * 1000
+    assert second["memory_anon_bytes"] == first["memory_anon_bytes"]
+    # working set은 이번 사용량과 마지막 inactive_file로 다시 계산
+    assert second["memory_working_set_bytes"] - first["memory_working_set_bytes"] == \
+        second["memory_bytes"] - first["memory_bytes"]
+    assert files.opens == opens
+    v1 = node.version == "v1"
+    with open(os.path.join(pod["dirs"][1 if v1 else 0], "memory.stat"), "rb") as f:
+        anon = cgroups.parse_key(f.read(), b"total_rss" if v1 else b"anon")
+    assert backend.read_pod(pod["uid"], pod["qos"])["memory_anon_bytes"] == anon
@@ -0,0 +1,92 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import cgroups
+import collector
+import main
+from fakefs import FakeNode
+from fdcache import FileCache
+from scheduler import IdleTracker
+
+@pytest.fixture(params=["v2", "v1"])
+def node(request, tmp_path, monkeypatch):
+    fake = FakeNode(str(tmp_path / "node"), pods=8, version=request.param, sidecars=0.5, seed=5)
+    fake.build()
+    fake.mutate(dt=1.0)
+    for name, value in fake.env.items():
+        monkeypatch.setattr(collector, name, value)
+    monkeypatch.setattr(collector, "pod_cache", {})
+    monkeypatch.setattr(collector, "idle_tracker", IdleTracker())
+    monkeypatch.setattr(collector, "file_cache", FileCache())
+    monkeypatch.setattr(collector, "_cgroup_backend", None)
+    return fake
+
+def test_scope_ids_map_to_container_names(node):
+    backend = cgroups.detect_backend(node.cgroup_root)
+    pods = {pod["uid"]: pod for pod in collector.parse_pod_list(node.pod_list())}
+    multi = [pod for pod in node.pods.values() if len(pod["containers"]) > 1]
+    assert multi
+    for pod in multi:
+        ids = pods[pod["uid"]]["containers"]
+        assert sorted(ids.values()) == ["app", "istio-proxy"]
+        samples = backend.read_containers(pod["uid"], list(ids), pod["qos"])
+        # pause(sandbox) cgroup은 containerStatuses에 없으므로 제외
+        assert samples.keys() == ids.keys()
+        for c in pod["containers"]:
+            assert samples[c["id"]]["cpu_ns"] == int(pod["cpu_usec"] * c["share"]) * 1000
+
+@pytest.mark.parametrize("entry", ["cri-containerd-{id}.scope", "docker-{id}.scope", "crio-{id}.scope", "{id}"])
+def test_runtime_scope_names(tmp_path, entry):
+    root = tmp_path / "cgroup"
+    uid = "0000-1111"
+    pod_dir = root / "kubepods.slice" / "kubepods-pod0000_1111.slice"
+    (root / "kubepods.slice").mkdir(parents=True)
+    (root / "cgroup.controllers").write_text("cpu io memory\n")
+    for d, usec in ((pod_dir, 30), (pod_dir / entry.format(id="abc"), 10), (pod_dir / entry.format(id="def"), 20),
+                    (pod_dir / "crio-conmon-abc.scope", 99)):
+        d.mkdir(exist_ok=True)
+        (d / "cpu.stat").write_text(f"usage_usec {usec}\n")
+    backend = cgroups.detect_backend(str(root))
+    samples = backend.read_containers(uid, ["abc", "def", "missing"])
+    assert {cid: s["cpu_ns"] for cid, s in samples.items()} == {"abc": 10000, "def": 20000}
+    # 컨테이너 목록이 바뀌면 다시 탐색
+    assert backend.read_containers(uid, ["def"]).keys() == {"def"}
+    assert backend._containers[uid].keys() == {"def"}
+
+def test_only_multi_container_pods_report_containers(node):
+    metrics = {m["pod"]: m for m in collector.collect_pod_metrics()}
+    assert len(metrics) == len(node.pods)
+    for pod in node.pods.values():
+        m = metrics[pod["name"]]
+        if len(pod["containers"]) > 1:
+            assert [c["container"] for c in m["containers"]] == ["app", "istio-proxy"]
+        else:
+            assert "containers" not in m
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "store", main.MetricsStore())
+    main.response_cache.clear()
+    return TestClient(main.app)
+
+def test_container_endpoints(node, client):
+    for m in collector.collect_pod_metrics():
+        assert client.post(f"/api/pods/{m['pod']}", json=m).status_code == 200
+    multi = {pod["name"] for pod in node.pods.values() if len(pod["containers"]) > 1}
+    single = {pod["name"] for pod in node.pods.values()} - multi
+    assert set(main.store.container_store) == multi
+
+    name = sorted(multi)[0]
+    latest = client.get(f"/api/pods/{name}/containers").json()
+    assert sorted(latest) == ["app", "istio-proxy"] and len(latest["app"]) == 1
+    assert latest["app"][0]["container"] == "app" and latest["app"][0]["cpu_millicores"] is not None
+    series = client.get(f"/api/pods/{name}/containers/istio-proxy").json()
+    assert len(series) == 1 and series[0]["container"] == "istio-proxy"
+    assert len(client.get(f"/api/pods/{name}/containers/app", params={"window": 3600}).json()) == 1
+    # 포드 샘플에는 컨테이너 값이 남지 않음
+    assert client.get(f"/api/pods/{name}").json()[0]["containers"] is None
+
+    assert client.get(f"/api/pods/{sorted(single)[0]}/containers").json() == {}
+    assert client.get(f"/api/pods/{name}/containers/nope").status_code == 404
+    assert client.get("/api/pods/nope/containers").status_code == 404
+    assert client.get("/api/pods/nope/containers/app").status_code == 404
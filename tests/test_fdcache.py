@@ -0,0 +1,84 @@
+import errno
+import os
+
+import pytest
+
+import fdcache
+from fdcache import FileCache
+
+def write(path, content: bytes):
+    # 제자리 쓰기 (cgroup 파일처럼 같은 inode 유지)
+    with open(path, "r+b" if path.exists() else "wb") as f:
+        f.write(content)
+        f.truncate()
+
+def test_reads_through_cached_fd(tmp_path):
+    path = tmp_path / "memory.current"
+    write(path, b"100\n")
+    cache = FileCache()
+    assert cache.read(str(path)) == b"100\n"
+    write(path, b"200\n")
+    assert cache.read(str(path)) == b"200\n"
+    assert cache.opens == 1 and len(cache) == 1
+
+def test_buffer_grows_for_large_file(tmp_path):
+    path = tmp_path / "memory.stat"
+    content = b"".join(b"key%d %d\n" % (i, i) for i in range(200))
+    write(path, content)
+    cache = FileCache(buffer_size=16)
+    assert cache.read(str(path)) == content
+    assert len(cache._entries[str(path)][1]) > len(content)
+    assert cache.read(str(path)) == content and cache.opens == 1
+
+@pytest.mark.parametrize("code", [errno.ENODEV, errno.ESTALE, errno.ENOENT])
+def test_read_error_reopens(tmp_path, monkeypatch, code):
+    path = tmp_path / "cpu.stat"
+    write(path, b"usage_usec 1\n")
+    cache = FileCache()
+    cache.read(str(path))
+    # cgroup이 삭제됐다 다시 만들어지면 열린 fd의 pread가 실패 (첫 호출만 실패시킴)
+    os.unlink(path)
+    write(path, b"usage_usec 2\n")
+    preadv = os.preadv
+    calls = []
+
+    def failing(fd, buffers, offset):
+        calls.append(fd)
+        if len(calls) == 1:
+            raise OSError(code, os.strerror(code))
+        return preadv(fd, buffers, offset)
+
+    monkeypatch.setattr(fdcache.os, "preadv", failing)
+    assert cache.read(str(path)) == b"usage_usec 2\n"
+    assert len(calls) == 2 and cache.opens == 2 and len(cache) == 1
+
+def test_deleted_file_is_evicted(tmp_path, monkeypatch):
+    path = tmp_path / "io.stat"
+    write(path, b"8:0 rbytes=1\n")
+    cache = FileCache()
+    cache.read(str(path))
+    os.unlink(path)
+
+    def removed(fd, buffers, offset):
+        raise OSError(errno.ENODEV, os.strerror(errno.ENODEV))
+
+    monkeypatch.setattr(fdcache.os, "preadv", removed)
+    assert cache.read(str(path)) is None
+    assert len(cache) == 0
+
+def test_max_fds_bounds_open_files(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"f{i}"
+        write(path, b"%d" % i)
+        paths.append(str(path))
+    cache = FileCache(max_fds=3)
+    assert [cache.read(p) for p in paths] == [b"0", b"1", b"2", b"3", b"4"]
+    assert len(cache) == 3 and set(cache._entries) == set(paths[:3])
+    # 한도를 넘은 파일은 매번 열어 읽음
+    assert cache.read(paths[4]) == b"4" and cache.opens == 6
+    cache.evict(paths[0])
+    cache.read(paths[4])
+    assert paths[4] in cache._entries and len(cache) == 3
+    cache.clear()
+    assert len(cache) == 0
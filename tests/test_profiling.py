@@ -0,0 +1,65 @@
+import pytest
+
+import profiling
+from profiling import CycleProfiler
+
+class FakeClock:
+    """perf_counter/process_time 대체: 테스트가 wall/CPU 시간을 직접 진행시킴"""
+
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def advance(self, wall, cpu=0.0):
+        self.wall += wall
+        self.cpu += cpu
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(profiling.time, "perf_counter", lambda: fake.wall)
+    monkeypatch.setattr(profiling.time, "process_time", lambda: fake.cpu)
+    return fake
+
+def run_cycle(profiler, clock, outer=0.010, inner=0.030, tail=0.005, cpu=0.5):
+    """outer 단계 안에 inner 단계가 중첩된 주기 하나 (cpu는 wall 대비 CPU 비율)"""
+    profiler.start_cycle()
+    with profiler.phase("outer"):
+        clock.advance(outer, outer * cpu)
+        with profiler.phase("inner"):
+            clock.advance(inner, inner * cpu)
+        clock.advance(tail, tail * cpu)
+    profiler.end_cycle()
+
+def test_nested_phase_time_is_exclusive(clock):
+    profiler = CycleProfiler(interval=5)
+    run_cycle(profiler, clock)
+    cycle = profiler.history[-1]
+    assert cycle["outer"] == pytest.approx((0.015, 0.0075))
+    assert cycle["inner"] == pytest.approx((0.030, 0.015))
+    assert cycle["cycle"] == pytest.approx((0.045, 0.0225))
+
+def test_summary_percentiles_and_cpu_millicores(clock):
+    profiler = CycleProfiler(interval=0.5, window=100)
+    for i in range(100):
+        run_cycle(profiler, clock, inner=(i + 1) / 1000, outer=0.0, tail=0.0)
+    summary = profiler.summary()
+    assert (summary["cycles"], summary["overruns"]) == (100, 0)
+    assert summary["inner_wall_ms_p50"] == pytest.approx(50.0)
+    assert summary["inner_wall_ms_p99"] == pytest.approx(99.0)
+    assert summary["inner_cpu_ms_p99"] == pytest.approx(49.5)
+    assert summary["outer_wall_ms_p99"] == 0.0
+    # 평균 주기 CPU 25.25ms / 0.5s 주기 = 50.5 밀리코어
+    assert summary["cpu_millicores_avg"] == pytest.approx(50.5)
+
+def test_overruns_and_window(clock):
+    profiler = CycleProfiler(interval=0.1, window=3)
+    for inner in (0.05, 0.2, 0.05, 0.3, 0.05):
+        run_cycle(profiler, clock, inner=inner, outer=0.0, tail=0.0)
+    summary = profiler.summary()
+    assert (summary["cycles"], summary["overruns"]) == (5, 2)
+    assert len(profiler.history) == 3
+    assert summary["cycle_wall_ms_p99"] == pytest.approx(300.0)
+
+def test_summary_without_cycles():
+    assert CycleProfiler(interval=5).summary() == {"cycles": 0, "overruns": 0}
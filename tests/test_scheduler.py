@@ -0,0 +1,83 @@
+from scheduler import IdleTracker, Scheduler
+
+def run(sched: Scheduler, start: float, ticks: int, millicores: float, cpu0: float = 0.0):
+    """1초 간격 tick마다 millicores만큼 CPU를 쓴 것으로 adapt 호출, 마지막 (시각, CPU) 반환"""
+    now, cpu = start, cpu0
+    for _ in range(ticks):
+        now += 1.0
+        cpu += millicores / 1000
+        sched.adapt(now=now, cpu=cpu)
+    return now, cpu
+
+def test_adapt_waits_for_full_window():
+    sched = Scheduler({"pod": 5.0}, cpu_budget=80, window=4)
+    run(sched, 0.0, 3, 500)
+    assert sched.stretch == 1.0 and sched.cpu_millicores == 0.0
+    run(sched, 3.0, 1, 500, cpu0=1.5)
+    assert sched.stretch == 1.5 and round(sched.cpu_millicores) == 500
+
+def test_stretch_grows_to_ceiling_and_shrinks_to_floor():
+    sched = Scheduler({"node": 5.0, "pod": 10.0}, cpu_budget=80, max_stretch=4.0, window=3)
+    now, cpu = run(sched, 0.0, 3, 200)
+    stretches = [sched.stretch]
+    # 주기가 바뀌면 바뀐 시점부터 다시 window를 채운 뒤 판단
+    for _ in range(4):
+        now, cpu = run(sched, now, 2, 200, cpu)
+        stretches.append(sched.stretch)
+    assert stretches == [1.5, 2.25, 3.375, 4.0, 4.0]
+    # 예산 절반 아래로 내려가면 1.25배씩 되돌리되 1.0 아래로는 내려가지 않음
+    for _ in range(10):
+        now, cpu = run(sched, now, 2, 10, cpu)
+    assert sched.stretch == 1.0
+    # 예산의 절반~예산 사이면 유지
+    now, cpu = run(sched, now, 6, 60, cpu)
+    assert sched.stretch == 1.0
+
+def test_stretch_scales_intervals():
+    sched = Scheduler({"node": 5.0, "pod": 10.0}, cpu_budget=80, window=2)
+    assert sched.tick == 5.0 and sched.due(now=0.0) == ["node", "pod"]
+    assert sched.mark("pod", now=100.0) is None
+    assert sched.next_due["pod"] == 110.0
+    assert sched.mark("pod", now=110.0) == 10.0 and sched.next_due["pod"] == 120.0
+    run(sched, 110.0, 2, 1000)
+    assert sched.stretch == 1.5
+    sched.mark("pod", now=120.0)
+    assert sched.next_due["pod"] == 135.0
+    assert sched.due(now=130.0) == ["node"] and sched.sleep_seconds(now=130.0) == 0.0
+
+def test_zero_budget_measures_without_stretching():
+    sched = Scheduler({"pod": 5.0}, cpu_budget=0, window=2)
+    run(sched, 0.0, 4, 900)
+    assert sched.stretch == 1.0 and round(sched.cpu_millicores) == 900
+    # 시계가 멈춘 구간은 무시
+    sched.adapt(now=4.0, cpu=10.0)
+    assert round(sched.cpu_millicores) == 900
+
+def test_idle_tracker_skips_unchanged_pods():
+    tracker = IdleTracker(idle_after=2, idle_every=3)
+    reads = []
+    for _ in range(9):
+        read = tracker.should_read("a")
+        reads.append(read)
+        if read:
+            tracker.observe("a", (1, 2, 3))
+    # 처음 3번 관측(기록 + 동일 2번) 뒤에는 3번에 한 번만 읽음
+    assert reads == [True, True, True, False, False, True, False, False, True]
+    assert tracker.idle_count() == 1
+
+def test_idle_tracker_resumes_on_change_and_retains():
+    tracker = IdleTracker(idle_after=1, idle_every=4)
+    tracker.observe("a", 1)
+    tracker.observe("a", 1)
+    tracker.observe("b", 1)
+    assert not tracker.should_read("a") and tracker.should_read("b")
+    tracker.observe("a", 2)  # 카운터가 움직이면 바로 매번 읽기
+    assert tracker.should_read("a") and tracker.idle_count() == 0
+    tracker.retain(["b"])
+    assert tracker.should_read("a") and tracker._state.keys() == {"b"}
+
+def test_idle_tracker_disabled():
+    tracker = IdleTracker(idle_after=0)
+    for _ in range(5):
+        tracker.observe("a", 1)
+    assert all(tracker.should_read("a") for _ in range(5)) and tracker.idle_count() == 0
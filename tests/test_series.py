@@ -0,0 +1,103 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from cache import render_json
+from models import NodeMetrics, PodMetrics
+from storage import MetricsStore
+
+TS = "2026-10-19T01:02:03.456789Z"
+
+NODE = {
+    "timestamp": TS, "node": "n1", "cpu_millicores": 100, "memory_bytes": 1024 * 5000,
+    "disk_read_bytes": 1, "disk_write_bytes": 2, "network_rx_bytes": 3, "network_tx_bytes": 4,
+    "cpu_usage": 1.5, "cpu_usage_percent": 1.5, "cgroup_cpu_ns": 123456789012,
+    "memory": {"total_kb": 9000, "used_kb": 5000, "free_kb": 1000},
+    "network": {"rx_bytes": 3, "tx_bytes": 4}, "disk": {"read_bytes": 1, "write_bytes": 2},
+    "memory_anon_bytes": 5, "cpu_pressure_some_avg10": 0.25,
+    "collector_stats": {"cycles": 3.0, "overruns": 0.0, "cgroup_read_wall_ms_p99": 41.2},
+}
+POD = {
+    "timestamp": TS, "node": "n1", "namespace": "ns", "deployment": "dp", "pod": "p1", "pod_name": "p1",
+    "cpu_millicores": 5, "memory_bytes": 2 ** 62, "cpu_usage": 0.5, "cpu_pressure_some_avg10": 1.25,
+    "cpu_nr_periods": 7,
+}
+
+# 저장 형태(열 + extras)로 바꿨다가 되돌려도 응답 bytes가 같아야 하는 샘플들
+NODE_SAMPLES = [
+    NODE,
+    # UTC가 아닌 timestamp, 숫자 열과 다른 호환성 dict
+    dict(NODE, timestamp="2026-10-19T10:02:04+09:00", memory={"total_kb": 1, "used_kb": 2, "free_kb": 3},
+         network={"rx_bytes": 9, "tx_bytes": 9}),
+    # timezone 없는 timestamp, 값 없는 필드, int64 밖의 값
+    dict(NODE, timestamp="2026-10-19T01:02:05", cpu_millicores=None, network=None, disk=None, memory=None,
+         collector_stats=None, cgroup_cpu_ns=2 ** 70),
+    dict(NODE, timestamp="2026-10-19T01:02:06Z", collector_stats={"cycles": 4.0, "overruns": 1.0}),
+]
+POD_SAMPLES = [
+    POD,
+    dict(POD, timestamp="2026-10-19T01:02:04Z", pod_name=None, memory={"used_bytes": 1},
+         network={"rx_bytes": 0, "tx_bytes": 0}),
+    dict(POD, timestamp="2026-10-19T01:02:05Z", deployment=None, memory_bytes=None, cpu_usage=None),
+]
+
+@pytest.fixture
+def store():
+    return MetricsStore()
+
+def test_render_is_byte_identical(store):
+    nodes = [NodeMetrics(**d) for d in NODE_SAMPLES]
+    pods = [PodMetrics(**d) for d in POD_SAMPLES]
+    expected_nodes, expected_pods = render_json(nodes), render_json(pods)
+    for m in nodes:
+        store.add_node_metrics(m)
+    for m in pods:
+        store.add_pod_metrics(m)
+    assert render_json(store.node_store["n1"].render()) == expected_nodes
+    assert render_json(store.pod_store["p1"].render()) == expected_pods
+    assert render_json(store.node_store["n1"][-1]) == render_json(nodes[-1])
+
+def test_labels_follow_latest_sample(store):
+    for d in POD_SAMPLES:
+        store.add_pod_metrics(PodMetrics(**d))
+    series = store.pod_store["p1"]
+    assert series.label("deployment") is None
+    assert series.label("namespace") == "ns"
+
+def test_eviction_keeps_extras_aligned(store):
+    store.max_samples = 2
+    nodes = [NodeMetrics(**dict(NODE, timestamp=f"2026-10-19T01:02:0{i}Z",
+                                collector_stats={"cycles": float(i), "overruns": 0.0})) for i in range(6)]
+    nodes[4] = NodeMetrics(**dict(NODE_SAMPLES[1], timestamp="2026-10-19T10:02:04+09:00"))
+    for m in nodes:
+        store.add_node_metrics(m)
+    series = store.node_store["n1"]
+    assert render_json(series.render()) == render_json(nodes[-2:])
+    assert sorted(series.extras) == [series.base, series.base + 1]
+    assert store.evictions["node"] == 4
+    # extras 크기도 추가/제거에 맞춰 유지
+    assert series.extras_bytes > 0
+    store.max_samples = 1
+    store.add_node_metrics(NodeMetrics(**dict(NODE, timestamp="2026-10-19T01:02:09Z", collector_stats=None)))
+    assert series.extras_bytes == 0
+
+def test_window_query_uses_utc_order(store):
+    now = datetime.now(timezone.utc)
+    for seconds in (600, 120, 30):
+        ts = (now - timedelta(seconds=seconds)).astimezone(timezone(timedelta(hours=9)))
+        store.add_pod_metrics(PodMetrics(**dict(POD, timestamp=ts.isoformat())))
+    result = store.query_pod_metrics("p1", 300)
+    assert [m.timestamp for m in result] == [now - timedelta(seconds=120), now - timedelta(seconds=30)]
+
+def test_rows_rendered_without_validation_match_encoder(store):
+    for d in NODE_SAMPLES:
+        store.add_node_metrics(NodeMetrics(**d))
+    series = store.node_store["n1"]
+    rows = series.render()
+    # 마지막 행은 보관 중인 모델 그대로, 나머지는 열에서 조립
+    assert rows[-1] is series.last is series[-1]
+    expected = json.dumps(jsonable_encoder(rows), ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode()
+    assert render_json(rows) == expected
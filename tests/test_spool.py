@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import json
+
+import pytest
+
+import collector
+from spool import Spool
+
+def cycle(i: int) -> dict:
+    return {"node": {"node": "n1", "timestamp": f"t{i}"}, "pods": [{"pod": f"p{i}"}],
+            "namespaces": [], "deployments": []}
+
+def test_exponential_backoff_and_cap():
+    spool = Spool(10, base_backoff=1.0, max_backoff=5.0)
+    assert [spool.backoff(now=100.0) for _ in range(4)] == [1.0, 2.0, 4.0, 5.0]
+    assert not spool.ready(now=104.9) and spool.ready(now=105.0)
+    spool.ack(0)
+    assert spool.backoff(now=200.0) == 1.0
+
+def test_zero_clock_is_a_valid_time():
+    spool = Spool(10, base_backoff=1.0)
+    assert spool.backoff(now=0.0) == 1.0 and spool.retry_at == 1.0
+    assert not spool.ready(now=0.0) and spool.ready(now=1.0)
+
+def test_retry_after_overrides_backoff():
+    spool = Spool(10, base_backoff=1.0, max_backoff=60.0)
+    assert spool.backoff(retry_after=30.0, now=100.0) == 30.0
+    assert spool.backoff(retry_after=600.0, now=100.0) == 60.0
+    assert spool.retry_at == 160.0
+
+def test_limits_drop_oldest_cycles():
+    spool = Spool(2)
+    for i in range(3):
+        spool.push(cycle(i))
+    assert [c["node"]["timestamp"] for c in spool.peek(10)] == ["t1", "t2"]
+    assert spool.dropped == 1
+    spool = Spool(10, max_bytes=1)
+    spool.push(cycle(0))
+    spool.push(cycle(1))
+    assert len(spool) == 1 and spool.bytes == len(spool.cycles[0])
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None), ("", None), ("5", 5.0), ("-3", 0.0), ("1.5", 1.5), ("soon", None),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert collector.parse_retry_after(value) == expected
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=120)
+    assert 100 < collector.parse_retry_after(format_datetime(when, usegmt=True)) <= 120
+    assert collector.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+class FakeAPI:
+    """post_to_api 대체: 정해진 횟수만큼 429(Retry-After) 후 성공, reject에 해당하는 포드가 든 요청은 400"""
+
+    def __init__(self, failures: int, retry_after=None, reject=()):
+        self.failures = failures
+        self.retry_after = retry_after
+        self.reject = set(reject)
+        self.sent = []
+        self.batches = []
+
+    def __call__(self, path, body, content_type):
+        if self.failures:
+            self.failures -= 1
+            raise collector.SendDeferred("HTTP 429", self.retry_after)
+        payload = json.loads(body)
+        pods = [pod["pod"] for pod in payload["pods"]] if path == "api/batch" else [payload.get("pod")]
+        if self.reject & set(pods):
+            return type("Response", (), {"status_code": 400, "text": "rejected"})()
+        self.sent.append(path)
+        if path == "api/batch":
+            self.batches.append(pods)
+        return type("Response", (), {"status_code": 200, "text": "ok"})()
+
+@pytest.fixture
+def api(monkeypatch):
+    def install(failures, retry_after=None, reject=()):
+        fake = FakeAPI(failures, retry_after, reject)
+        monkeypatch.setattr(collector, "post_to_api", fake)
+        monkeypatch.setattr(collector, "WIRE_FORMAT", "json")
+        monkeypatch.setattr(collector, "spool", Spool(10, base_backoff=5.0, max_backoff=60.0))
+        return fake
+    return install
+
+def test_deferred_cycle_is_spooled_with_retry_after_and_replayed_in_order(api, monkeypatch):
+    fake = api(failures=1, retry_after=30.0)
+    collector.ship_cycle(*cycle(0).values())
+    spool = collector.spool
+    assert len(spool) == 1 and spool.failures == 1
+    assert spool.retry_at - collector.time.monotonic() > 25
+
+    # backoff 중에는 새 주기도 보내지 않고 순서대로 쌓음
+    collector.ship_cycle(*cycle(1).values())
+    assert len(spool) == 2 and fake.sent == []
+
+    # json 모드에서도 밀린 주기는 배치 한 번으로 재전송
+    monkeypatch.setattr(spool, "retry_at", 0.0)
+    collector.ship_cycle(*cycle(2).values())
+    assert len(spool) == 0 and spool.replayed == 3
+    assert fake.sent == ["api/batch"] and fake.batches == [["p0", "p1", "p2"]]
+
+def test_partial_cycle_resumes_after_sent_objects(api, monkeypatch):
+    fake = api(failures=0)
+    calls = []
+
+    def flaky(path, body, content_type):
+        calls.append(path)
+        if len(calls) == 2:
+            raise collector.SendDeferred("connection refused")
+        return fake(path, body, content_type)
+
+    monkeypatch.setattr(collector, "post_to_api", flaky)
+    collector.ship_cycle(*cycle(0).values())
+    spool = collector.spool
+    assert spool.head_sent == 1 and spool.retry_at - collector.time.monotonic() > 4
+
+    monkeypatch.setattr(spool, "retry_at", 0.0)
+    collector.flush_spool()
+    assert fake.sent == ["api/nodes/n1", "api/pods/p0"] and len(spool) == 0
+
+def test_rejected_replay_batch_discards_only_rejected_cycle(api, monkeypatch):
+    fake = api(failures=1, reject={"p1"})
+    for i in range(4):
+        collector.spool.push(cycle(i))
+    spool = collector.spool
+    monkeypatch.setattr(collector, "SPOOL_REPLAY_BATCH", 3)
+    collector.flush_spool()
+    assert spool.failures == 1 and len(spool) == 4
+
+    monkeypatch.setattr(spool, "retry_at", 0.0)
+    collector.flush_spool()
+    # 거부된 3주기 배치는 한 주기씩 다시 보내고, 이후에는 다시 배치 크기로 전송
+    assert fake.batches == [["p0"], ["p2"], ["p3"]]
+    assert (len(spool), spool.replayed, spool.dropped) == (0, 3, 1)
+
+def test_replay_falls_back_to_objects_without_batch_support(api, monkeypatch):
+    fake = api(failures=0)
+    monkeypatch.setattr(collector, "batch_supported", False)
+    collector.spool.push(cycle(0))
+    collector.flush_spool()
+    assert fake.sent == ["api/nodes/n1", "api/pods/p0"]
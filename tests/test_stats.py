@@ -0,0 +1,50 @@
+from fastapi.testclient import TestClient
+
+import main
+from models import NodeMetrics
+from stats import LatencyHistogram, stats
+from storage import MetricsStore
+
+NODE = {"timestamp": "2026-10-19T01:02:03Z", "node": "n1", "cpu_millicores": 100}
+
+def counts():
+    return {name: hist.total for name, hist in stats.histograms.items()}
+
+def test_request_time_includes_body_parsing():
+    client = TestClient(main.app)
+    before = counts()
+    assert client.post("/api/nodes/n1", json=NODE).status_code == 200
+    assert client.post("/api/nodes/n1", json=dict(NODE, timestamp="bad")).status_code == 422
+    after = counts()
+    # 검증에 실패한 요청은 핸들러까지 가지 않으므로 요청 전체 히스토그램에만 기록
+    assert after["post_node_metrics"] - before.get("post_node_metrics", 0) == 2
+    assert after["post_node_metrics.handler"] - before.get("post_node_metrics.handler", 0) == 1
+    request = stats.histograms["post_node_metrics"]
+    handler = stats.histograms["post_node_metrics.handler"]
+    assert request.max_ns >= handler.max_ns
+
+def test_histogram_percentiles_within_bucket_error():
+    hist = LatencyHistogram()
+    for ns in range(1, 100_001):
+        hist.record(ns * 1000)
+    assert hist.total == 100_000 and hist.max_ns == 100_000_000
+    assert abs(hist.percentile(50) - 50_000_000) / 50_000_000 < 0.125
+    assert abs(hist.percentile(99) - 99_000_000) / 99_000_000 < 0.125
+
+def test_store_times_every_nth_sample():
+    store = MetricsStore()
+    store.timing_every = 4
+    hist = store._add_hist["node"]
+    before = hist.total
+    for i in range(8):
+        store.add_node_metrics(NodeMetrics(**dict(NODE, timestamp=f"2026-10-19T01:02:{i:02d}Z")))
+    assert hist.total - before == 2
+
+def test_ingest_rate_counts_batch_samples_once_per_request(monkeypatch):
+    monkeypatch.setattr(main, "store", MetricsStore())
+    client = TestClient(main.app)
+    before = stats.ingest_rate.total
+    nodes = [dict(NODE, node=f"n{i}") for i in range(3)]
+    assert client.post("/api/batch", json={"nodes": nodes}).json()["accepted"] == 3
+    assert client.post("/api/nodes/n1", json=NODE).status_code == 200
+    assert stats.ingest_rate.total - before == 4
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+import wire_decoder
+import wire_encoder
+from models import DeploymentMetrics, NamespaceMetrics, NodeMetrics, PodMetrics
+
+TS = "2026-01-01T00:00:05.123456Z"
+
+def node_payload(**overrides):
+    """Collector collect_node_metrics()와 같은 형태"""
+    payload = {
+        "timestamp": TS, "node": "node-0", "cpu_millicores": 132, "memory_bytes": 1024 * 500,
+        "disk_read_bytes": 10, "disk_write_bytes": 20, "network_rx_bytes": 30, "network_tx_bytes": 40,
+        "cpu_usage": 13.2, "cpu_usage_percent": 13.2, "cgroup_cpu_ns": 123456789,
+        "memory": {"total_kb": 2048, "used_kb": 500, "free_kb": 1548},
+        "network": {"rx_bytes": 30, "tx_bytes": 40},
+        "disk": {"read_bytes": 10, "write_bytes": 20},
+        "memory_anon_bytes": 1000, "cpu_pressure_some_avg10": 0.5,
+        "collector_stats": {"cycles": 3.0, "overruns": 0.0},
+        "collector_cpu_millicores": 38.5, "collector_cycle_ms_p99": 41.2, "collector_overruns": 0,
+    }
+    payload.update(overrides)
+    return payload
+
+def pod_payload(i, **overrides):
+    """Collector collect_pod_metrics_from_cgroup()와 같은 형태"""
+    name = f"app-{i // 3}-{i:05d}"
+    payload = {
+        "timestamp": f"2026-01-01T00:00:05.{i:06d}Z", "node": "node-0", "namespace": f"ns-{i % 2}",
+        "pod": name, "deployment": f"app-{i // 3}", "cpu_millicores": 100 + i, "memory_bytes": 50_000_000 + i,
+        "disk_read_bytes": i, "disk_write_bytes": 2 * i, "network_rx_bytes": 0, "network_tx_bytes": 0,
+        "pod_name": name, "cpu_usage": (100 + i) / 10,
+    }
+    for field in wire_encoder.POD_SIGNAL_INTS:
+        payload[field] = 1000 + i
+    for field in wire_encoder.POD_SIGNAL_FLOATS:
+        payload[field] = 0.25
+    payload.update(overrides)
+    return payload
+
+def via_json(cls, payloads):
+    """JSON 배치 경로 (main.post_batch)와 같은 방식으로 모델 생성"""
+    return [cls(**d) for d in json.loads(json.dumps(payloads))]
+
+def via_binary(**sections):
+    return wire_decoder.decode_batch(wire_encoder.encode_batch(**sections))
+
+def test_pod_round_trip_matches_json():
+    pods = [
+        pod_payload(0),
+        # cgroup v1: PSI 없음
+        pod_payload(1, **{field: None for field in wire_encoder.POD_SIGNAL_FLOATS}),
+        pod_payload(2, cpu_millicores=None, deployment=None, memory_working_set_bytes=None),
+        # 고정 레이아웃에 없는 필드는 extras로
+        pod_payload(3, containers=[{"container": "app", "cpu_millicores": 5},
+                                   {"container": "sidecar", "memory_bytes": 1024}]),
+        # 복원 규칙과 다른 호환성 필드
+        pod_payload(4, pod_name=None),
+        pod_payload(5, timestamp="2026-01-01T00:00:06Z"),
+    ]
+    _, decoded, _, _ = via_binary(pods=pods)
+    assert decoded == via_json(PodMetrics, pods)
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    # 디스크/네트워크 값이 없는 노드 (Dict[str, int]에 None이 들어가면 안 됨)
+    {"disk_read_bytes": None, "disk_write_bytes": None, "network_rx_bytes": None, "network_tx_bytes": None,
+     "network": None, "disk": None},
+    # /proc/net/dev를 못 읽어 값은 0이지만 dict는 None
+    {"network_rx_bytes": 0, "network_tx_bytes": 0, "network": None},
+    {"memory": None, "cpu_usage": None, "cpu_usage_percent": None, "collector_stats": None},
+    {"memory": {"total_kb": 2048, "used_kb": 500, "free_kb": 1548, "available_kb": 1600}},
+    {"cpu_usage_percent": 99.0},
+])
+def test_node_round_trip_matches_json(overrides):
+    nodes = [node_payload(**overrides)]
+    decoded, _, _, _ = via_binary(nodes=nodes)
+    assert decoded == via_json(NodeMetrics, nodes)
+
+def test_aggregate_round_trip_matches_json():
+    namespaces = [{"timestamp": TS, "namespace": "default", "cpu_millicores": 345, "memory_bytes": 9,
+                   "disk_read_bytes": 1, "disk_write_bytes": 2, "network_rx_bytes": 3, "network_tx_bytes": 4,
+                   "cpu_usage": 34.5},
+                  {"timestamp": TS, "namespace": "empty", "cpu_millicores": 0, "memory_bytes": 0,
+                   "disk_read_bytes": 0, "disk_write_bytes": 0, "network_rx_bytes": 0, "network_tx_bytes": 0,
+                   "cpu_usage": None}]
+    deployments = [dict(namespaces[0], deployment="web")]
+    _, _, ns, dp = via_binary(namespaces=namespaces, deployments=deployments)
+    assert ns == via_json(NamespaceMetrics, namespaces)
+    assert dp == via_json(DeploymentMetrics, deployments)
+
+@pytest.mark.parametrize("ts", ["2026-01-01T00:00:00Z", "2026-03-01T12:34:56.5Z", "2026-03-01T12:34:56.000001Z",
+                                "2026-03-01T12:34:56.123456Z", "2026-03-01T12:34:56+09:00", "2026-03-01T12:34:56"])
+def test_epoch_cache_matches_datetime(ts):
+    assert wire_encoder._EpochCache()(ts) == wire_encoder._epoch(ts)
+
+def test_rejects_malformed_batch():
+    body = wire_encoder.encode_batch(pods=[pod_payload(0)])
+    with pytest.raises(wire_decoder.WireFormatError):
+        wire_decoder.decode_batch(b"XYZ" + body[3:])
+    with pytest.raises(wire_decoder.WireFormatError):
+        wire_decoder.decode_batch(body[:-8])